@@ -0,0 +1,66 @@
+"""
+Benchmark of the export of matches, against a local stub server serving generated matches.
+
+The matches are either all collected then dumped with json.dump, or written as they arrive through a Sink,
+the bodies being written as received with raw=True. Reports the time, and the peak of memory allocated by Python in a second run,
+as tracing the allocations slows everything down.
+Run with : python benchmark/export.py [nb_matches]
+"""
+import asyncio
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.Export import Sink
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+
+async def collect(panth, matchIds, path):
+    matches = [match async for matchId, match in panth.get_many("get_match", matchIds, concurrency=50)]
+    with gzip.open(path, "wt") as f:
+        for match in matches:
+            json.dump(match, f)
+            f.write("\n")
+
+
+async def stream(panth, matchIds, path):
+    async with Sink(path, maxBuffer=200) as sink:
+        await sink.export(panth.get_many("get_match", matchIds, concurrency=50))
+
+
+async def scenario(nb_matches, export, raw, trace):
+    utils.Singleton._instances.clear()
+    stub = StubServer(appLimits=((1000000, 1),), methodLimits={"get_match": [(1000000, 1)]})
+    base_url = await stub.start()
+    path = os.path.join(tempfile.mkdtemp(), "matches.ndjson.gz")
+    matchIds = ["EUW1_" + str(i) for i in range(nb_matches)]
+
+    async with stub_pantheon(base_url, raw=raw) as panth:
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        await export(panth, matchIds, path)
+        duration = time.perf_counter() - start
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    await stub.stop()
+    return (peak / 1024 / 1024) if trace else duration, os.path.getsize(path) / 1024 / 1024
+
+
+def main(nb_matches):
+    print("{} matches exported to NDJSON.gz".format(nb_matches))
+    for name, export, raw in (("collect + json.dump", collect, False), ("Sink", stream, False), ("Sink, raw=True", stream, True)):
+        duration, size = asyncio.run(scenario(nb_matches, export, raw, False))
+        peak, size = asyncio.run(scenario(nb_matches, export, raw, True))
+        print("{:>22} : {:>6.2f} s, peak {:>7.1f} MB allocated, file {:>6.1f} MB".format(name, duration, peak, size))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
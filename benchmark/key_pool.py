@@ -0,0 +1,50 @@
+"""
+Benchmark of a KeyPool, against a local stub server enforcing the limits of each key apart.
+
+The same batch of calls is sent with one key, then with a pool of several keys, one of them being revoked.
+The throughput grows with the number of valid keys, the revoked key being dropped after its first 403.
+Run with : python benchmark/key_pool.py [nb_requests] [nb_keys]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.RateLimit.KeyPool import KeyPool
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+APP_LIMITS = ((20, 1), (100, 120))
+
+
+async def scenario(nb_requests, keys, forbidden=()):
+    #Start from fresh limiters, they are shared by all the instances of the process
+    utils.Singleton._instances.clear()
+
+    stub = StubServer(appLimits=APP_LIMITS, forbiddenKeys=forbidden)
+    base_url = await stub.start()
+    async with stub_pantheon(base_url, api_key=KeyPool(keys)) as panth:
+        start = time.perf_counter()
+        await asyncio.gather(*[panth.get_summoner("summonerId-" + str(i)) for i in range(nb_requests)])
+        duration = time.perf_counter() - start
+        active = len(panth._pool)
+    await stub.stop()
+    return nb_requests / duration, active, stub.rateLimited
+
+
+def main(nb_requests, nb_keys):
+    keys = ["RGAPI-BENCHMARK-" + str(i) for i in range(nb_keys)]
+    print("{} requests, application limits {} per key".format(nb_requests, APP_LIMITS))
+    results = {
+        "1 key": asyncio.run(scenario(nb_requests, keys[:1])),
+        "{} keys, 1 revoked".format(nb_keys): asyncio.run(scenario(nb_requests, keys, forbidden=keys[:1]))
+    }
+    for name, (rps, active, rateLimited) in results.items():
+        print("{:>20} : {:>6.1f} calls/s, {} keys left, {} 429".format(name, rps, active, rateLimited))
+
+
+if __name__ == "__main__":
+    nb_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    nb_keys = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    main(nb_requests, nb_keys)
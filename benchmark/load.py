@@ -0,0 +1,193 @@
+"""
+Load test of Pantheon against the local stub of the Riot API, enforcing the rate limits of a production key.
+
+Each scenario reports the calls per second, the latency of the calls as seen by the caller (rate limiting and retries included),
+the number of 429 received, the server errors injected and the CPU time of the client per HTTP request.
+The stub runs in its own process, its CPU time is not counted.
+
+Scenarios :
+ * match_crawl : walks the players of the matches, fetching their matchlists and the matches not seen yet
+ * league_sweep : walks the pages of the league divisions and fetches the summoner of each entry
+ * spectator_poll : polls the featured games and the current game of a watchlist of players, most of them not in game
+
+Run with : python benchmark/load.py [scenario ...] [--size N] [--concurrency N] [--latency S] [--error-rate P] [--limit-scale X]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.utils import exceptions as exc
+from stub import StubProcess, StubServer, stub_pantheon
+
+
+class Recorder:
+    """
+    Records the latency and the outcome of every call going through the pipeline of a Pantheon instance
+    """
+
+    def __init__(self, panth):
+        self.latencies = []
+        self.failures = {}
+
+        send = panth._send
+
+        async def _send(request):
+            start = time.perf_counter()
+            try:
+                return await send(request)
+            except Exception as e:
+                self.failures[type(e).__name__] = self.failures.get(type(e).__name__, 0) + 1
+                raise
+            finally:
+                self.latencies.append(time.perf_counter() - start)
+
+        panth._send = _send
+
+    def percentile(self, p):
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0
+
+
+async def match_crawl(panth, size, concurrency):
+    queue = asyncio.PriorityQueue()
+    seenPlayers = {"puuid-0"}
+    seenMatches = set()
+    fetched = 0
+    done = asyncio.Event()
+    order = 0
+
+    def push(priority, kind, value):
+        nonlocal order
+        order += 1
+        queue.put_nowait((priority, order, kind, value))
+
+    async def worker():
+        nonlocal fetched
+        while True:
+            priority, i, kind, value = await queue.get()
+            try:
+                if kind == "matchlist":
+                    for matchId in await panth.get_matchlist(value, {"count": 20}):
+                        if not matchId in seenMatches:
+                            seenMatches.add(matchId)
+                            push(0, "match", matchId)
+                else:
+                    match = await panth.get_match(value)
+                    fetched += 1
+                    if fetched >= size:
+                        done.set()
+                    for puuId in match["metadata"]["participants"]:
+                        if not puuId in seenPlayers:
+                            seenPlayers.add(puuId)
+                            push(1, "matchlist", puuId)
+            except exc.NotFound:
+                pass
+
+    #Matches are fetched before the matchlists, so the frontier does not grow more than needed
+    push(1, "matchlist", "puuid-0")
+    workers = [asyncio.ensure_future(worker()) for i in range(concurrency)]
+    try:
+        await done.wait()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def league_sweep(panth, size, concurrency):
+    summonerIds = []
+    for tier in ("DIAMOND", "PLATINUM", "GOLD", "SILVER"):
+        for division in ("I", "II", "III", "IV"):
+            async for entry in panth.iter_league_entries("RANKED_SOLO_5x5", tier, division):
+                summonerIds.append(entry["summonerId"])
+
+            if len(summonerIds) >= size:
+                async for summonerId, summoner in panth.get_many("get_summoner", summonerIds[:size], concurrency=concurrency):
+                    pass
+                return
+
+
+async def spectator_poll(panth, size, concurrency):
+    watchlist = ["summonerId-{}".format(i) for i in range(min(size, 200))]
+    calls = 0
+    while calls < size:
+        await panth.get_featured_games()
+        calls += 1
+        async for summonerId, game in panth.get_many("get_current_game", watchlist[:size - calls], concurrency=concurrency):
+            calls += 1
+
+SCENARIOS = {"match_crawl": match_crawl, "league_sweep": league_sweep, "spectator_poll": spectator_poll}
+
+
+def parseLimits(value, scale):
+    limits = []
+    for limit in value.split(","):
+        count, duration = limit.split(":")
+        limits.append((int(int(count) * scale), int(duration)))
+    return tuple(limits)
+
+
+async def run(base_url, stub, name, size, concurrency):
+    async with stub_pantheon(base_url, auto_retry=True) as panth:
+        recorder = Recorder(panth)
+        before = stub.stats()
+
+        start = time.perf_counter()
+        cpu = time.process_time()
+        await SCENARIOS[name](panth, size, concurrency)
+        cpu = time.process_time() - cpu
+        duration = time.perf_counter() - start
+
+        after = stub.stats()
+    requests = after["requests"] - before["requests"]
+    return {
+        "calls": len(recorder.latencies),
+        "requests": requests,
+        "duration": duration,
+        "rps": len(recorder.latencies) / duration,
+        "p50": recorder.percentile(0.5) * 1000,
+        "p99": recorder.percentile(0.99) * 1000,
+        "rateLimited": after["rateLimited"] - before["rateLimited"],
+        "errors": after["errors"] - before["errors"],
+        "cpu": cpu / max(requests, 1) * 1000,
+        "failures": recorder.failures
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of Pantheon against the local stub of the Riot API")
+    parser.add_argument("scenarios", nargs="*", help="scenarios to run among {}, all by default".format(", ".join(SCENARIOS)))
+    parser.add_argument("--size", type=int, default=300, help="number of matches crawled, summoners fetched or spectator calls")
+    parser.add_argument("--concurrency", type=int, default=20, help="number of calls in flight")
+    parser.add_argument("--latency", type=float, default=0.02, help="latency of the stub, in seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="maximum random latency added, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="probability of a server error")
+    parser.add_argument("--app-limits", default="500:10,30000:600", help="application limits of the key, as limit:duration")
+    parser.add_argument("--limit-scale", type=float, default=1, help="factor applied to all the limits enforced by the stub")
+    params = parser.parse_args()
+    for name in params.scenarios:
+        if not name in SCENARIOS:
+            parser.error("unknown scenario " + name)
+
+    appLimits = parseLimits(params.app_limits, params.limit_scale)
+    methodLimits = {name: [(int(limit * params.limit_scale), duration) for limit, duration in limits] for name, limits in StubServer.endpointLimits.items()}
+    stub = StubProcess(appLimits=appLimits, methodLimits=methodLimits, latency=params.latency, jitter=params.jitter, errorRate=params.error_rate)
+    base_url = stub.start()
+
+    print("Application limits {}, stub latency {}+{} s, error rate {}".format(appLimits, params.latency, params.jitter, params.error_rate))
+    print("{:>15} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9} {:>6} {:>6} {:>12}".format("scenario", "calls", "requests", "time (s)", "calls/s", "p50 (ms)", "p99 (ms)", "429", "5xx", "CPU ms/req"))
+    try:
+        for name in params.scenarios or SCENARIOS:
+            result = asyncio.run(run(base_url, stub, name, params.size, params.concurrency))
+            print("{:>15} {calls:>7} {requests:>9} {duration:>9.2f} {rps:>9.1f} {p50:>9.1f} {p99:>9.1f} {rateLimited:>6} {errors:>6} {cpu:>12.3f}".format(name, **result))
+            if result["failures"]:
+                print("{:>15} failed calls : {}".format("", result["failures"]))
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark of the local storage of the matches, against a local stub server serving generated matches.
+
+The matches are kept in a directory of JSON files, one per match, in a DiskCache, or in a MatchStore.
+Each is filled by fetching the matches, then the same matches are asked again, served from the storage,
+then all the stored matches are read back and decoded as for an offline analysis.
+Run with : python benchmark/match_store.py [nb_matches]
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.Cache import DiskCache, MatchStore
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+
+class JSONDirectory:
+    """
+    One file per match, written and read by the caller around the calls
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    async def get_match(self, panth, matchId):
+        path = os.path.join(self.path, matchId + ".json")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return utils.loads(f.read())
+        match = await panth.get_match(matchId)
+        with open(path, "wb") as f:
+            f.write(utils.dumps(match))
+        return match
+
+    def scan(self):
+        for name in os.listdir(self.path):
+            with open(os.path.join(self.path, name), "rb") as f:
+                yield utils.loads(f.read())
+
+    def close(self):
+        pass
+
+
+def size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, dirs, names in os.walk(path) for name in names)
+
+
+async def fill(base_url, storage, matchIds):
+    if isinstance(storage, JSONDirectory):
+        async with stub_pantheon(base_url) as panth:
+            semaphore = asyncio.Semaphore(50)
+            async def get(matchId):
+                async with semaphore:
+                    return await storage.get_match(panth, matchId)
+            return await asyncio.gather(*[get(matchId) for matchId in matchIds])
+
+    async with stub_pantheon(base_url, cache=storage) as panth:
+        return [match async for matchId, match in panth.get_many("get_match", matchIds, concurrency=50)]
+
+
+async def scenario(name, nb_matches):
+    stub = StubServer(appLimits=((1000000, 1),), methodLimits={"get_match": [(1000000, 1)]})
+    base_url = await stub.start()
+    matchIds = ["EUW1_" + str(i) for i in range(nb_matches)]
+    path = tempfile.mkdtemp()
+
+    storages = {
+        "JSON files": lambda: JSONDirectory(path),
+        "DiskCache": lambda: DiskCache(os.path.join(path, "cache.db")),
+        "MatchStore": lambda: MatchStore(path, capacity=4096),
+        "MatchStore, uncompressed": lambda: MatchStore(path, compresslevel=0, capacity=4096),
+    }
+    storage = storages[name]()
+
+    start = time.perf_counter()
+    await fill(base_url, storage, matchIds)
+    cold = time.perf_counter() - start
+    requests = stub.requests
+
+    start = time.perf_counter()
+    await fill(base_url, storage, matchIds)
+    warm = time.perf_counter() - start
+    assert stub.requests == requests
+
+    start = time.perf_counter()
+    if isinstance(storage, JSONDirectory):
+        count = sum(1 for match in storage.scan())
+    elif isinstance(storage, DiskCache):
+        count = sum(1 for body, in storage._db.execute("SELECT value FROM responses") if utils.loads(body))
+    else:
+        count = sum(1 for method, matchId, body in storage.scan("get_match") if utils.loads(body))
+    scan = time.perf_counter() - start
+    assert count == nb_matches
+
+    storage.close()
+    await stub.stop()
+    total = size(path)
+    shutil.rmtree(path)
+    return cold, warm, scan, total
+
+
+def main(nb_matches):
+    print("{} matches".format(nb_matches))
+    for name in ("JSON files", "DiskCache", "MatchStore", "MatchStore, uncompressed"):
+        cold, warm, scan, total = asyncio.run(scenario(name, nb_matches))
+        print("{:>24} : fetched {:>6.2f} s, served again {:>6.2f} s ({:>6.0f} matches/s), scan {:>6.2f} s ({:>6.0f} matches/s), {:>6.1f} MB on disk".format(
+            name, cold, warm, nb_matches / warm, scan, nb_matches / scan, total / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,64 @@
+"""
+Benchmark of one API key driven by several event loops of the same process, against a local stub server enforcing the limits.
+
+Each thread runs its own event loop and Pantheon instance, all of them sharing the rate limiters of the key,
+for instance to spread the decoding of the matches over several threads. The same number of matches is fetched
+by one event loop, then by several ones, and the rate reached is compared to the application limit.
+The stub server runs in its own process.
+Run with : python benchmark/multi_loop.py [nb_loops] [nb_matches]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from stub import StubProcess, stub_pantheon
+
+APP_LIMITS = ((200, 1), (6000, 60))
+
+
+def worker(base_url, matchIds, failures):
+    async def fetch():
+        async with stub_pantheon(base_url) as panth:
+            async for matchId, match in panth.get_many("get_match", matchIds, concurrency=50):
+                if isinstance(match, Exception):
+                    failures.append(match)
+
+    asyncio.run(fetch())
+
+
+def scenario(base_url, nb_loops, matchIds):
+    failures = []
+    threads = [threading.Thread(target=worker, args=(base_url, matchIds[i::nb_loops], failures), daemon=True) for i in range(nb_loops)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(120)
+    duration = time.perf_counter() - start
+    if any(thread.is_alive() for thread in threads):
+        return None, failures
+    return duration, failures
+
+
+def main(nb_loops, nb_matches):
+    print("{} matches, application limits {}".format(nb_matches, APP_LIMITS))
+    for loops in (1, nb_loops):
+        stub = StubProcess(appLimits=APP_LIMITS, methodLimits={"get_match": [(100000, 10)]})
+        base_url = stub.start()
+        #Matches of another range for each run, the limits of the previous one being over
+        duration, failures = scenario(base_url, loops, ["EUW1_" + str(loops * nb_matches + i) for i in range(nb_matches)])
+        stats = stub.stats()
+        stub.stop()
+
+        if duration is None:
+            print("{:>2} event loops : stuck after {} requests".format(loops, stats["requests"]))
+            continue
+        print("{:>2} event loops : {:>6.2f} s, {:>6.1f} matches/s for a limit of {}/s, {} 429 received, {} failures".format(
+            loops, duration, (nb_matches - len(failures)) / duration, APP_LIMITS[0][0], stats["rateLimited"], len(failures)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4, int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,50 @@
+"""
+Benchmark of the calls to several servers from one instance, against a local stub server enforcing the limits of each server apart.
+
+The same calls are sent server after server with get_many, then to all the servers at once with get_many_servers.
+Each server having its own rate limits, the fan out is as fast as the slowest server instead of the sum of all of them.
+Run with : python benchmark/multi_region.py [nb_requests_per_server]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+APP_LIMITS = ((20, 1), (1000, 120))
+SERVERS = ["euw1", "na1", "kr", "br1", "jp1", "oc1"]
+
+
+async def scenario(nb_requests, fanOut):
+    #Start from fresh limiters, they are shared by all the instances of the process
+    utils.Singleton._instances.clear()
+
+    stub = StubServer(appLimits=APP_LIMITS)
+    base_url = await stub.start()
+    args = {server: ["summonerId-" + str(i) for i in range(nb_requests)] for server in SERVERS}
+    async with stub_pantheon(base_url, server=None) as panth:
+        start = time.perf_counter()
+        if fanOut:
+            async for server, summonerId, summoner in panth.get_many_servers("get_summoner", args, concurrency=20):
+                pass
+        else:
+            for server in SERVERS:
+                async for summonerId, summoner in panth.get_many("get_summoner", args[server], concurrency=20, platform=server):
+                    pass
+        duration = time.perf_counter() - start
+    await stub.stop()
+    return duration, nb_requests * len(SERVERS) / duration
+
+
+def main(nb_requests):
+    print("{} requests on each of {}, application limits {} per server".format(nb_requests, ", ".join(SERVERS), APP_LIMITS))
+    for name, fanOut in (("server by server", False), ("get_many_servers", True)):
+        duration, rps = asyncio.run(scenario(nb_requests, fanOut))
+        print("{:>20} : {:>6.2f} s, {:>6.1f} calls/s".format(name, duration, rps))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,72 @@
+"""
+Benchmark of the priority lanes of the rate limiters, against a local stub server enforcing the limits.
+
+A background crawl queues many get_summoner calls while a live overlay polls get_current_game.
+With one FIFO lane, each overlay call waits behind the whole crawl backlog. With the overlay in a higher lane,
+it only waits for the next free slot, the crawl keeping a guaranteed share of the tokens.
+Run with : python benchmark/priority.py [nb_background_calls] [overlay_calls]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.utils import exceptions as exc
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+APP_LIMITS = ((20, 1), (1000, 120))
+
+
+async def scenario(nb_background, nb_overlay, **params):
+    #Start from fresh limiters, they are shared by all the instances of the process
+    utils.Singleton._instances.clear()
+
+    stub = StubServer(appLimits=APP_LIMITS)
+    base_url = await stub.start()
+    async with stub_pantheon(base_url, **params) as panth:
+        #Learn the limits of the key first
+        await panth.get_status()
+
+        start = time.perf_counter()
+        crawl = asyncio.ensure_future(asyncio.gather(*[panth.get_summoner("summonerId-" + str(i)) for i in range(nb_background)]))
+
+        latencies = []
+
+        async def poll(i):
+            sent = time.perf_counter()
+            try:
+                await panth.get_current_game("summonerId-" + str(i))
+            except exc.NotFound:
+                pass
+            latencies.append(time.perf_counter() - sent)
+
+        #The overlay polls on a fixed schedule, whether the previous calls returned or not
+        polls = []
+        for i in range(nb_overlay):
+            await asyncio.sleep(0.25)
+            polls.append(asyncio.ensure_future(poll(i)))
+
+        await asyncio.gather(crawl, *polls)
+        duration = time.perf_counter() - start
+    await stub.stop()
+
+    latencies.sort()
+    return latencies[len(latencies) // 2], latencies[-1], nb_background / duration
+
+
+def main(nb_background, nb_overlay):
+    print("{} background get_summoner calls, {} overlay get_current_game calls, application limits {}".format(nb_background, nb_overlay, APP_LIMITS))
+    results = {
+        "FIFO": asyncio.run(scenario(nb_background, nb_overlay)),
+        "overlay priority": asyncio.run(scenario(nb_background, nb_overlay, priorities={"get_current_game": 10}, lane_shares={0: 0.2}))
+    }
+    for name, (p50, worst, rps) in results.items():
+        print("{:>20} : overlay p50 {:>7.3f} s, worst {:>7.3f} s, crawl {:>6.1f} calls/s".format(name, p50, worst, rps))
+
+
+if __name__ == "__main__":
+    nb_background = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    nb_overlay = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    main(nb_background, nb_overlay)
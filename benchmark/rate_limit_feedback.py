@@ -0,0 +1,91 @@
+"""
+Benchmark of the feedback of the rate limit headers into the limiters, against a local stub server enforcing the limits.
+
+Another client uses the same key at a steady rate without going through Pantheon, as another script or machine would.
+Without the feedback, Pantheon believes it owns the whole budget and gets 429s. With it, the counts returned by the
+server correct the local ones, and a 429 only blocks the limiter that was exceeded for Retry-After.
+Run with : python benchmark/rate_limit_feedback.py [nb_requests] [foreign_requests_per_second]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.RateLimit.RateLimiterManager import RateLimiterServer
+from pantheon.utils import exceptions as exc
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+APP_LIMITS = ((50, 1), (500, 10))
+
+
+async def foreign(base_url, rate, stop):
+    url = base_url.format(server="euw1") + "lol/summoner/v4/summoners/by-puuid/foreign"
+    async with aiohttp.ClientSession() as session:
+        while not stop.is_set():
+            async with session.get(url, headers={"X-Riot-Token": "RGAPI-BENCHMARK"}) as response:
+                await response.read()
+            await asyncio.sleep(1 / rate)
+
+
+async def scenario(nb_requests, rate):
+    #Start from fresh limiters, they are shared by all the instances of the process
+    utils.Singleton._instances.clear()
+
+    stub = StubServer(appLimits=APP_LIMITS)
+    base_url = await stub.start()
+    stop = asyncio.Event()
+    foreignTask = asyncio.ensure_future(foreign(base_url, rate, stop))
+
+    failed = 0
+    rateLimited = 0
+
+    def log(url, status, headers):
+        nonlocal rateLimited
+        if status == 429:
+            rateLimited += 1
+
+    async with stub_pantheon(base_url, auto_retry=True, requests_logging_function=log) as panth:
+        semaphore = asyncio.Semaphore(20)
+
+        async def one(i):
+            nonlocal failed
+            async with semaphore:
+                try:
+                    await panth.get_summoner("summonerId-" + str(i))
+                except exc.RateLimit:
+                    failed += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(nb_requests)])
+        duration = time.perf_counter() - start
+
+    stop.set()
+    await foreignTask
+    await stub.stop()
+    return rateLimited, failed, nb_requests / duration
+
+
+def main(nb_requests, rate):
+    print("{} requests, another client sending {} requests/s on the same key, application limits {}".format(nb_requests, rate, APP_LIMITS))
+
+    #Former behaviour, the count headers are ignored and a 429 does not block any limiter
+    getCounts, block = utils.getCounts, RateLimiterServer.block
+    utils.getCounts = lambda headers: None
+    RateLimiterServer.block = lambda *args: None
+    results = {"without feedback": asyncio.run(scenario(nb_requests, rate))}
+
+    utils.getCounts, RateLimiterServer.block = getCounts, block
+    results["with feedback"] = asyncio.run(scenario(nb_requests, rate))
+
+    for name, (rateLimited, failed, rps) in results.items():
+        print("{:>20} : {:>5} 429 received by Pantheon, {:>4} calls failed, {:>7.1f} calls/s".format(name, rateLimited, failed, rps))
+
+
+if __name__ == "__main__":
+    nb_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 15
+    main(nb_requests, rate)
@@ -0,0 +1,63 @@
+"""
+Benchmark of the connection handling of Pantheon against a local stub server.
+
+Compares the former behaviour (one aiohttp.ClientSession per request) with the shared pooled session.
+Run with : python benchmark/session.py [nb_requests] [concurrency]
+"""
+import asyncio
+import os
+import sys
+import time
+
+import aiohttp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon import Pantheon
+from stub import StubServer, stub_pantheon
+
+
+class SessionPerRequestPantheon(Pantheon):
+    """
+    Former fetch implementation, opening a new session for each request
+    """
+    async def fetch(self, url, method="GET", data=None, key=None):
+        async with aiohttp.ClientSession() as session:
+            response = await session.request(method, url, headers={"X-Riot-Token": self._key})
+            await response.read()
+            return response
+
+
+async def run(panth, nb_requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            await panth.get_summoner_by_puuId("puuId" + str(i))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(nb_requests)])
+    return nb_requests / (time.perf_counter() - start)
+
+
+async def main(nb_requests, concurrency):
+    stub = StubServer()
+    base_url = await stub.start()
+    try:
+        before = stub_pantheon(base_url, SessionPerRequestPantheon)
+        rps_before = await run(before, nb_requests, concurrency)
+
+        async with stub_pantheon(base_url) as after:
+            rps_after = await run(after, nb_requests, concurrency)
+    finally:
+        await stub.stop()
+
+    print("{:>30} : {:>10.1f} requests/s".format("session per request", rps_before))
+    print("{:>30} : {:>10.1f} requests/s".format("shared pooled session", rps_after))
+    print("{:>30} : {:>10.2f}x".format("speedup", rps_after / rps_before))
+    print("Stub is plain HTTP on localhost, the gap is wider against the real API as TLS and DNS are skipped here")
+
+
+if __name__ == "__main__":
+    nb_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(nb_requests, concurrency))
@@ -0,0 +1,73 @@
+"""
+Benchmark of rate limiting shared between processes against a local stub server enforcing the limits.
+
+Several worker processes call the stub with the same key, once with the default in-memory limiters
+(each process believes it owns the whole budget) and once with the limiters shared through a SQLite file.
+Run with : python benchmark/shared_limits.py [nb_processes] [requests_per_process]
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.RateLimit.Backends import SQLiteBackend
+from pantheon.utils import exceptions as exc
+from stub import StubServer, stub_pantheon
+
+APP_LIMITS = ((40, 1), (300, 10))
+
+
+async def worker(base_url, path, nb_requests):
+    backend = SQLiteBackend(path) if not path is None else None
+    rateLimited = 0
+    async with stub_pantheon(base_url, ratelimit_backend=backend) as panth:
+        async def one(i):
+            nonlocal rateLimited
+            try:
+                await panth.get_summoner_by_puuId("puuId" + str(i))
+            except exc.RateLimit:
+                rateLimited += 1
+
+        await asyncio.gather(*[one(i) for i in range(nb_requests)])
+    return rateLimited
+
+
+def run_worker(base_url, path, nb_requests, results):
+    results.put(asyncio.run(worker(base_url, path, nb_requests)))
+
+
+async def scenario(nb_processes, nb_requests, path):
+    stub = StubServer(appLimits=APP_LIMITS)
+    base_url = await stub.start()
+
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    processes = [context.Process(target=run_worker, args=(base_url, path, nb_requests, results)) for i in range(nb_processes)]
+
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    loop = asyncio.get_running_loop()
+    for process in processes:
+        await loop.run_in_executor(None, process.join)
+    duration = time.perf_counter() - start
+
+    await stub.stop()
+    clientRateLimited = sum(results.get() for process in processes)
+    return stub.requests, stub.rateLimited, clientRateLimited, duration
+
+
+def main(nb_processes, nb_requests):
+    print("{} processes, {} requests each, application limits {}".format(nb_processes, nb_requests, APP_LIMITS))
+    for name, path in (("in memory", None), ("shared SQLite", os.path.join(tempfile.mkdtemp(), "limits.db"))):
+        requests, rateLimited, clientRateLimited, duration = asyncio.run(scenario(nb_processes, nb_requests, path))
+        print("{:>15} : {:>5} requests sent, {:>5} 429 received, {:>7.2f} s, {:>7.1f} successful requests/s".format(name, requests, rateLimited, duration, (requests - rateLimited) / duration))
+
+
+if __name__ == "__main__":
+    nb_processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    nb_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    main(nb_processes, nb_requests)
@@ -0,0 +1,547 @@
+"""
+Stub of the Riot API used by the benchmarks, serving every endpoint wrapped by Pantheon with canned payloads.
+
+It enforces the rate limits it advertises per API key, as the Riot API does : the application limits and the limits of each method,
+returning 429 with Retry-After and X-Rate-Limit-Type once one is exceeded. Latency and server errors can be injected.
+The payloads are generated from the arguments of the request, so the same match or player is always the same,
+and the players of the matches have their own matchlists, allowing to crawl.
+"""
+import asyncio
+import json
+import math
+import multiprocessing
+import random
+import re
+import time
+import zlib
+from collections import OrderedDict
+from string import Formatter
+
+from aiohttp import web
+
+from pantheon import Pantheon
+from pantheon.endpoints import ENDPOINTS
+
+#Fields of the participants of a match, all integers
+PARTICIPANT_STATS = (
+    "assists", "baronKills", "bountyLevel", "champExperience", "champLevel", "championId", "consumablesPurchased",
+    "damageDealtToBuildings", "damageDealtToObjectives", "damageDealtToTurrets", "damageSelfMitigated", "deaths",
+    "detectorWardsPlaced", "doubleKills", "dragonKills", "goldEarned", "goldSpent", "inhibitorKills", "inhibitorTakedowns",
+    "inhibitorsLost", "item0", "item1", "item2", "item3", "item4", "item5", "item6", "itemsPurchased", "killingSprees",
+    "kills", "largestCriticalStrike", "largestKillingSpree", "largestMultiKill", "longestTimeSpentLiving", "magicDamageDealt",
+    "magicDamageDealtToChampions", "magicDamageTaken", "neutralMinionsKilled", "nexusKills", "objectivesStolen",
+    "pentaKills", "physicalDamageDealt", "physicalDamageDealtToChampions", "physicalDamageTaken", "profileIcon",
+    "quadraKills", "sightWardsBoughtInGame", "spell1Casts", "spell2Casts", "spell3Casts", "spell4Casts", "summoner1Id",
+    "summoner2Id", "timeCCingOthers", "timePlayed", "totalDamageDealt", "totalDamageDealtToChampions", "totalDamageShieldedOnTeammates",
+    "totalDamageTaken", "totalHeal", "totalHealsOnTeammates", "totalMinionsKilled", "totalTimeCCDealt", "totalTimeSpentDead",
+    "totalUnitsHealed", "tripleKills", "trueDamageDealt", "trueDamageDealtToChampions", "trueDamageTaken", "turretKills",
+    "turretTakedowns", "turretsLost", "unrealKills", "visionScore", "visionWardsBoughtInGame", "wardsKilled", "wardsPlaced"
+)
+
+#Fields of the participant frames of a timeline
+FRAME_STATS = ("currentGold", "goldPerSecond", "jungleMinionsKilled", "level", "minionsKilled", "timeEnemySpentControlled", "totalGold", "xp")
+CHAMPION_STATS = ("abilityPower", "armor", "attackDamage", "attackSpeed", "health", "healthMax", "magicResist", "movementSpeed", "power", "powerMax")
+DAMAGE_STATS = ("magicDamageDone", "magicDamageDoneToChampions", "magicDamageTaken", "physicalDamageDone", "physicalDamageDoneToChampions",
+    "physicalDamageTaken", "totalDamageDone", "totalDamageDoneToChampions", "totalDamageTaken", "trueDamageDone", "trueDamageDoneToChampions", "trueDamageTaken")
+EVENT_TYPES = ("ITEM_PURCHASED", "SKILL_LEVEL_UP", "WARD_PLACED", "CHAMPION_KILL", "ITEM_DESTROYED", "LEVEL_UP", "WARD_KILL", "BUILDING_KILL", "ELITE_MONSTER_KILL")
+
+TIERS = ("IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "DIAMOND")
+
+
+class StubServer:
+
+    #Method limits declared by the endpoints
+    endpointLimits = {endpoint.name: endpoint.limits for endpoint in ENDPOINTS}
+
+    def __init__(self, appLimits=((1000000, 1),), methodLimits=None, body=None, latency=0, jitter=0, errorRate=0, players=10000, matchesPerPlayer=200, leaguePages=5, inGameRate=0.3, forbiddenKeys=(), seed=0):
+        """
+        :param tuple appLimits: application limits enforced per API key, as (limit, duration)
+        :param methodLimits: limits enforced for each method, as (limit, duration). A tuple applies to all the methods, a dict gives them per method name. Default is None, the limits declared by each endpoint
+        :param dict body: JSON payload returned for every request instead of the generated ones
+        :param float latency: number of seconds before answering
+        :param float jitter: maximum number of seconds randomly added to the latency
+        :param float errorRate: probability of answering with a server error (500, 502, 503 or 504)
+        :param int players: number of players the matches are played by
+        :param int matchesPerPlayer: length of the matchlist of each player
+        :param int leaguePages: number of full pages of each league division, the next one being empty
+        :param float inGameRate: probability of a player being in game when calling the spectator
+        :param tuple forbiddenKeys: API keys answered with 403
+        :param int seed: seed of the random generators
+        """
+        self.appLimits = appLimits
+        self.methodLimits = methodLimits
+        self.body = json.dumps(body).encode() if not body is None else None
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.players = players
+        self.matchesPerPlayer = matchesPerPlayer
+        self.leaguePages = leaguePages
+        self.inGameRate = inGameRate
+        self.forbiddenKeys = set(forbiddenKeys)
+        self.seed = seed
+
+        self._random = random.Random(seed)
+
+        #Path patterns, the most specific first so that a literal segment is not taken for an argument
+        self._routes = sorted(((self._pattern(endpoint), endpoint) for endpoint in ENDPOINTS), key=lambda route: -len(route[1].path.replace("{", "").replace("}", "")))
+
+        #Time windows per API key and limiter, [start, count]
+        self.windows = {}
+
+        #Last generated payloads, generating a match being costly
+        self._payloads = OrderedDict()
+
+        self.requests = 0
+        self.rateLimited = 0
+        self.errors = 0
+        self.methods = {}
+
+    @staticmethod
+    def _pattern(endpoint):
+        pattern = "/(?P<_server>[^/]+)/"
+        for literal, field, spec, conversion in Formatter().parse(endpoint.path):
+            pattern += re.escape(literal)
+            if field == "stub":
+                pattern += "(?P<stub>(-stub)?)"
+            elif not field is None:
+                pattern += "(?P<{}>[^/]+)".format(field)
+        return re.compile(pattern)
+
+    def _route(self, path):
+        for pattern, endpoint in self._routes:
+            match = pattern.fullmatch(path)
+            if match:
+                return endpoint, match.groupdict()
+        return None, None
+
+    def stats(self):
+        return {"requests": self.requests, "rateLimited": self.rateLimited, "errors": self.errors, "methods": dict(self.methods)}
+
+    def _limits(self, name):
+        if self.methodLimits is None:
+            return self.endpointLimits[name]
+        if isinstance(self.methodLimits, dict):
+            return self.methodLimits.get(name, self.endpointLimits[name])
+        return self.methodLimits
+
+    def _check(self, key, limits, now):
+        exceeded = None
+        for limit, duration in limits:
+            window = self.windows.setdefault((key, duration), [now, 0])
+            if window[0] + duration <= now:
+                window[0] = now
+                window[1] = 0
+            if window[1] >= limit:
+                exceeded = max(exceeded or 0, window[0] + duration - now)
+        return exceeded
+
+    def _count(self, key, limits):
+        for limit, duration in limits:
+            self.windows[(key, duration)][1] += 1
+
+    def _counts(self, key, limits):
+        return ",".join("{}:{}".format(self.windows[(key, duration)][1], duration) for limit, duration in limits)
+
+    async def handler(self, request):
+        now = time.monotonic()
+        self.requests += 1
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self._random.random() * self.jitter)
+
+        apiKey = request.headers.get("X-Riot-Token")
+        if apiKey is None:
+            return self._error(401, "Unauthorized")
+        if apiKey in self.forbiddenKeys:
+            return self._error(403, "Forbidden")
+
+        endpoint, values = self._route(request.path)
+        if endpoint is None or endpoint.method != request.method:
+            return self._error(404, "Not found")
+        self.methods[endpoint.name] = self.methods.get(endpoint.name, 0) + 1
+
+        methodLimits = self._limits(endpoint.name)
+        appKey, methodKey = (apiKey, values["_server"], "app"), (apiKey, values["_server"], endpoint.name)
+        headers = {
+            "X-App-Rate-Limit": ",".join("{}:{}".format(*l) for l in self.appLimits),
+            "X-Method-Rate-Limit": ",".join("{}:{}".format(*l) for l in methodLimits),
+            "Content-Type": "application/json;charset=utf-8"
+        }
+
+        for key, limits, limitType in ((appKey, self.appLimits, "application"), (methodKey, methodLimits, "method")):
+            exceeded = self._check(key, limits, now)
+            if not exceeded is None:
+                self.rateLimited += 1
+                headers["Retry-After"] = str(math.ceil(exceeded))
+                headers["X-Rate-Limit-Type"] = limitType
+                headers["X-App-Rate-Limit-Count"] = self._counts(appKey, self.appLimits)
+                headers["X-Method-Rate-Limit-Count"] = self._counts(methodKey, methodLimits)
+                return web.Response(status=429, headers=headers)
+
+        self._count(appKey, self.appLimits)
+        self._count(methodKey, methodLimits)
+        headers["X-App-Rate-Limit-Count"] = self._counts(appKey, self.appLimits)
+        headers["X-Method-Rate-Limit-Count"] = self._counts(methodKey, methodLimits)
+
+        if self.errorRate and self._random.random() < self.errorRate:
+            self.errors += 1
+            return self._error(self._random.choice((500, 502, 503, 504)), "Internal server error", headers)
+
+        if not self.body is None:
+            return web.Response(body=self.body, headers=headers)
+
+        body = self._payload(endpoint, values, request.query)
+        if body is None:
+            return self._error(404, "Data not found", headers)
+        return web.Response(body=body, headers=headers)
+
+    def _error(self, status, message, headers=None):
+        body = json.dumps({"status": {"message": message, "status_code": status}}).encode()
+        headers = dict(headers or {}, **{"Content-Type": "application/json;charset=utf-8"})
+        return web.Response(status=status, body=body, headers=headers)
+
+    def _payload(self, endpoint, values, query):
+        key = (endpoint.name, tuple(sorted(values.items())), tuple(sorted(query.items())))
+        if key in self._payloads:
+            self._payloads.move_to_end(key)
+            return self._payloads[key]
+
+        generate = getattr(self, "_" + endpoint.name, None)
+        data = generate(values, query) if not generate is None else dict({name: value for name, value in values.items() if name != "_server"}, endpoint=endpoint.name)
+        body = json.dumps(data).encode() if not data is None else None
+
+        self._payloads[key] = body
+        if len(self._payloads) > 4096:
+            self._payloads.popitem(last=False)
+        return body
+
+    #Generated payloads
+
+    def _rng(self, *values):
+        return random.Random(zlib.crc32("/".join(str(v) for v in (self.seed,) + values).encode()))
+
+    def _player(self, index):
+        return {"puuid": "puuid-{}".format(index), "summonerId": "summonerId-{}".format(index), "accountId": "accountId-{}".format(index), "summonerName": "Player {}".format(index)}
+
+    def _index(self, value):
+        #Index of the player from any of its ids, unknown values being spread over the players
+        try:
+            return int(str(value).rsplit("-", 1)[1]) % self.players
+        except (IndexError, ValueError):
+            return zlib.crc32(str(value).encode()) % self.players
+
+    def _summoner(self, index):
+        player = self._player(index)
+        rng = self._rng("summoner", index)
+        return {"id": player["summonerId"], "accountId": player["accountId"], "puuid": player["puuid"], "name": player["summonerName"],
+            "profileIconId": rng.randrange(5000), "revisionDate": 1600000000000 + rng.randrange(10**10), "summonerLevel": rng.randrange(30, 500)}
+
+    def _get_summoner(self, values, query):
+        return self._summoner(self._index(values["summonerId"]))
+
+    def _get_summoner_by_accountId(self, values, query):
+        return self._summoner(self._index(values["accountId"]))
+
+    def _get_summoner_by_name(self, values, query):
+        return self._summoner(self._index(values["summonerName"]))
+
+    def _get_summoner_by_puuId(self, values, query):
+        return self._summoner(self._index(values["puuId"]))
+
+    _get_tft_summoner = _get_summoner
+    _get_tft_summoner_by_accountId = _get_summoner_by_accountId
+    _get_tft_summoner_by_name = _get_summoner_by_name
+    _get_tft_summoner_by_puuId = _get_summoner_by_puuId
+
+    def _get_account_by_puuId(self, values, query):
+        index = self._index(values["puuId"])
+        return {"puuid": "puuid-{}".format(index), "gameName": "Player {}".format(index), "tagLine": "EUW"}
+
+    def _get_account_by_riotId(self, values, query):
+        return self._get_account_by_puuId({"puuId": values["gameName"]}, query)
+
+    def _matchlist(self, values, query, prefix):
+        index = self._index(values["puuId"])
+        start = int(query.get("start", 0))
+        count = int(query.get("count", 20))
+        rng = self._rng("matchlist", index)
+        nbMatches = self.players * self.matchesPerPlayer // 10
+        matchIds = ["{}_{}".format(prefix, rng.randrange(nbMatches)) for i in range(self.matchesPerPlayer)]
+        return matchIds[start:start + count]
+
+    def _get_matchlist(self, values, query):
+        return self._matchlist(values, query, "EUW1")
+
+    def _get_tft_matchlist(self, values, query):
+        return self._matchlist(values, query, "EUW1")
+
+    def _get_lor_matchlist(self, values, query):
+        return self._matchlist(values, query, "lor")
+
+    def _participants(self, matchId, nb):
+        rng = self._rng("participants", matchId)
+        return [self._player(index) for index in rng.sample(range(self.players), nb)]
+
+    def _get_match(self, values, query):
+        matchId = values["matchId"]
+        rng = self._rng("match", matchId)
+        players = self._participants(matchId, 10)
+        gameDuration = rng.randrange(900, 2700)
+
+        participants = []
+        for participantId, player in enumerate(players, 1):
+            participant = {stat: rng.randrange(20000) for stat in PARTICIPANT_STATS}
+            participant.update(player)
+            participant.update({
+                "participantId": participantId,
+                "teamId": 100 if participantId <= 5 else 200,
+                "win": (participantId <= 5) == (gameDuration % 2 == 0),
+                "championName": "Champion{}".format(participant["championId"] % 160),
+                "teamPosition": ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")[(participantId - 1) % 5],
+                "perks": {"statPerks": {"defense": 5002, "flex": 5008, "offense": 5005},
+                    "styles": [{"description": "primaryStyle", "style": 8100, "selections": [{"perk": 8112 + i, "var1": rng.randrange(2000), "var2": 0, "var3": 0} for i in range(4)]}]}
+            })
+            participants.append(participant)
+
+        return {
+            "metadata": {"dataVersion": "2", "matchId": matchId, "participants": [player["puuid"] for player in players]},
+            "info": {
+                "gameCreation": 1600000000000 + rng.randrange(10**10), "gameDuration": gameDuration, "gameId": zlib.crc32(matchId.encode()),
+                "gameMode": "CLASSIC", "gameType": "MATCHED_GAME", "gameVersion": "12.1.416.4011", "mapId": 11, "platformId": "EUW1", "queueId": 420,
+                "participants": participants,
+                "teams": [{"teamId": teamId, "win": (teamId == 100) == (gameDuration % 2 == 0),
+                    "bans": [{"championId": rng.randrange(160), "pickTurn": turn} for turn in range(1, 6)],
+                    "objectives": {name: {"first": rng.random() < 0.5, "kills": rng.randrange(12)} for name in ("baron", "champion", "dragon", "inhibitor", "riftHerald", "tower")}}
+                    for teamId in (100, 200)]
+            }
+        }
+
+    def _get_timeline(self, values, query):
+        matchId = values["matchId"]
+        rng = self._rng("timeline", matchId)
+        players = self._participants(matchId, 10)
+        nbFrames = self._rng("match", matchId).randrange(900, 2700) // 60 + 1
+
+        frames = []
+        for frame in range(nbFrames):
+            participantFrames = {}
+            for participantId in range(1, 11):
+                participantFrame = {stat: rng.randrange(20000) for stat in FRAME_STATS}
+                participantFrame.update({
+                    "participantId": participantId,
+                    "championStats": {stat: rng.randrange(5000) for stat in CHAMPION_STATS},
+                    "damageStats": {stat: rng.randrange(50000) for stat in DAMAGE_STATS},
+                    "position": {"x": rng.randrange(15000), "y": rng.randrange(15000)}
+                })
+                participantFrames[str(participantId)] = participantFrame
+
+            events = []
+            for i in range(rng.randrange(5, 30)):
+                eventType = rng.choice(EVENT_TYPES)
+                event = {"timestamp": frame * 60000 + rng.randrange(60000), "type": eventType, "participantId": rng.randrange(1, 11)}
+                if eventType == "CHAMPION_KILL":
+                    event.update({"killerId": event.pop("participantId"), "victimId": rng.randrange(1, 11), "assistingParticipantIds": rng.sample(range(1, 11), rng.randrange(4)),
+                        "bounty": 300, "position": {"x": rng.randrange(15000), "y": rng.randrange(15000)}})
+                elif eventType.startswith("ITEM"):
+                    event["itemId"] = rng.randrange(1000, 7000)
+                elif eventType == "SKILL_LEVEL_UP":
+                    event.update({"skillSlot": rng.randrange(1, 5), "levelUpType": "NORMAL"})
+                events.append(event)
+            events.sort(key=lambda event: event["timestamp"])
+
+            frames.append({"timestamp": frame * 60000, "participantFrames": participantFrames, "events": events})
+
+        return {
+            "metadata": {"dataVersion": "2", "matchId": matchId, "participants": [player["puuid"] for player in players]},
+            "info": {"frameInterval": 60000, "gameId": zlib.crc32(matchId.encode()), "frames": frames,
+                "participants": [{"participantId": participantId, "puuid": player["puuid"]} for participantId, player in enumerate(players, 1)]}
+        }
+
+    def _get_tft_match(self, values, query):
+        matchId = values["matchId"]
+        rng = self._rng("tft", matchId)
+        players = self._participants(matchId, 8)
+        return {
+            "metadata": {"data_version": "5", "match_id": matchId, "participants": [player["puuid"] for player in players]},
+            "info": {"game_datetime": 1600000000000 + rng.randrange(10**10), "game_length": rng.random() * 2000, "game_version": "12.1", "queue_id": 1100, "tft_set_number": 6,
+                "participants": [{"puuid": player["puuid"], "placement": placement, "level": rng.randrange(5, 10), "gold_left": rng.randrange(50),
+                    "last_round": rng.randrange(10, 40), "total_damage_to_players": rng.randrange(200),
+                    "units": [{"character_id": "TFT6_Unit{}".format(rng.randrange(60)), "rarity": rng.randrange(5), "tier": rng.randrange(1, 4), "items": rng.sample(range(100), 3)} for i in range(8)],
+                    "traits": [{"name": "Set6_Trait{}".format(rng.randrange(30)), "num_units": rng.randrange(1, 7), "tier_current": rng.randrange(4)} for i in range(6)]}
+                    for placement, player in enumerate(players, 1)]}
+        }
+
+    def _entry(self, index, rng, queue, tier, division):
+        player = self._player(index)
+        return {"leagueId": "league-{}-{}".format(tier, division), "queueType": queue, "tier": tier, "rank": division,
+            "summonerId": player["summonerId"], "summonerName": player["summonerName"], "leaguePoints": rng.randrange(100),
+            "wins": rng.randrange(300), "losses": rng.randrange(300), "veteran": False, "inactive": False, "freshBlood": False, "hotStreak": rng.random() < 0.1}
+
+    def _leaguePage(self, queue, tier, division, page):
+        if page > self.leaguePages:
+            return []
+        rng = self._rng("league", queue, tier, division, page)
+        return [self._entry(rng.randrange(self.players), rng, queue, tier, division) for i in range(205)]
+
+    def _get_league_pages(self, values, query):
+        return self._leaguePage(values["queue"], values["tier"], values["division"], int(query.get("page", 1)))
+
+    def _get_tft_league_pages(self, values, query):
+        return self._leaguePage("RANKED_TFT", values["tier"], values["division"], int(query.get("page", 1)))
+
+    def _get_league_position(self, values, query):
+        index = self._index(values["summonerId"])
+        rng = self._rng("position", index)
+        return [self._entry(index, rng, "RANKED_SOLO_5x5", rng.choice(TIERS), rng.choice(("I", "II", "III", "IV")))]
+
+    _get_tft_league_position = _get_league_position
+
+    def _league(self, tier, queue, nb):
+        rng = self._rng("apex", tier, queue)
+        entries = [self._entry(rng.randrange(self.players), rng, queue, tier, "I") for i in range(nb)]
+        for entry in entries:
+            for field in ("leagueId", "queueType", "tier"):
+                del entry[field]
+        return {"tier": tier, "leagueId": "league-{}".format(tier), "queue": queue, "name": "Stub's League", "entries": entries}
+
+    def _get_challenger_league(self, values, query):
+        return self._league("CHALLENGER", values["queue"], 300)
+
+    def _get_grandmaster_league(self, values, query):
+        return self._league("GRANDMASTER", values["queue"], 700)
+
+    def _get_master_league(self, values, query):
+        return self._league("MASTER", values["queue"], 3000)
+
+    def _get_league_by_id(self, values, query):
+        return self._league("MASTER", "RANKED_SOLO_5x5", 200)
+
+    def _get_tft_challenger_league(self, values, query):
+        return self._league("CHALLENGER", "RANKED_TFT", 200)
+
+    def _get_tft_grandmaster_league(self, values, query):
+        return self._league("GRANDMASTER", "RANKED_TFT", 500)
+
+    def _get_tft_master_league(self, values, query):
+        return self._league("MASTER", "RANKED_TFT", 2000)
+
+    def _get_tft_league_by_id(self, values, query):
+        return self._league("MASTER", "RANKED_TFT", 200)
+
+    def _game(self, gameId):
+        rng = self._rng("game", gameId)
+        return {"gameId": gameId, "mapId": 11, "gameMode": "CLASSIC", "gameType": "MATCHED_GAME", "gameQueueConfigId": 420, "platformId": "EUW1",
+            "gameStartTime": int(time.time() * 1000) - rng.randrange(2000000), "gameLength": rng.randrange(2000),
+            "observers": {"encryptionKey": "key{}".format(gameId)},
+            "bannedChampions": [{"championId": rng.randrange(160), "teamId": 100 if turn < 5 else 200, "pickTurn": turn + 1} for turn in range(10)],
+            "participants": [{"teamId": 100 if i < 5 else 200, "championId": rng.randrange(160), "spell1Id": 4, "spell2Id": 14, "profileIconId": rng.randrange(5000),
+                "bot": False, "summonerName": player["summonerName"], "summonerId": player["summonerId"], "perks": {"perkIds": rng.sample(range(8000, 9000), 9), "perkStyle": 8000, "perkSubStyle": 8100}}
+                for i, player in enumerate(self._participants(gameId, 10))]}
+
+    def _get_current_game(self, values, query):
+        index = self._index(values["summonerId"])
+        #Players are in game for a few minutes, then out for a while
+        period = int(time.time() // 120)
+        if self._rng("ingame", index, period).random() >= self.inGameRate:
+            return None
+        return self._game(index * 1000 + period)
+
+    def _get_featured_games(self, values, query):
+        period = int(time.time() // 120)
+        return {"gameList": [self._game(period * 100 + i) for i in range(5)], "clientRefreshInterval": 300}
+
+    def _get_champion_rotations(self, values, query):
+        return {"freeChampionIds": list(range(1, 16)), "freeChampionIdsForNewPlayers": list(range(16, 26)), "maxNewPlayerLevel": 10}
+
+    def _get_champion_masteries(self, values, query):
+        rng = self._rng("masteries", values["summonerId"])
+        return [{"championId": championId, "championLevel": rng.randrange(1, 8), "championPoints": rng.randrange(500000), "summonerId": values["summonerId"]} for championId in rng.sample(range(1, 160), 40)]
+
+    def _get_champion_masteries_score(self, values, query):
+        return self._rng("score", values["summonerId"]).randrange(50, 500)
+
+    def _get_status(self, values, query):
+        return {"id": "EUW1", "name": "EU West", "locales": ["en_GB"], "maintenances": [], "incidents": []}
+
+    def _register_provider(self, values, query):
+        return 1
+
+    def _register_tournament(self, values, query):
+        return 2
+
+    def _create_tournament_code(self, values, query):
+        return ["EUW-CODE-{}-{}".format(query.get("tournamentId"), i) for i in range(int(query.get("count", 1)))]
+
+    def _get_lobby_events(self, values, query):
+        return {"eventList": [{"eventType": "PracticeGameCreatedEvent", "summonerId": "summonerId-0", "timestamp": "1600000000000"}]}
+
+    async def start(self, port=0):
+        """
+        Returns the base url to give to stub_pantheon
+        """
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return "http://127.0.0.1:{port}/{{server}}/".format(port=port)
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def _serve(connection, params):
+    async def serve():
+        stub = StubServer(**params)
+        connection.send(await stub.start())
+        loop = asyncio.get_running_loop()
+        while True:
+            command = await loop.run_in_executor(None, connection.recv)
+            if command == "stats":
+                connection.send(stub.stats())
+            else:
+                break
+        await stub.stop()
+    asyncio.run(serve())
+
+
+class StubProcess:
+    """
+    Stub server running in its own process, so that its CPU time is not counted with the one of the client
+    """
+
+    def __init__(self, **params):
+        """
+        :param params: parameters of StubServer
+        """
+        self.params = params
+
+    def start(self):
+        """
+        Returns the base url to give to stub_pantheon
+        """
+        context = multiprocessing.get_context("spawn")
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child, self.params), daemon=True)
+        self._process.start()
+        return self._connection.recv()
+
+    def stats(self):
+        self._connection.send("stats")
+        return self._connection.recv()
+
+    def stop(self):
+        self._connection.send("stop")
+        self._process.join()
+
+
+def stub_pantheon(base_url, cls=Pantheon, server="euw1", api_key="RGAPI-BENCHMARK", **params):
+    """
+    Pantheon instance targeting the stub server instead of the Riot API
+    """
+    class StubPantheon(cls):
+        BASE_URL = base_url
+    return StubPantheon(server, api_key, **params)
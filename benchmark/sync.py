@@ -0,0 +1,67 @@
+"""
+Benchmark of Pantheon called from synchronous code, as Django views or a thread pool, against a local stub server.
+
+Several threads each fetch summoners one at a time, once running asyncio.run with a new Pantheon instance for each call
+(a new event loop and connection pool every time), and once calling a SyncPantheon shared by all the threads.
+The stub server runs in its own process.
+Run with : python benchmark/sync.py [nb_threads] [calls_per_thread]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon import SyncPantheon
+from stub import StubProcess, stub_pantheon
+
+
+def per_call(base_url, nb_calls, latencies):
+    async def call(i):
+        async with stub_pantheon(base_url) as panth:
+            return await panth.get_summoner_by_puuId("puuid-" + str(i))
+
+    for i in range(nb_calls):
+        start = time.perf_counter()
+        asyncio.run(call(i))
+        latencies.append(time.perf_counter() - start)
+
+
+def shared(sync, nb_calls, latencies):
+    for i in range(nb_calls):
+        start = time.perf_counter()
+        sync.get_summoner_by_puuId("puuid-" + str(i))
+        latencies.append(time.perf_counter() - start)
+
+
+def scenario(worker, args, nb_threads):
+    latencies = []
+    threads = [threading.Thread(target=worker, args=args + (latencies,)) for i in range(nb_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return elapsed, len(latencies), latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+
+def main(nb_threads, nb_calls):
+    stub = StubProcess(appLimits=((1000000, 1),), methodLimits={"get_summoner_by_puuId": [(1000000, 1)]})
+    base_url = stub.start()
+
+    print("{} threads, {} calls each".format(nb_threads, nb_calls))
+    results = {"asyncio.run per call": scenario(per_call, (base_url, nb_calls), nb_threads)}
+    with SyncPantheon(stub_pantheon(base_url)) as sync:
+        results["shared SyncPantheon"] = scenario(shared, (sync, nb_calls), nb_threads)
+    stub.stop()
+
+    for name, (elapsed, count, median, p99) in results.items():
+        print("{:>22} : {:>6.2f} s, {:>6.0f} calls/s, latency median {:>6.2f} ms, p99 {:>6.2f} ms".format(
+            name, elapsed, count / elapsed, median * 1000, p99 * 1000))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8, int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,117 @@
+"""
+Benchmark of the conversion of timelines to NumPy arrays, against a local stub server serving generated timelines.
+
+The timelines are fetched once, then converted to an array [match, frame, participant, stat] of the default stats
+and a table of the events, either with Python loops over the frames, or with decodeTimelines.
+Then features are computed : the gold difference between the teams at each frame and the kills of each participant,
+with loops over the timelines or from the arrays already decoded.
+Run with : python benchmark/timeline_arrays.py [nb_timelines]
+"""
+import asyncio
+import gc
+import os
+import statistics
+import sys
+import time
+
+import numpy
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.Views import decodeTimelines
+from pantheon.Views.TimelineArrays import FRAME_STATS
+from stub import StubServer, stub_pantheon
+
+
+def loops(timelines):
+    nbFrames = max(len(timeline["info"]["frames"]) for timeline in timelines)
+    frames = numpy.full((len(timelines), nbFrames, 10, len(FRAME_STATS)), numpy.nan, numpy.float32)
+    events = []
+    paths = [stat.split(".") for stat in FRAME_STATS]
+    for match, timeline in enumerate(timelines):
+        for frame, content in enumerate(timeline["info"]["frames"]):
+            for participant in range(10):
+                participantFrame = content["participantFrames"][str(participant + 1)]
+                for index, path in enumerate(paths):
+                    value = participantFrame
+                    for part in path:
+                        value = value[part]
+                    frames[match, frame, participant, index] = value
+            for event in content["events"]:
+                position = event.get("position", {})
+                events.append((match, frame, event["timestamp"], event["type"], event.get("participantId", event.get("killerId", event.get("creatorId", 0))),
+                    event.get("victimId", 0), event.get("itemId", 0), position.get("x", -1), position.get("y", -1)))
+    return frames, events
+
+
+def loops_features(timelines):
+    goldDiffs, kills = [], []
+    for timeline in timelines:
+        goldDiff = []
+        matchKills = [0] * 10
+        for content in timeline["info"]["frames"]:
+            participantFrames = content["participantFrames"]
+            goldDiff.append(sum(participantFrames[str(i)]["totalGold"] for i in range(1, 6)) - sum(participantFrames[str(i)]["totalGold"] for i in range(6, 11)))
+            for event in content["events"]:
+                if event["type"] == "CHAMPION_KILL" and event["killerId"] > 0:
+                    matchKills[event["killerId"] - 1] += 1
+        goldDiffs.append(goldDiff)
+        kills.append(matchKills)
+    return goldDiffs, kills
+
+
+def arrays_features(arrays):
+    gold = arrays.stat("totalGold")
+    goldDiffs = gold[:, :, :5].sum(axis=2) - gold[:, :, 5:].sum(axis=2)
+    kills = arrays.eventsOf("CHAMPION_KILL")
+    kills = kills[kills["participantId"] > 0]
+    kills = numpy.bincount(kills["match"] * 10 + kills["participantId"] - 1, minlength=len(arrays.matchIds) * 10).reshape(-1, 10)
+    return goldDiffs, kills
+
+
+def timed(function, *args, **params):
+    gc.collect()
+    start = time.perf_counter()
+    result = function(*args, **params)
+    return result, time.perf_counter() - start
+
+
+async def fetch(nb_timelines):
+    stub = StubServer(appLimits=((1000000, 1),), methodLimits={"get_timeline": [(1000000, 1)]})
+    base_url = await stub.start()
+    async with stub_pantheon(base_url) as panth:
+        timelines = [timeline async for matchId, timeline in panth.get_many("get_timeline", ["EUW1_" + str(i) for i in range(nb_timelines)], concurrency=50)]
+    await stub.stop()
+    return timelines
+
+
+def main(nb_timelines):
+    timelines = asyncio.run(fetch(nb_timelines))
+    print("{} timelines, {} frames, {} events".format(nb_timelines, sum(len(timeline["info"]["frames"]) for timeline in timelines),
+        sum(len(frame["events"]) for timeline in timelines for frame in timeline["info"]["frames"])))
+
+    #Median of 5 runs, the garbage collections triggered by the allocations making the durations vary a lot
+    durations = {}
+    for run in range(5):
+        (frames, events), duration = timed(loops, timelines)
+        durations.setdefault("loops, arrays", []).append(duration)
+        arrays, duration = timed(decodeTimelines, timelines)
+        durations.setdefault("decodeTimelines", []).append(duration)
+        noEvents, duration = timed(decodeTimelines, timelines, events=False)
+        durations.setdefault("decodeTimelines, no events", []).append(duration)
+        (goldDiffs, kills), duration = timed(loops_features, timelines)
+        durations.setdefault("loops, features", []).append(duration)
+        (goldDiffsArray, killsArray), duration = timed(arrays_features, arrays)
+        durations.setdefault("arrays, features", []).append(duration)
+
+    for name, values in durations.items():
+        duration = statistics.median(values)
+        print("{:>26} : {:>7.1f} ms, {:>6.2f} ms per timeline".format(name, duration * 1000, duration / nb_timelines * 1000))
+
+    assert numpy.array_equal(frames, arrays.frames, equal_nan=True)
+    assert len(events) == len(arrays.events)
+    assert all(numpy.array_equal(goldDiff, goldDiffsArray[match, :len(goldDiff)]) for match, goldDiff in enumerate(goldDiffs))
+    assert numpy.array_equal(kills, killsArray)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,110 @@
+"""
+Benchmark of the ways to read a few fields of the results : the puuIds and win flags of the participants of matches,
+the gold of a participant at each frame of timelines.
+
+The bodies are fetched once from a local stub server with raw=True, then each way is timed on all of them :
+decoding the whole dict, a view, and select, with the fastest decoder installed and with the json module.
+The memory is the peak allocated by Python while the results of all the documents are kept, measured in a second run
+as tracing the allocations slows everything down.
+Run with : python benchmark/views.py [nb_matches]
+"""
+import asyncio
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from pantheon.Views import Match, Timeline, select
+from pantheon.utils import utils
+from stub import StubServer, stub_pantheon
+
+
+def read_dict(body, loads):
+    match = loads(body)
+    return match["metadata"]["participants"], [participant["win"] for participant in match["info"]["participants"]]
+
+
+def read_view(body, loads):
+    match = Match(body, decoder=loads)
+    return match.puuids, [participant.win for participant in match.participants]
+
+
+def read_select(body, loads):
+    return select(body, "metadata.participants", "info.participants.*.win")
+
+
+def gold_dict(body, loads):
+    timeline = loads(body)
+    return [frame["participantFrames"]["1"]["totalGold"] for frame in timeline["info"]["frames"]]
+
+
+def gold_view(body, loads):
+    return [frame.totalGold for frame in Timeline(body, decoder=loads).participantFrames(1)]
+
+
+def gold_select(body, loads):
+    return select(body, "info.frames.*.participantFrames.1.totalGold")[0]
+
+
+def keep_dict(body, loads):
+    return loads(body)
+
+
+def keep_view(body, loads):
+    #Stored to be read later, decoded on first access only
+    return Match(body, decoder=loads)
+
+
+async def fetch(method, nb_matches):
+    stub = StubServer(appLimits=((1000000, 1),), methodLimits={"get_match": [(1000000, 1)]})
+    base_url = await stub.start()
+    async with stub_pantheon(base_url, raw=True) as panth:
+        bodies = [body async for matchId, body in panth.get_many(method, ["EUW1_" + str(i) for i in range(nb_matches)], concurrency=50)]
+    await stub.stop()
+    return bodies
+
+
+def measure(read, bodies, loads, trace):
+    """
+    Returns the time taken to read all the bodies, or the peak of memory allocated while doing it, the results being all kept
+    """
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    results = [read(body, loads) for body in bodies]
+    duration = time.perf_counter() - start
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak / 1024 / 1024
+    del results
+    return duration
+
+
+def compare(ways, bodies):
+    for decoder, loads in ((utils.JSON_DECODER, utils.loads), ("json", json.loads)):
+        #All the timings first, the runs following a traced one being slowed down
+        durations = [measure(read, bodies, loads, False) for name, read in ways]
+        peaks = [measure(read, bodies, loads, True) for name, read in ways]
+        print("Decoder {}".format(decoder))
+        for (name, read), duration, peak in zip(ways, durations, peaks):
+            print("{:>30} : {:>8.1f} us per document, peak {:>7.1f} MB allocated".format(name, duration / len(bodies) * 10**6, peak))
+
+
+def main(nb_matches):
+    bodies = asyncio.run(fetch("get_match", nb_matches))
+    print("{} matches, {:.1f} KB per body on average".format(nb_matches, sum(map(len, bodies)) / len(bodies) / 1024))
+    compare((("dict, puuids and wins", read_dict), ("Match view, puuids and wins", read_view), ("select, puuids and wins", read_select),
+        ("dict, kept", keep_dict), ("Match view, kept", keep_view)), bodies)
+
+    bodies = asyncio.run(fetch("get_timeline", max(nb_matches // 10, 1)))
+    print("{} timelines, {:.1f} KB per body on average".format(len(bodies), sum(map(len, bodies)) / len(bodies) / 1024))
+    compare((("dict, gold per frame", gold_dict), ("Timeline view, gold per frame", gold_view), ("select, gold per frame", gold_select)), bodies)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,106 @@
+import time
+from abc import ABC, abstractmethod
+
+class Cache(ABC):
+    """
+    Base class of the response caches.
+    Only the methods having a TTL are cached, the payloads are kept as the raw body bytes of the responses.
+    A backend implements _get and _set, it cannot be created without them.
+    """
+    
+    #Time to live in seconds of the responses per method, None means it never expires
+    defaultTTL = {
+        "get_league_by_id":300,
+        "get_league_pages":300,
+        "get_league_position":300,
+        "get_challenger_league":300,
+        "get_grandmaster_league":300,
+        "get_master_league":300,
+        "get_match":None,
+        "get_timeline":None,
+        "get_summoner":600,
+        "get_summoner_by_accountId":600,
+        "get_summoner_by_name":600,
+        "get_summoner_by_puuId":600,
+        "get_tft_league_by_id":300,
+        "get_tft_league_pages":300,
+        "get_tft_league_position":300,
+        "get_tft_challenger_league":300,
+        "get_tft_grandmaster_league":300,
+        "get_tft_master_league":300,
+        "get_tft_match":None,
+        "get_tft_summoner":600,
+        "get_tft_summoner_by_accountId":600,
+        "get_tft_summoner_by_name":600,
+        "get_tft_summoner_by_puuId":600,
+        "get_account_by_puuId":600,
+        "get_account_by_riotId":600,
+        "get_lor_match":None,
+        "get_valorant_match":None
+    }
+    
+    def __init__(self, ttl=None):
+        """
+        :param dict ttl: TTL in seconds per method name, overriding the default ones. A TTL of 0 disables the cache for the method
+        """
+        self.ttl = dict(self.defaultTTL)
+        if not ttl is None:
+            self.ttl.update(ttl)
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def __str__(self):
+        return "Cache : {} hits / {} misses".format(self.hits, self.misses)
+    
+    def cacheable(self, method:str):
+        return method in self.ttl and self.ttl[method] != 0
+    
+    def get(self, method:str, key:str):
+        """
+        Returns the cached body for the request, None if not cached or expired
+        """
+        value = self._get(method + ":" + key, time.time())
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, method:str, key:str, value:bytes):
+        ttl = self.ttl[method]
+        expiry = None if ttl is None else time.time() + ttl
+        self._set(method + ":" + key, value, expiry)
+    
+    def stats(self):
+        return {"hits":self.hits, "misses":self.misses}
+    
+    @abstractmethod
+    def _get(self, key:str, now:float):
+        """
+        Returns the value stored for the key, None if missing or expired at now
+        """
+    
+    @abstractmethod
+    def _set(self, key:str, value:bytes, expiry):
+        """
+        Stores the value for the key, expiry being a timestamp or None if it never expires
+        """
+
+
+class CachedResponse:
+    """
+    Stand-in for an aiohttp response, served from the cache
+    """
+    
+    status = 200
+    
+    def __init__(self, body:bytes):
+        self.body = body
+        self.headers = {}
+    
+    async def read(self):
+        return self.body
+    
+    async def text(self):
+        return self.body.decode("utf-8")
@@ -0,0 +1,53 @@
+import sqlite3, threading, time
+
+from .Cache import Cache
+
+class DiskCache(Cache):
+    """
+    On-disk cache stored in a SQLite file, kept between runs
+    """
+    
+    def __init__(self, path, ttl=None):
+        """
+        :param string path: path of the SQLite file, created if needed
+        :param dict ttl: TTL in seconds per method name, overriding the default ones
+        """
+        Cache.__init__(self, ttl)
+        
+        self.path = path
+        #The cache may be created by one thread and used by the event loop of another, as with SyncPantheon
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._mutex = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB NOT NULL, expiry REAL)")
+    
+    def __len__(self):
+        with self._mutex:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def _get(self, key:str, now:float):
+        with self._mutex:
+            row = self._db.execute("SELECT value, expiry FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            
+            if not row[1] is None and row[1] < now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            
+            return row[0]
+    
+    def _set(self, key:str, value:bytes, expiry):
+        with self._mutex:
+            self._db.execute("INSERT OR REPLACE INTO responses (key, value, expiry) VALUES (?, ?, ?)", (key, value, expiry))
+    
+    def purge(self, now=None):
+        """
+        Delete the expired responses
+        """
+        with self._mutex:
+            self._db.execute("DELETE FROM responses WHERE expiry < ?", (time.time() if now is None else now,))
+    
+    def close(self):
+        with self._mutex:
+            self._db.close()
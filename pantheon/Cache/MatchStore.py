@@ -0,0 +1,350 @@
+import hashlib, mmap, os, struct, zlib
+
+from .Cache import Cache
+
+#Header of the index : magic, version, number of slots, number of entries, segment being written and its committed size
+_HEADER = struct.Struct("<4sIQQIQ")
+#Slot of the index : hash of the key, segment, offset and size of the record
+_SLOT = struct.Struct("<8sIQI")
+#Header of a record in a segment : compressed or not, size of the key, size of the stored body, CRC32 of the stored body
+_RECORD = struct.Struct("<BHII")
+
+_MAGIC = b"PMSI"
+_EMPTY = b"\0" * 8
+
+class MatchStore(Cache):
+    """
+    On-disk store of the matches and timelines, kept forever as their ids are never reused.
+    The bodies are compressed and appended to segment files, and found with an index file mapped in memory :
+    opening the store reads nothing, and a lookup reads one slot of the index and one record.
+    The store is used by a single process at a time.
+    """
+
+    #Methods returning a match or a timeline, identified by the match id in their url
+    METHODS = ("get_match", "get_timeline", "get_tft_match", "get_lor_match", "get_valorant_match")
+
+    def __init__(self, path, cache=None, compresslevel=6, segmentSize=256*1024*1024, capacity=1024*1024):
+        """
+        :param string path: path of the directory of the store, created if needed
+        :param Cache cache: cache used for the other methods, as a MemoryCache. Default is None, only the matches and timelines are cached
+        :param int compresslevel: zlib compression level of the bodies, from 1 (fastest) to 9 (smallest), 0 to store them uncompressed,
+        about 4 times bigger but read twice faster. Default is 6
+        :param int segmentSize: size in bytes from which a new segment file is started. Default is 256MB
+        :param int capacity: initial number of slots of the index, doubled when it is 70% full. Default is 1048576, a 24MB index file
+        """
+        Cache.__init__(self)
+        self.path = path
+        self.cache = cache
+        self.compresslevel = compresslevel
+        self.segmentSize = segmentSize
+        os.makedirs(path, exist_ok=True)
+
+        self._capacityHint = capacity
+        self._readers = {}
+        self._writer = None
+        self._indexPath = os.path.join(path, "index")
+        try:
+            self._openIndex()
+        except (OSError, ValueError, struct.error):
+            #Missing or corrupted, built again from the segments
+            self.rebuild()
+            return
+
+        self._segment, self._end = self._header()[4:]
+        if not os.path.exists(self._segmentPath(self._segment)) or os.path.getsize(self._segmentPath(self._segment)) < self._end:
+            #The index was written but not the segment, it is built again from what is left
+            self.rebuild()
+            return
+
+        #The records written after the last committed one were not indexed, they are dropped
+        self._openWriter()
+
+    def _segmentPath(self, segment):
+        return os.path.join(self.path, "segment-{:05d}".format(segment))
+
+    def _segments(self):
+        return sorted(int(name[8:]) for name in os.listdir(self.path) if name.startswith("segment-"))
+
+    def _openWriter(self):
+        if not self._writer is None:
+            os.close(self._writer)
+        self._writer = os.open(self._segmentPath(self._segment), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        os.ftruncate(self._writer, self._end)
+
+    def _createIndex(self, path, capacity, segment=0, end=0):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, 1, capacity, 0, segment, end))
+            f.truncate(_HEADER.size + capacity * _SLOT.size)
+
+    def _openIndex(self):
+        self._indexFile = open(self._indexPath, "r+b")
+        self._index = mmap.mmap(self._indexFile.fileno(), 0)
+        magic, version, self._capacity, self._count, segment, end = self._header()
+        if magic != _MAGIC:
+            raise ValueError("{} is not the index of a MatchStore".format(self._indexPath))
+
+    def _header(self):
+        return _HEADER.unpack_from(self._index, 0)
+
+    def _writeHeader(self):
+        self._index[:_HEADER.size] = _HEADER.pack(_MAGIC, 1, self._capacity, self._count, self._segment, self._end)
+
+    @staticmethod
+    def _hash(key):
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        #An empty slot is all zeros
+        return digest if digest != _EMPTY else b"\0" * 7 + b"\1"
+
+    def _find(self, key):
+        """
+        Returns the slot of the key and its record as (segment, offset, size), or the empty slot where to insert it and None
+        """
+        digest = self._hash(key)
+        slot = int.from_bytes(digest, "little") % self._capacity
+        while True:
+            position = _HEADER.size + slot * _SLOT.size
+            slotDigest, segment, offset, size = _SLOT.unpack_from(self._index, position)
+            if slotDigest == _EMPTY:
+                return position, None
+            #Two keys can have the same hash, the key is checked in the record
+            if slotDigest == digest and self._readKey(segment, offset) == key:
+                return position, (segment, offset, size)
+            slot = (slot + 1) % self._capacity
+
+    def _reader(self, segment):
+        if not segment in self._readers:
+            self._readers[segment] = os.open(self._segmentPath(segment), os.O_RDONLY)
+        return self._readers[segment]
+
+    def _readKey(self, segment, offset):
+        """
+        Returns the key of the record, or None if it is missing or truncated, the segment being cut after a crash
+        """
+        try:
+            data = os.pread(self._reader(segment), _RECORD.size + 256, offset)
+            keySize = _RECORD.unpack_from(data)[1]
+            return data[_RECORD.size:_RECORD.size + keySize].decode()
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+
+    def _read(self, segment, offset, size):
+        data = os.pread(self._reader(segment), size, offset)
+        return self._decode(data, 0)[1]
+
+    def _decode(self, data, position):
+        """
+        Returns the key and body of the record at position in data, and the position of the next record. Raises ValueError if the record is corrupted
+        """
+        compressed, keySize, bodySize, crc = _RECORD.unpack_from(data, position)
+        start = position + _RECORD.size + keySize
+        body = data[start:start + bodySize]
+        if len(body) != bodySize or zlib.crc32(body) != crc:
+            raise ValueError("Corrupted record")
+        return bytes(data[position + _RECORD.size:start]).decode(), zlib.decompress(body) if compressed else bytes(body), start + bodySize
+
+    def _matchKey(self, method, key):
+        """
+        Returns the key of a match, from the url of the request or the match id
+        """
+        if "/matches/" in key:
+            key = key.split("/matches/", 1)[1].split("/", 1)[0].split("?", 1)[0]
+        return method + ":" + key
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        """
+        :param tuple key: (method, matchId), as ("get_match", "EUW1_5742254354")
+        """
+        return not self._find(self._matchKey(*key))[1] is None
+
+    def cacheable(self, method:str):
+        return method in self.METHODS or (not self.cache is None and self.cache.cacheable(method))
+
+    def get(self, method:str, key:str):
+        if not method in self.METHODS:
+            return self.cache.get(method, key)
+        value = self._get(self._matchKey(method, key), None)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, method:str, key:str, value:bytes):
+        if not method in self.METHODS:
+            return self.cache.set(method, key, value)
+        self._set(self._matchKey(method, key), value, None)
+
+    def stats(self):
+        stats = Cache.stats(self)
+        stats["entries"] = self._count
+        stats["segments"] = len(self._segments())
+        stats["bytes"] = sum(os.path.getsize(self._segmentPath(segment)) for segment in self._segments())
+        if not self.cache is None:
+            stats["cache"] = self.cache.stats()
+        return stats
+
+    def _get(self, key:str, now):
+        position, record = self._find(key)
+        if record is None:
+            return None
+        try:
+            return self._read(*record)
+        except (OSError, ValueError, zlib.error, struct.error):
+            return None
+
+    def _set(self, key:str, value:bytes, expiry):
+        position, record = self._find(key)
+        if not record is None:
+            #The same match id is always the same match
+            return
+
+        compressed = self.compresslevel > 0
+        body = zlib.compress(value, self.compresslevel) if compressed else bytes(value)
+        encodedKey = key.encode()
+        data = _RECORD.pack(compressed, len(encodedKey), len(body), zlib.crc32(body)) + encodedKey + body
+
+        if self._end > 0 and self._end + len(data) > self.segmentSize:
+            self._segment += 1
+            self._end = 0
+            self._openWriter()
+
+        offset = self._end
+        os.write(self._writer, data)
+        self._end += len(data)
+        #The record is written before being indexed, and committed by the header
+        _SLOT.pack_into(self._index, position, self._hash(key), self._segment, offset, len(data))
+        self._count += 1
+        self._writeHeader()
+
+        if self._count > self._capacity * 0.7:
+            self._resize(self._capacity * 2)
+
+    def _resize(self, capacity):
+        """
+        Moves the entries to a new index of the given number of slots
+        """
+        path = self._indexPath + ".new"
+        self._createIndex(path, capacity, self._segment, self._end)
+        with open(path, "r+b") as f:
+            index = mmap.mmap(f.fileno(), 0)
+            count = 0
+            for entry in _SLOT.iter_unpack(memoryview(self._index)[_HEADER.size:_HEADER.size + self._capacity * _SLOT.size]):
+                if entry[0] == _EMPTY:
+                    continue
+                slot = int.from_bytes(entry[0], "little") % capacity
+                while index[_HEADER.size + slot * _SLOT.size:_HEADER.size + slot * _SLOT.size + 8] != _EMPTY:
+                    slot = (slot + 1) % capacity
+                _SLOT.pack_into(index, _HEADER.size + slot * _SLOT.size, *entry)
+                count += 1
+            index[:_HEADER.size] = _HEADER.pack(_MAGIC, 1, capacity, count, self._segment, self._end)
+            index.flush()
+            index.close()
+
+        self._index.close()
+        self._indexFile.close()
+        os.replace(path, self._indexPath)
+        self._openIndex()
+
+    def rebuild(self):
+        """
+        Builds the index again from the segments, if the index file was lost or corrupted. The corrupted records are dropped
+        """
+        if hasattr(self, "_index") and not self._index.closed:
+            self._index.close()
+            self._indexFile.close()
+        self._createIndex(self._indexPath, self._capacityHint)
+        self._openIndex()
+        self._segment, self._end = 0, 0
+
+        for segment in self._segments():
+            self._segment = segment
+            self._end = 0
+            for key, offset, size in self._records(segment):
+                position, record = self._find(key)
+                if record is None:
+                    _SLOT.pack_into(self._index, position, self._hash(key), segment, offset, size)
+                    self._count += 1
+                    if self._count > self._capacity * 0.7:
+                        self._writeHeader()
+                        self._resize(self._capacity * 2)
+                self._end = offset + size
+        self._writeHeader()
+        #The end of the last segment after its last valid record is dropped
+        self._openWriter()
+
+    def _map(self, segment):
+        """
+        Returns the content of a segment mapped in memory, the pages being read from disk as they are accessed
+        """
+        with open(self._segmentPath(segment), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _records(self, segment):
+        """
+        Yields the key, offset and size of the valid records of a segment, up to the first corrupted one
+        """
+        data = self._map(segment)
+        try:
+            position = 0
+            while position + _RECORD.size <= len(data):
+                try:
+                    key, body, end = self._decode(data, position)
+                except (ValueError, zlib.error, struct.error):
+                    return
+                yield key, position, end - position
+                position = end
+        finally:
+            data.release() if isinstance(data, memoryview) else data.close()
+
+    def scan(self, methods=None):
+        """
+        Yields the (method, matchId, body) of all the stored matches, in the order they were stored, reading the segments sequentially.
+        The bodies are bytes, decoded with pantheon.utils.utils.loads or read through pantheon.Views
+
+        :param methods: method name or list of method names of the results to return, as "get_match". Default is None, all of them
+        """
+        if isinstance(methods, str):
+            methods = [methods]
+        prefixes = tuple(method + ":" for method in methods) if not methods is None else None
+
+        for segment in self._segments():
+            #The segment being written may end with records not committed yet
+            end = self._end if segment == self._segment else None
+            data = self._map(segment)
+            try:
+                end = len(data) if end is None else min(end, len(data))
+                position = 0
+                while position + _RECORD.size <= end:
+                    compressed, keySize, bodySize, crc = _RECORD.unpack_from(data, position)
+                    start = position + _RECORD.size
+                    key = bytes(data[start:start + keySize]).decode()
+                    if prefixes is None or key.startswith(prefixes):
+                        key, body, nextPosition = self._decode(data, position)
+                        method, matchId = key.split(":", 1)
+                        yield method, matchId, body
+                    position = start + keySize + bodySize
+            finally:
+                data.release() if isinstance(data, memoryview) else data.close()
+
+    def flush(self):
+        """
+        Writes the segment being written and the index to disk
+        """
+        os.fsync(self._writer)
+        self._index.flush()
+
+    def close(self):
+        self.flush()
+        os.close(self._writer)
+        for reader in self._readers.values():
+            os.close(reader)
+        self._readers = {}
+        self._index.close()
+        self._indexFile.close()
+        if not self.cache is None and hasattr(self.cache, "close"):
+            self.cache.close()
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+
+from .Cache import Cache
+
+class MemoryCache(Cache):
+    """
+    In-memory LRU cache bounded by the total size of the cached bodies
+    """
+    
+    def __init__(self, maxBytes=64*1024*1024, ttl=None):
+        """
+        :param int maxBytes: maximum total size of the cached bodies, the least recently used are evicted first. Default is 64MB
+        :param dict ttl: TTL in seconds per method name, overriding the default ones
+        """
+        Cache.__init__(self, ttl)
+        
+        self.maxBytes = maxBytes
+        self.size = 0
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def stats(self):
+        stats = Cache.stats(self)
+        stats["entries"] = len(self._entries)
+        stats["bytes"] = self.size
+        return stats
+    
+    def _get(self, key:str, now:float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        value, expiry = entry
+        if not expiry is None and expiry < now:
+            self._remove(key)
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def _set(self, key:str, value:bytes, expiry):
+        if len(value) > self.maxBytes:
+            return
+        
+        if key in self._entries:
+            self._remove(key)
+        
+        self._entries[key] = (value, expiry)
+        self.size += len(value)
+        
+        while self.size > self.maxBytes:
+            self._remove(next(iter(self._entries)))
+    
+    def _remove(self, key:str):
+        value, expiry = self._entries.pop(key)
+        self.size -= len(value)
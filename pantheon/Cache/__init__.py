@@ -0,0 +1,4 @@
+from .Cache import Cache, CachedResponse
+from .MemoryCache import MemoryCache
+from .DiskCache import DiskCache
+from .MatchStore import MatchStore
@@ -0,0 +1,259 @@
+import asyncio, os
+
+from .Frontier import Frontier
+from ..Export.NDJSONWriter import NDJSONWriter
+from ..Export.ParquetWriter import ParquetWriter
+from ..utils import exceptions as exc
+
+class Crawler:
+    """
+    Snowball crawl of the matches : league pages -> summoners -> matchlists -> matches -> players of the matches -> their matchlists...
+    The matches are written to the output as they are fetched. The frontier and the output are checkpointed together,
+    so a crawl stopped or crashed resumes from its last checkpoint when started again with the same files.
+    """
+
+    #Order in which the kinds of items are crawled : matches first so the frontier stays small, new players only when the matches run out
+    RANKS = {"match": 0, "player": 1, "summoner": 2, "league": 3}
+
+    def __init__(self, panth, path, output=None, maxDepth=None, queues=None, startTime=None, endTime=None, matchesPerPlayer=100, maxMatches=None, concurrency=20, checkpointInterval=60, maxAttempts=3):
+        """
+        :param Pantheon panth: instance used for the calls, on its platform and region
+        :param string path: path of the SQLite file keeping the frontier and the items seen, created if needed
+        :param output: where the matches are written : a path ending with .ndjson or .ndjson.gz, a directory of Parquet files ending with .parquet,
+        or an object with the write, checkpoint and restore methods of pantheon.Export writers. Default is None, the matches are not written
+        :param int maxDepth: number of hops from the seeds to the players crawled, the seeds being at depth 0. Default is None, no limit
+        :param list queues: queue ids of the matches kept. Default is None, all queues
+        :param int startTime: epoch timestamp in seconds, the matches played before are not crawled. Default is None
+        :param int endTime: epoch timestamp in seconds, the matches played after are not crawled. Default is None
+        :param int matchesPerPlayer: number of the latest matches of each player crawled. Default is 100
+        :param int maxMatches: the crawl stops after writing this number of matches. Default is None, until the frontier is empty
+        :param int concurrency: number of calls in flight, high enough to keep the rate limiters saturated. Default is 20
+        :param float checkpointInterval: number of seconds between two checkpoints. Default is 60
+        :param int maxAttempts: number of times an item is tried before giving up on it. Default is 3
+        """
+        self.panth = panth
+        self.frontier = Frontier(path)
+        self.maxDepth = maxDepth
+        self.queues = set(queues) if not queues is None else None
+        self.startTime = startTime
+        self.endTime = endTime
+        self.matchesPerPlayer = matchesPerPlayer
+        self.maxMatches = maxMatches
+        self.concurrency = concurrency
+        self.checkpointInterval = checkpointInterval
+        self.maxAttempts = maxAttempts
+
+        if isinstance(output, str):
+            output = ParquetWriter(output) if output.rstrip(os.sep).endswith(".parquet") else NDJSONWriter(output)
+        self.output = output
+
+        #Resume from the last checkpoint, dropping what was written after it
+        position = self.frontier.get("output")
+        if not self.output is None and not position is None:
+            self.output.restore(position)
+        self.written = self.frontier.get("written", 0)
+
+        self._buffer = []
+        self._inFlight = 0
+        self._stopped = False
+        self._wakeup = None
+
+    def _push(self, kind, value, depth):
+        if self.maxDepth is None or depth <= self.maxDepth:
+            self.frontier.push(kind, value, depth, self.RANKS[kind])
+
+    def addPlayers(self, puuIds):
+        """
+        Seeds the crawl with players
+        """
+        for puuId in puuIds:
+            self._push("player", puuId, 0)
+
+    def addSummoners(self, summonerIds):
+        """
+        Seeds the crawl with summoners, their puuId being fetched first
+        """
+        for summonerId in summonerIds:
+            self._push("summoner", summonerId, 0)
+
+    def addMatches(self, matchIds):
+        """
+        Seeds the crawl with matches
+        """
+        for matchId in matchIds:
+            self._push("match", matchId, 0)
+
+    def addLeague(self, queue="RANKED_SOLO_5x5", tier="DIAMOND", division="I", page=1):
+        """
+        Seeds the crawl with the players of a league division, all its pages being walked through
+        """
+        self._push("league", "{}/{}/{}/{}".format(queue, tier, division, page), 0)
+
+    def stats(self):
+        """
+        Returns the number of matches written and the number of items per kind and state
+        """
+        return {"written": self.written, "items": self.frontier.counts()}
+
+    def stop(self):
+        """
+        Stops the crawl after the calls in flight, it can be resumed later
+        """
+        self._stopped = True
+        if not self._wakeup is None:
+            self._wakeup.set()
+
+    def checkpoint(self):
+        """
+        Writes the output to disk and commits the frontier, the crawl resuming from this point if stopped
+        """
+        if not self.output is None:
+            self.frontier.set("output", self.output.checkpoint())
+        self.frontier.set("written", self.written)
+        self.frontier.checkpoint()
+
+    async def run(self):
+        """
+        Crawls until the frontier is empty, maxMatches are written or stop is called. Returns the stats
+        """
+        self._stopped = False
+        self._wakeup = asyncio.Event()
+        workers = [asyncio.ensure_future(self._worker()) for i in range(self.concurrency)]
+        try:
+            while not all(worker.done() for worker in workers):
+                await asyncio.wait(workers, timeout=self.checkpointInterval)
+                self.checkpoint()
+            for worker in workers:
+                worker.result()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+            #The items taken from the frontier but not started are crawled next time
+            for kind, value, depth in self._buffer:
+                self.frontier.release(kind, value)
+            self._buffer = []
+            self.checkpoint()
+        return self.stats()
+
+    def close(self):
+        if not self.output is None:
+            self.output.close()
+        self.frontier.close()
+
+    def _next(self):
+        if not self._buffer:
+            #Taken by batches, in the order of the frontier
+            self._buffer = self.frontier.pop(self.concurrency * 2)[::-1]
+        return self._buffer.pop() if self._buffer else None
+
+    async def _worker(self):
+        while not self._stopped:
+            item = self._next()
+            if item is None:
+                if self._inFlight == 0:
+                    #Nothing left to crawl and nothing being crawled that could queue new items
+                    self._wakeup.set()
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            self._inFlight += 1
+            try:
+                await self._crawl(*item)
+            finally:
+                self._inFlight -= 1
+                self._wakeup.set()
+
+    async def _crawl(self, kind, value, depth):
+        try:
+            done = await getattr(self, "_crawl_" + kind)(value, depth)
+        except exc.NotFound:
+            self.frontier.done(kind, value, failed=True)
+            return
+        except asyncio.CancelledError:
+            self.frontier.release(kind, value)
+            raise
+        except Exception:
+            if self.frontier.release(kind, value, attempt=True) >= self.maxAttempts:
+                self.frontier.done(kind, value, failed=True)
+            return
+
+        if done is False:
+            self.frontier.release(kind, value)
+        else:
+            self.frontier.done(kind, value)
+
+    async def _crawl_league(self, value, depth):
+        queue, tier, division, page = value.split("/")
+        entries = await self.panth.get_league_pages(queue, tier, division, int(page))
+        for entry in entries:
+            if "puuid" in entry:
+                self._push("player", entry["puuid"], depth)
+            else:
+                self._push("summoner", entry["summonerId"], depth)
+        if entries:
+            self._push("league", "{}/{}/{}/{}".format(queue, tier, division, int(page) + 1), depth)
+
+    async def _crawl_summoner(self, summonerId, depth):
+        summoner = await self.panth.get_summoner(summonerId)
+        self._push("player", summoner["puuid"], depth)
+
+    async def _crawl_player(self, puuId, depth):
+        params = {}
+        if not self.queues is None and len(self.queues) == 1:
+            params["queue"] = next(iter(self.queues))
+        if not self.startTime is None:
+            params["startTime"] = int(self.startTime)
+        if not self.endTime is None:
+            params["endTime"] = int(self.endTime)
+
+        matchIds = []
+        pages = self.panth.iter_matchlist(puuId, params, min(self.matchesPerPlayer, 100))
+        try:
+            async for matchId in pages:
+                matchIds.append(matchId)
+                if len(matchIds) >= self.matchesPerPlayer:
+                    break
+        finally:
+            await pages.aclose()
+
+        for matchId in matchIds:
+            self._push("match", matchId, depth)
+
+    def _keep(self, info):
+        if not self.queues is None and not info.get("queueId") in self.queues:
+            return False
+        creation = info.get("gameCreation", 0) / 1000
+        if not self.startTime is None and creation < self.startTime:
+            return False
+        if not self.endTime is None and creation > self.endTime:
+            return False
+        return True
+
+    def _full(self):
+        return not self.maxMatches is None and self.written >= self.maxMatches
+
+    async def _crawl_match(self, matchId, depth):
+        """
+        Returns False if maxMatches was reached, the match being left in the frontier for a next run
+        """
+        if self._full():
+            return False
+
+        match = await self.panth.get_match(matchId)
+        if self._full():
+            return False
+        if not self._keep(match.get("info", {})):
+            return
+
+        if not self.output is None:
+            self.output.write(match)
+        self.written += 1
+        if self._full():
+            self.stop()
+
+        for puuId in match["metadata"]["participants"]:
+            self._push("player", puuId, depth + 1)
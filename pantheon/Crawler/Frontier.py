@@ -0,0 +1,114 @@
+import json, sqlite3, threading
+
+class Frontier:
+    """
+    Queue of the items left to crawl and set of all the items ever queued, kept in a SQLite file.
+    An item is only queued once, so the same match or player is never crawled twice, even across runs.
+    The changes are committed on checkpoint only : after a crash, the crawl resumes from the last checkpoint.
+    """
+
+    PENDING = 0
+    IN_FLIGHT = 1
+    DONE = 2
+    FAILED = 3
+
+    def __init__(self, path):
+        """
+        :param string path: path of the SQLite file, created if needed
+        """
+        self.path = path
+        #The frontier may be created by one thread and used by the event loop of another
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._mutex = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, value TEXT NOT NULL, depth INTEGER, rank INTEGER, state INTEGER, attempts INTEGER DEFAULT 0, UNIQUE (kind, value))")
+        self._db.execute("CREATE INDEX IF NOT EXISTS items_pending ON items (state, rank, id)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS checkpoint (key TEXT PRIMARY KEY, value TEXT)")
+
+        #The items being crawled when the last run stopped are crawled again
+        self._db.execute("UPDATE items SET state = ? WHERE state = ?", (self.PENDING, self.IN_FLIGHT))
+        self._db.execute("BEGIN")
+
+    def __len__(self):
+        """
+        Returns the number of items waiting to be crawled
+        """
+        with self._mutex:
+            return self._db.execute("SELECT COUNT(*) FROM items WHERE state = ?", (self.PENDING,)).fetchone()[0]
+
+    def push(self, kind:str, value:str, depth:int=0, rank:int=0):
+        """
+        Queues the item if it was never queued before. Returns True if it was
+
+        :param int rank: the items of the lowest ranks are crawled first
+        """
+        with self._mutex:
+            return self._db.execute("INSERT OR IGNORE INTO items (kind, value, depth, rank, state) VALUES (?, ?, ?, ?, ?)", (kind, value, depth, rank, self.PENDING)).rowcount == 1
+
+    def seen(self, kind:str, value:str):
+        with self._mutex:
+            return not self._db.execute("SELECT 1 FROM items WHERE kind = ? AND value = ?", (kind, value)).fetchone() is None
+
+    def pop(self, count:int):
+        """
+        Returns up to count items to crawl, as (kind, value, depth), marked as in flight
+        """
+        with self._mutex:
+            rows = self._db.execute("SELECT id, kind, value, depth FROM items WHERE state = ? ORDER BY rank, id LIMIT ?", (self.PENDING, count)).fetchall()
+            self._db.executemany("UPDATE items SET state = ? WHERE id = ?", [(self.IN_FLIGHT, row[0]) for row in rows])
+        return [row[1:] for row in rows]
+
+    def done(self, kind:str, value:str, failed:bool=False):
+        with self._mutex:
+            self._db.execute("UPDATE items SET state = ? WHERE kind = ? AND value = ?", (self.FAILED if failed else self.DONE, kind, value))
+
+    def release(self, kind:str, value:str, attempt:bool=False):
+        """
+        Puts back an item in flight in the queue. Returns its number of failed attempts
+
+        :param boolean attempt: True if the item failed, counting an attempt
+        """
+        with self._mutex:
+            self._db.execute("UPDATE items SET state = ?, attempts = attempts + ? WHERE kind = ? AND value = ?", (self.PENDING, int(attempt), kind, value))
+            return self._db.execute("SELECT attempts FROM items WHERE kind = ? AND value = ?", (kind, value)).fetchone()[0]
+
+    def counts(self):
+        """
+        Returns the number of items per kind and state
+        """
+        names = {self.PENDING: "pending", self.IN_FLIGHT: "in_flight", self.DONE: "done", self.FAILED: "failed"}
+        counts = {}
+        with self._mutex:
+            rows = self._db.execute("SELECT kind, state, COUNT(*) FROM items GROUP BY kind, state").fetchall()
+        for kind, state, count in rows:
+            counts.setdefault(kind, {})[names[state]] = count
+        return counts
+
+    def get(self, key:str, default=None):
+        """
+        Returns a value saved with the last checkpoint
+        """
+        with self._mutex:
+            row = self._db.execute("SELECT value FROM checkpoint WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if not row is None else default
+
+    def set(self, key:str, value):
+        """
+        Saves a JSON serializable value, committed with the next checkpoint
+        """
+        with self._mutex:
+            self._db.execute("INSERT OR REPLACE INTO checkpoint (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def checkpoint(self):
+        """
+        Commits all the changes since the last checkpoint
+        """
+        with self._mutex:
+            self._db.execute("COMMIT")
+            self._db.execute("BEGIN")
+
+    def close(self):
+        with self._mutex:
+            self._db.execute("COMMIT")
+            self._db.close()
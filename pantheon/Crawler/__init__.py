@@ -0,0 +1,2 @@
+from .Frontier import Frontier
+from .Crawler import Crawler
@@ -0,0 +1,67 @@
+import gzip, os
+
+from ..utils import utils
+
+class NDJSONWriter:
+    """
+    Writes the records as one JSON document per line, gzip compressed if the path ends with .gz.
+    The file is only appended to, and can be cut back to the position of a checkpoint to resume writing after a crash.
+    """
+
+    def __init__(self, path, dumps=None, compresslevel=6):
+        """
+        :param string path: path of the file, created if needed
+        :param function dumps: function encoding a record to bytes. Default is None, using orjson or ujson if installed, json otherwise
+        :param int compresslevel: gzip compression level, from 1 (fastest) to 9 (smallest). Default is 6
+        """
+        self.path = path
+        self.compressed = path.endswith(".gz")
+        self.compresslevel = compresslevel
+        self._dumps = dumps if not dumps is None else utils.dumps
+
+        self._file = open(path, "ab")
+        #Gzip member being written, a new one is started after each checkpoint
+        self._gzip = None
+
+    def write(self, record):
+        """
+        :param record: record to write, a JSON serializable object, or the bytes of an already encoded document
+        """
+        if isinstance(record, bytes):
+            #Line breaks can only be whitespace between the tokens of a JSON document, the ones in strings being escaped
+            line = record.replace(b"\r", b" ").replace(b"\n", b" ") + b"\n"
+        else:
+            line = self._dumps(record) + b"\n"
+        if self.compressed:
+            if self._gzip is None:
+                self._gzip = gzip.GzipFile(fileobj=self._file, mode="wb", compresslevel=self.compresslevel)
+            self._gzip.write(line)
+        else:
+            self._file.write(line)
+
+    def checkpoint(self):
+        """
+        Writes everything to disk and returns the position to give to restore to come back to this point
+        """
+        if not self._gzip is None:
+            #Gzip files can be concatenated, the end of a member is a valid end of file
+            self._gzip.close()
+            self._gzip = None
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def restore(self, position):
+        """
+        Cuts the file back to a position returned by checkpoint, dropping what was written after it
+        """
+        if not self._gzip is None:
+            self._gzip.close()
+            self._gzip = None
+        self._file.flush()
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    def close(self):
+        self.checkpoint()
+        self._file.close()
@@ -0,0 +1,122 @@
+import os
+
+from ..utils import utils
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+class ParquetWriter:
+    """
+    Writes the records in the Parquet files of a directory, a new file being started at each checkpoint.
+    The columns are inferred from the first rows of each file, nested objects becoming structs and lists. Needs pyarrow, installed with pantheon[parquet]
+    """
+
+    def __init__(self, path, rowGroupSize=10000, compression="zstd", flatten=None):
+        """
+        :param string path: path of the directory, created if needed
+        :param int rowGroupSize: number of rows kept in memory before writing them as a row group. Default is 10000
+        :param string compression: compression codec of the files. Default is zstd
+        :param function flatten: function returning the list of rows of a record, as flattenParticipants. Default is None, one row per record
+        """
+        if pyarrow is None:
+            raise ImportError("pyarrow is needed to write Parquet files, install it with pip install pantheon[parquet]")
+
+        self.path = path
+        self.rowGroupSize = rowGroupSize
+        self.compression = compression
+        self.flatten = flatten
+        os.makedirs(path, exist_ok=True)
+
+        self._rows = []
+        self._writer = None
+        parts = self._parts()
+        self._part = parts[-1] + 1 if parts else 0
+
+    def _parts(self):
+        #Numbers of the files already written
+        return sorted(int(name[5:-8]) for name in os.listdir(self.path) if name.startswith("part-") and name.endswith(".parquet"))
+
+    def _partPath(self, part):
+        return os.path.join(self.path, "part-{:05d}.parquet".format(part))
+
+    def write(self, record):
+        """
+        :param record: record to write, a dict or the bytes of a JSON document
+        """
+        if isinstance(record, bytes):
+            record = utils.loads(record)
+        if self.flatten is None:
+            self._rows.append(record)
+        else:
+            self._rows.extend(self.flatten(record))
+        if len(self._rows) >= self.rowGroupSize:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        if self._writer is None:
+            table = pyarrow.Table.from_pylist(self._rows)
+            self._writer = pyarrow.parquet.ParquetWriter(self._partPath(self._part), table.schema, compression=self.compression)
+        else:
+            #The schema of the file is the one of its first row group, the missing fields are null and the new ones are dropped
+            table = pyarrow.Table.from_pylist(self._rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    def checkpoint(self):
+        """
+        Writes everything to disk and returns the position to give to restore to come back to this point
+        """
+        self._flush()
+        if not self._writer is None:
+            self._writer.close()
+            self._writer = None
+            self._part += 1
+        return self._part
+
+    def restore(self, position):
+        """
+        Deletes the files written after a position returned by checkpoint
+        """
+        if not self._writer is None:
+            self._writer.close()
+            self._writer = None
+        self._rows = []
+        for part in self._parts():
+            if part >= position:
+                os.remove(self._partPath(part))
+        self._part = position
+
+    def close(self):
+        self.checkpoint()
+
+
+#Fields of the match repeated on each participant row
+MATCH_FIELDS = ("gameCreation", "gameDuration", "gameVersion", "gameMode", "queueId", "mapId", "platformId")
+
+def flattenParticipants(match):
+    """
+    Returns one row per participant of a match-v5 match, with the fields of the match and the scalar fields of the participant.
+    The fields of the nested objects, as challenges, are prefixed with their name, the lists are left out
+    """
+    info = match["info"]
+    base = {"matchId": match["metadata"]["matchId"]}
+    for field in MATCH_FIELDS:
+        base[field] = info.get(field)
+
+    rows = []
+    for participant in info["participants"]:
+        row = dict(base)
+        for key, value in participant.items():
+            if isinstance(value, dict):
+                for subKey, subValue in value.items():
+                    if not isinstance(subValue, (dict, list)):
+                        row[key + "_" + subKey] = subValue
+            elif not isinstance(value, list):
+                row[key] = value
+        rows.append(row)
+    return rows
@@ -0,0 +1,119 @@
+import asyncio, os
+from concurrent.futures import ThreadPoolExecutor
+
+from .NDJSONWriter import NDJSONWriter
+from .ParquetWriter import ParquetWriter
+
+#Put in the buffer to stop the writing task
+_CLOSE = object()
+
+class Sink:
+    """
+    Pipeline stage writing the results as they arrive, so they are never all held in memory.
+    The results wait in a bounded buffer and are written by batches in a thread, the compression not blocking the event loop.
+    When the buffer is full, put waits : the calls feeding the sink slow down to the writing speed instead of piling up results.
+    With Pantheon(raw=True), the bodies are written to NDJSON as they were received, without being decoded.
+    """
+
+    def __init__(self, output, maxBuffer=1000, batchSize=100):
+        """
+        :param output: where the results are written : a path ending with .ndjson or .ndjson.gz, a directory of Parquet files ending with .parquet,
+        or a writer of pantheon.Export
+        :param int maxBuffer: maximum number of results waiting to be written. Default is 1000
+        :param int batchSize: maximum number of results written at once by the thread. Default is 100
+        """
+        if isinstance(output, str):
+            output = ParquetWriter(output) if output.rstrip(os.sep).endswith(".parquet") else NDJSONWriter(output)
+        self.writer = output
+        self.maxBuffer = maxBuffer
+        self.batchSize = batchSize
+
+        self.written = 0
+        self.skipped = 0
+
+        #Created on first use, as they need the running event loop
+        self._queue = None
+        self._task = None
+        self._error = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def put(self, record):
+        """
+        Adds a result to write, waiting while the buffer is full
+
+        :param record: a JSON serializable object, or the bytes of a JSON document
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.maxBuffer)
+            self._task = asyncio.ensure_future(self._write())
+        if not self._error is None:
+            raise self._error
+        await self._queue.put(record)
+
+    async def export(self, results):
+        """
+        Writes all the results of an async iterable, as get_many or iter_matchlist. Returns the number of results written
+
+        :param results: async iterable of results, or of (arg, result) tuples as yielded by get_many. The exceptions are skipped and counted
+        """
+        count = 0
+        async for result in results:
+            if isinstance(result, tuple):
+                result = result[-1]
+            if isinstance(result, Exception):
+                self.skipped += 1
+                continue
+            await self.put(result)
+            count += 1
+        return count
+
+    async def _write(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batchSize and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            closing = batch[-1] is _CLOSE
+            if closing:
+                batch.pop()
+
+            if self._error is None and batch:
+                try:
+                    await loop.run_in_executor(self._executor, self._writeBatch, batch)
+                    self.written += len(batch)
+                except Exception as e:
+                    #Raised by the next put, the results keep being taken so the producers are not blocked forever
+                    self._error = e
+
+            if closing:
+                return
+
+    def _writeBatch(self, batch):
+        for record in batch:
+            self.writer.write(record)
+
+    async def flush(self):
+        """
+        Waits for all the results put to be written, and writes them to disk
+        """
+        if not self._task is None:
+            await self._queue.put(_CLOSE)
+            await self._task
+            self._task = None
+        if not self._error is None:
+            raise self._error
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.writer.checkpoint)
+
+    async def close(self):
+        try:
+            await self.flush()
+        finally:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.writer.close)
+            self._executor.shutdown()
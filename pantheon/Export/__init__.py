@@ -0,0 +1,3 @@
+from .NDJSONWriter import NDJSONWriter
+from .ParquetWriter import ParquetWriter, flattenParticipants
+from .Sink import Sink
@@ -0,0 +1,165 @@
+from bisect import bisect_left
+
+class Metric:
+    """
+    Base class of the metrics, holding a value per combination of label values
+    """
+
+    type = None
+
+    def __init__(self, name:str, help:str, labels=()):
+        """
+        :param string name: name of the metric
+        :param string help: description of the metric
+        :param tuple labels: names of the labels, their values being given in the same order when recording
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+
+    def values(self):
+        """
+        Returns the dict of the values per tuple of label values
+        """
+        return dict(self._values)
+
+
+class Counter(Metric):
+
+    type = "counter"
+
+    def inc(self, labelValues=(), value=1):
+        self._values[labelValues] = self._values.get(labelValues, 0) + value
+
+
+class Gauge(Metric):
+    """
+    Gauge set directly, or computed when collected by the functions added with collectFrom
+    """
+
+    type = "gauge"
+
+    def __init__(self, name:str, help:str, labels=()):
+        Metric.__init__(self, name, help, labels)
+        self._collectors = []
+
+    def set(self, labelValues=(), value=0):
+        self._values[labelValues] = value
+
+    def collectFrom(self, function):
+        """
+        :param function function: function returning the (labelValues, value) to report, called on each collection
+        """
+        if not function in self._collectors:
+            self._collectors.append(function)
+
+    def values(self):
+        values = dict(self._values)
+        for function in self._collectors:
+            for labelValues, value in function():
+                values[labelValues] = value
+        return values
+
+
+class Histogram(Metric):
+
+    type = "histogram"
+
+    #Upper bounds of the buckets, in seconds
+    defaultBuckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, name:str, help:str, labels=(), buckets=None):
+        """
+        :param tuple buckets: upper bounds of the buckets, sorted. Default is defaultBuckets
+        """
+        Metric.__init__(self, name, help, labels)
+        self.buckets = tuple(buckets) if not buckets is None else self.defaultBuckets
+
+    def observe(self, labelValues=(), value=0):
+        entry = self._values.get(labelValues)
+        if entry is None:
+            #Count per bucket (the last one being +Inf), sum and count of the observations
+            entry = [[0] * (len(self.buckets) + 1), 0, 0]
+            self._values[labelValues] = entry
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def values(self):
+        """
+        Returns the dict of {"buckets", "sum", "count"} per tuple of label values, the buckets counts being cumulative as in Prometheus
+        """
+        values = {}
+        for labelValues, (counts, total, count) in list(self._values.items()):
+            cumulative = []
+            for bucketCount in counts:
+                cumulative.append(bucketCount + (cumulative[-1] if cumulative else 0))
+            values[labelValues] = {"buckets": dict(zip(self.buckets + (float("inf"),), cumulative)), "sum": total, "count": count}
+        return values
+
+
+class Metrics:
+    """
+    Registry of the metrics, to pass to Pantheon with the metrics parameter.
+    Recording a value is a dict update, so it can be left on in production. The values are read with snapshot() or exported with prometheus()
+    """
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _get(self, cls, name, help, labels, **params):
+        #Registering a metric twice returns the existing one, so several instances of Pantheon can share a registry
+        if not name in self._metrics:
+            self._metrics[name] = cls(name, help, labels, **params)
+        elif not isinstance(self._metrics[name], cls):
+            raise ValueError("Metric {} is already registered as a {}".format(name, self._metrics[name].type))
+        return self._metrics[name]
+
+    def counter(self, name:str, help:str, labels=()):
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name:str, help:str, labels=()):
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name:str, help:str, labels=(), buckets=None):
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def snapshot(self):
+        """
+        Returns the current values of all the metrics, as a dict of {"type", "help", "labels", "values"} per metric name
+        """
+        return {name: {"type": metric.type, "help": metric.help, "labels": metric.labels, "values": metric.values()} for name, metric in self._metrics.items()}
+
+    def prometheus(self):
+        """
+        Returns the metrics in the Prometheus text exposition format
+        """
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append("# HELP {} {}".format(name, metric.help.replace("\\", "\\\\").replace("\n", "\\n")))
+            lines.append("# TYPE {} {}".format(name, metric.type))
+            for labelValues, value in metric.values().items():
+                labels = list(zip(metric.labels, labelValues))
+                if metric.type == "histogram":
+                    for bound, count in value["buckets"].items():
+                        lines.append("{}_bucket{} {}".format(name, _labels(labels + [("le", _number(bound))]), count))
+                    lines.append("{}_sum{} {}".format(name, _labels(labels), _number(value["sum"])))
+                    lines.append("{}_count{} {}".format(name, _labels(labels), value["count"]))
+                else:
+                    lines.append("{}{} {}".format(name, _labels(labels), _number(value)))
+        return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for name, value in labels) + "}"
@@ -0,0 +1 @@
+from .Metrics import Metrics, Counter, Gauge, Histogram
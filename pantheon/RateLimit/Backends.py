@@ -0,0 +1,69 @@
+import sqlite3, threading
+
+from .RateLimiter import RateLimiter
+from .SQLiteRateLimiter import SQLiteRateLimiter
+
+class MemoryBackend:
+    """
+    Default backend, the limiters state is kept in memory and only known by the current process
+    """
+    
+    key = "memory"
+    
+    def limiter(self, debug, limits, name, server, new=False):
+        return RateLimiter(debug, limits, name)
+    
+    def refresh(self, server, name, limiters, create):
+        return limiters
+
+
+class SQLiteBackend:
+    """
+    Backend keeping the limiters state in a SQLite file.
+    All the processes of the machine using the same file share the rate limits, the budget of the key being split between them.
+    """
+    
+    def __init__(self, path, pollInterval=0.05, requestTimeout=300):
+        """
+        :param string path: path of the SQLite file, created if needed
+        :param float pollInterval: number of seconds between two checks of the shared state while waiting for a token. Default is 0.05
+        :param float requestTimeout: number of seconds after which a request not back is not counted as pending anymore, on top of the time window. Default is 300, the timeout of the requests
+        """
+        self.path = path
+        self.key = "sqlite:" + path
+        self.pollInterval = pollInterval
+        self.requestTimeout = requestTimeout
+        
+        #The connection is used by the event loops of all the threads of the process, one at a time
+        self._db = sqlite3.connect(path, isolation_level=None, timeout=30, check_same_thread=False)
+        self._mutex = threading.RLock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute('CREATE TABLE IF NOT EXISTS limiters (key TEXT PRIMARY KEY, server TEXT, name TEXT, duration INTEGER, deleted INTEGER, "limit" INTEGER, "time" REAL, "count" INTEGER, "num" INTEGER, "currentlyPending" INTEGER, "previouslyPending" INTEGER, "synced" INTEGER, "serverCount" INTEGER, "blockedUntil" REAL)')
+        self._db.execute("CREATE INDEX IF NOT EXISTS limiters_name ON limiters (server, name)")
+        #Tokens pending per process and time window, dropped when the process is gone or the lease is over
+        self._db.execute("CREATE TABLE IF NOT EXISTS pending (key TEXT, owner INTEGER, num INTEGER, tokens INTEGER, expires REAL, PRIMARY KEY (key, owner, num))")
+    
+    def limiter(self, debug, limits, name, server, new=False):
+        """
+        :param boolean new: True if the limit was returned by the server, then it is restored if another process deleted it
+        """
+        return SQLiteRateLimiter(debug, limits, name, self._db, server, new, self.pollInterval, self._mutex, self.requestTimeout)
+    
+    def refresh(self, server, name, limiters, create):
+        """
+        Returns the limiters matching the limits currently shared, other processes may have created or deleted some
+        
+        :param function create: function creating a limiter from (limits, name), for the limits not known yet
+        """
+        with self._mutex:
+            rows = self._db.execute('SELECT duration, "limit" FROM limiters WHERE server = ? AND name = ? AND deleted = 0', (server, name)).fetchall()
+        
+        current = {limiter.getDuration():limiter for limiter in limiters}
+        if len(rows) == len(current) and all(duration in current for duration, limit in rows):
+            return limiters
+        
+        return [current[duration] if duration in current else create((limit, duration), name) for duration, limit in rows]
+    
+    def close(self):
+        self._db.close()
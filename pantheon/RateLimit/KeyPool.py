@@ -0,0 +1,67 @@
+class KeyPool:
+    """
+    Several API keys used by the same Pantheon instances, each with its own rate limits.
+    Every request is sent with the key having the most headroom on its server and endpoint, so the throughput adds up.
+    A key answering 401 is dropped from the pool and the request is sent again with another one, the last key is never dropped.
+    A 403 may only concern the endpoint, as a route the key has no access to : the key is then only stopped for this endpoint.
+    """
+
+    def __init__(self, keys):
+        """
+        :param list keys: the API keys
+        """
+        self.keys = list(dict.fromkeys(keys))
+        if not self.keys:
+            raise ValueError("A KeyPool needs at least one API key")
+
+        #Reason of the drop per key dropped
+        self.dropped = {}
+
+        #Keys refused per endpoint method
+        self.forbidden = {}
+
+    def __len__(self):
+        return len(self.active())
+
+    def active(self, method:str=None):
+        """
+        Returns the keys still in use, for the endpoint method if given
+        """
+        forbidden = self.forbidden.get(method, ())
+        return [key for key in self.keys if not key in self.dropped and not key in forbidden]
+
+    def drop(self, key:str, reason:str=""):
+        """
+        Stops using the key, unless it is the last one. Returns True if it was dropped
+        """
+        if key in self.dropped or len(self.active()) <= 1:
+            return False
+        self.dropped[key] = reason
+        return True
+
+    def forbid(self, key:str, method:str):
+        """
+        Stops using the key for the endpoint method only, unless it is the last one allowed to call it. Returns True if it was stopped
+        """
+        if len(self.active(method)) <= 1 or not key in self.active(method):
+            return False
+        self.forbidden.setdefault(method, set()).add(key)
+        return True
+
+    def choose(self, limiters, method:str, priority:int=0):
+        """
+        Returns the key a request should be sent with : the one it would get a token of the soonest, then the one with the most tokens left
+
+        :param function limiters: function returning the RateLimiterServer of a key, for the server of the request
+        :param string method: name of the endpoint method
+        :param int priority: lane of the request
+        """
+        keys = self.active(method)
+        if len(keys) == 1:
+            return keys[0]
+
+        def headroom(key):
+            rl = limiters(key)
+            return (rl.reserve(method, priority), -rl.headroom(method))
+
+        return min(keys, key=headroom)
@@ -1,140 +1,377 @@
-import asyncio, time, datetime
+import asyncio, threading, time
+from collections import deque
+
+def _runningLoop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
 class RateLimiter:
-    
+    """
+    The limiter of a key is shared by the event loops of all the threads using it, each with its own Pantheon instance.
+    Its state is guarded by a lock, and the waiters of another event loop are woken up through their own loop.
+    """
+
     def __init__(self, debug, limits : (int,int) = (10,10), name: str =""):
-        
-        #Init Async lock for the limiter
-        self.lock = asyncio.Lock()
-        self.backLock = asyncio.Lock()
-        
+
+        #Guards the state, reentrant as the operations call each other
+        self._mutex = threading.RLock()
+
+        #Requests waiting for a token per priority lane, the highest lane first and FIFO order in each lane
+        self._waiters = {}
+
+        #Guaranteed share of the tokens per lane, and the credit of tokens owed to each lane
+        self.shares = {}
+        self._credits = {}
+
+        #Timer of each event loop having waiters, waking them up when the time window rolls over, as (handle, deadline)
+        self._timers = {}
+
         #Limits params
         self.limit = limits[0]
         self.duration = limits[1]
-        
-        #Count and begin of the time window
+
+        #Count and begin of the time window, on the monotonic clock
         self.count = 0
-        self.time = 0
-        
+        self.time = float("-inf")
+
         #Name of the limiter (for debug prupose)
         self.name = name
-        
+
         # "ID" of the time window
         self.num = 0
-        
+
         #Init outgoing requests counters
         self.currentlyPending = 0
         self.previouslyPending = 0
-        
+
         #Synchronicity state with server time window
         self.synced = False
-        
+
+        #Limit not returned by the server anymore
+        self.deleted = False
+
+        #Highest count returned by the server in the current time window
+        self.serverCount = 0
+
+        #No token is given before this time, after a 429 on this limiter
+        self.blockedUntil = float("-inf")
+
         #Debug mode
         self.debug = debug
-        
+
     def __str__(self):
         return "{:>20} : {:>7}/{:>7} per {:>5} seconds".format(self.name, self.count, self.limit, self.duration)
-    
+
     def locked(self):
-        return self.lock.locked()
-        
-        
+        with self._mutex:
+            return any(not waiter.done() for lane in self._waiters.values() for waiter in lane)
+
+
     #Allows to update the limit number of requests
     def updateLimit(self,limit: int):
-        self.limit = limit
-        
+        with self._mutex:
+            self.limit = limit
+
+    #Count a request sent without a token of this limiter
+    def countRequest(self):
+        with self._mutex:
+            self.count += 1
+
+    #Fired when the limit is not returned by the server anymore, the requests waiting for it are let through
+    def delete(self):
+        with self._mutex:
+            self.deleted = True
+            self._dispatch()
+
     #Return the set duration of the time window
     def getDuration(self):
         return self.duration
-    
+
     #Return the set limit number of requests
     def getLimit(self):
         return self.limit
-    
-    async def _reset(self):
-        #Be sure to be out of the time window
-        while self.time + self.duration >= int(time.mktime(datetime.datetime.utcnow().timetuple())):
-            await asyncio.sleep(1)
-        
+
+    #Return the number of requests counted in the current time window
+    def used(self):
+        with self._mutex:
+            if self._expired(self._now()):
+                return self.previouslyPending + self.currentlyPending
+            return self.previouslyPending + self.count
+
+    def _now(self):
+        return time.monotonic()
+
+    def _expired(self, now):
+        return self.time + self.duration < now
+
+    def _available(self, now):
+        if self.deleted:
+            return True
+        if now < self.blockedUntil:
+            return False
+        #A new time window will be opened, only the requests still pending from the previous ones count
+        if self._expired(now):
+            return self.previouslyPending + self.currentlyPending < self.limit
+        #In time window, the requests pending from the previous windows may still be counted in this one
+        return self.previouslyPending + self.count < self.limit
+
+    def _reset(self, now):
         #Reseting count and time
-        self.time = int(time.mktime(datetime.datetime.utcnow().timetuple()))
+        self.time = now
         self.count = 0
-        
+
         #Manage the count of pending requests
         self.previouslyPending += self.currentlyPending
         self.currentlyPending = 0
-        
+
+        self.serverCount = 0
+
         #Incr the num for the new time window
         self.num += 1
         #The window is not synch with server yet
         self.synced = False
-    
+
+    def _take(self, now):
+        #Open a new time window if the current one is passed
+        if self._expired(now):
+            self._reset(now)
+
+        #Incr count
+        self.count += 1
+        self.currentlyPending += 1
+
+        return self.num
+
+    def _tryTake(self):
+        #Take a token only if no one is waiting before
+        with self._mutex:
+            now = self._now()
+            if not self._waiters and self._available(now):
+                return self._take(now)
+            return None
+
+    #Return a token if one is available now and no one is waiting before, else None
+    def tryToken(self):
+        return self._tryTake()
+
+    #Give back a token that was not used to send a request
+    def release(self, num:int):
+        self._release(num)
+
+    def eta(self, priority:int=0):
+        """
+        Returns the seconds before a token could be given to a new request of this priority, 0 if one is available now.
+        Nothing is taken. It is a lower bound, the requests in flight being assumed to be back by then.
+        """
+        with self._mutex:
+            now = self._now()
+            if self.deleted:
+                return 0
+
+            #The waiters of the same or higher lanes are served before
+            ahead = sum(1 for lane, waiters in self._waiters.items() if lane >= priority for waiter in waiters if not waiter.done())
+            if not ahead and self._available(now):
+                return 0
+
+            start = max(now, self.blockedUntil)
+            if not self._expired(start):
+                free = self.limit - self.previouslyPending - self.count
+                if ahead < free:
+                    return start - now
+                ahead -= max(free, 0)
+                start = self.time + self.duration
+
+            #Each new time window gives limit tokens
+            return start - now + self.duration * (ahead // max(self.limit, 1))
+
+    def _giveBack(self, num:int):
+        #Uncount a token that was never used
+        if self.num == num:
+            self.count -= 1
+            self.currentlyPending -= 1
+        else:
+            self.previouslyPending -= 1
+
+    def _release(self, num:int):
+        #Give back a token that was never used
+        with self._mutex:
+            self._giveBack(num)
+            self._dispatch()
+
+    def _lanes(self):
+        #Drop the cancelled waiters and the empty lanes, returns the lanes still waiting
+        for priority in list(self._waiters):
+            lane = self._waiters[priority]
+            while lane and lane[0].done():
+                lane.popleft()
+            if not lane:
+                del self._waiters[priority]
+        return self._waiters.keys()
+
+    def _nextLane(self, lanes):
+        """
+        Returns the lane served next : the highest one, unless a lower one is owed a token because of its guaranteed share
+        """
+        if len(lanes) == 1:
+            return next(iter(lanes))
+
+        owed = None
+        for priority in lanes:
+            if priority in self.shares:
+                self._credits[priority] = min(1, self._credits.get(priority, 0) + self.shares[priority])
+                if self._credits[priority] >= 1 and (owed is None or priority > owed):
+                    owed = priority
+
+        if owed is None:
+            return max(lanes)
+        self._credits[owed] -= 1
+        return owed
+
+    def _dispatch(self):
+        """
+        Hand out tokens to the waiters, by lane, as long as the limits allow it
+        """
+        with self._mutex:
+            now = self._now()
+            while self._lanes() and self._available(now):
+                lane = self._waiters[self._nextLane(self._waiters.keys())]
+                self._handOut(lane.popleft(), now)
+
+            if self._waiters and (not self._expired(now) or now < self.blockedUntil):
+                #Only the end of the time window or of the block (or a request getting back) can free a slot
+                self._scheduleWakeup(now)
+
+    def _handOut(self, waiter, now):
+        """
+        Gives a token to a waiter, through its event loop if it is the one of another thread
+        """
+        loop = waiter.get_loop()
+        if loop is _runningLoop():
+            waiter.set_result(self._take(now))
+            return
+        if loop.is_closed():
+            #Nobody is left to use the token
+            return
+
+        num = self._take(now)
+        try:
+            loop.call_soon_threadsafe(self._resolve, waiter, num)
+        except RuntimeError:
+            #The loop was closed meanwhile
+            self._giveBack(num)
+
+    def _resolve(self, waiter, num:int):
+        #Run by the event loop of the waiter, which may have been cancelled while the token was handed out
+        if waiter.done():
+            self._release(num)
+        else:
+            waiter.set_result(num)
+
+    def _scheduleWakeup(self, now):
+        #The timer is set on the current event loop, the other loops having waiters set their own when they start waiting
+        loop = _runningLoop()
+        if loop is None:
+            return
+
+        deadline = self.blockedUntil if now < self.blockedUntil else self.time + self.duration
+        delay = deadline - now
+
+        if loop in self._timers:
+            timer, timerDeadline = self._timers[loop]
+            if timerDeadline == deadline:
+                return
+            timer.cancel()
+
+        if self.debug:
+            print(self.name+" limit reached, sleeping for "+str(round(delay, 3))+" seconds")
+            print("Limit : "+str(self.limit)+" per "+str(self.duration)+" / Count : "+ str(self.count))
+
+        #The timers of the loops closed since are dropped
+        for closed in [closed for closed in self._timers if closed.is_closed()]:
+            del self._timers[closed]
+
+        #The event loop may fire the timer slightly early, make sure the window is over when waking up
+        self._timers[loop] = (loop.call_later(max(delay, 0) + 0.001, self._onTimer, loop), deadline)
+
+    def _onTimer(self, loop):
+        with self._mutex:
+            self._timers.pop(loop, None)
+            self._dispatch()
+
+    #Fired after a 429 caused by this limiter, no token is given until Retry-After is over
+    def block(self, retryAfter:float):
+        with self._mutex:
+            self.blockedUntil = max(self.blockedUntil, self._now() + retryAfter)
+            self._dispatch()
+
+    def _correct(self, count:int, timestamp:float):
+        """
+        Corrects the count of the time window with the one returned by the server.
+        It is at least the server count, which includes the requests of other clients using the key, and at most the server count
+        plus the requests still in flight. Only the latest server count is used as the responses may come back out of order.
+        """
+        if not self.synced or timestamp < self.time or self._expired(timestamp) or count < self.serverCount:
+            return
+        self.serverCount = count
+        self.count = min(max(self.count, count), count + self.currentlyPending)
+
     #Fired when a request is back
-    async def getBack(self, num:int, timestamp:int, limit=None):
-        async with self.backLock:
-            
+    async def getBack(self, num:int, timestamp:float, limit=None, count=None):
+
+        with self._mutex:
             #If the current time window is up to date
             if self.time + self.duration > timestamp:
-                
+
                 #Decrease the pending counter depending on the time window the request was counted
                 if self.num == num:
                     self.currentlyPending -= 1
                 else:
                     self.previouslyPending -= 1
                     self.count += 1
-                
+
                 #Sync the beginning of time window with server and update the limit
                 if not self.synced:
                     if not limit is None:
                         self.updateLimit(limit)
                     self.synced = True
                     self.time = timestamp
-                    
-            #If the time window is out of date
+
+            #If the time window is out of date, the server already opened a new one
             else:
-                await self._reset()
+                self._reset(timestamp)
                 if not limit is None:
                     self.updateLimit(limit)
                 self.previouslyPending -= 1
                 self.count += 1
                 self.synced = True
-                self.time = timestamp
-                
-
-    async def getToken(self):
-        
-        async with self.lock:
-                #Check if outside time window, reset count
-                if self.time + self.duration < time.mktime(datetime.datetime.utcnow().timetuple()):
-
-                    #Wait until it's safe to request and open a new time window
-                    while self.previouslyPending >= self.limit:
-                        await asyncio.sleep(0.5)
-                        
-                #If in time window, check count
-                elif self.count < self.limit:
-
-                    #Wait until it's safe to request or time window is passed
-                    while (self.previouslyPending + self.count) >= self.limit and self.time + self.duration > time.mktime(datetime.datetime.utcnow().timetuple()):
-                        await asyncio.sleep(0.5)
-                    
-                #If count limit reached, await for the end of time window
-                else:
-                    if self.debug:
-                        print(self.name+" limit reached, sleeping for "+str( int((self.time + self.duration) - time.mktime(datetime.datetime.utcnow().timetuple())) + 1)+" seconds")
-                        print("Limit : "+str(self.limit)+" per "+str(self.duration)+" / Count : "+ str(self.count))
-                    #Await for the next time window
-                    await asyncio.sleep( int((self.time + self.duration) - time.mktime(datetime.datetime.utcnow().timetuple())) + 1)
-
-                    
-                async with self.backLock:
-                    #Double check if a reset has not occured in the mean time
-                    timestamp = time.mktime(datetime.datetime.utcnow().timetuple())
-                    if self.time + self.duration < timestamp:
-                        await self._reset()
-                        
-                    #Incr count
-                    self.count +=1
-                    self.currentlyPending += 1
-                    
-                    return self.num
\ No newline at end of file
+
+            if not count is None:
+                self._correct(count, timestamp)
+
+            #A slot may have been freed
+            self._dispatch()
+
+
+    async def getToken(self, priority:int=0):
+
+        #Fast path, nobody is waiting and a slot is free
+        num = self._tryTake()
+        if not num is None:
+            return num
+
+        waiter = asyncio.get_running_loop().create_future()
+        with self._mutex:
+            if not priority in self._waiters:
+                self._waiters[priority] = deque()
+            self._waiters[priority].append(waiter)
+            self._dispatch()
+
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            #The token was handed out right before the cancellation, give it back
+            if waiter.done() and not waiter.cancelled():
+                self._release(waiter.result())
+            raise
@@ -1,95 +1,107 @@
-from .RateLimiter import RateLimiter
+import hashlib, threading
+
+from .Backends import MemoryBackend
 from ..utils.utils import Singleton
+from ..endpoints import ENDPOINTS
 
 class RateLimiterManager(metaclass=Singleton):
-    def __init__(self, debug):
+    def __init__(self, debug, backend=None, key=None):
+        """
+        :param boolean debug: Allows to print debug messages
+        :param backend: Backend keeping the limiters state, MemoryBackend or SQLiteBackend. Default is None, in memory
+        :param string key: API key the limits are counted for, each key having its own limiters. Default is None, limiters not bound to a key
+        """
         
         PLATFORMS = ["br1","eun1","euw1","jp1","kr","la1", "la2","na1","oc1","tr1","ru"]
         REGIONS = ["americas","asia","europe",                    "esports","ap","br","eu","kr","latam","na"]
         
         self.debug=debug
+        self.backend = backend if not backend is None else MemoryBackend()
+        self.keyId = keyId(key)
+        
+        #Guaranteed share of the tokens per priority lane, shared by all the limiters
+        self.shares = {}
         
-        self._rls = {server:RateLimiterServer(self.debug) for server in PLATFORMS + REGIONS}
+        self._rls = {server:RateLimiterServer(self.debug, server, self.backend, self.shares, self.keyId) for server in PLATFORMS + REGIONS}
+    
+    @classmethod
+    def _singletonKey(cls, debug, backend=None, key=None):
+        #One manager per backend and API key
+        return (backend.key if not backend is None else MemoryBackend.key, keyId(key))
         
     def on(self, server):
         return self._rls[server]
     
+    def setShares(self, shares):
+        """
+        :param dict shares: guaranteed share of the tokens per priority, given to its requests while they wait, whatever the higher priorities waiting
+        """
+        self.shares.clear()
+        self.shares.update(shares)
+    
+    def _limiters(self):
+        for server, rl in self._rls.items():
+            for limiter in rl.application:
+                yield server, limiter
+            for limiters in list(rl.methods.values()):
+                for limiter in limiters:
+                    yield server, limiter
+    
+    def used(self):
+        """
+        Returns the number of requests counted in the current time window, per (server, limiter name, window duration), for the limiters in use
+        """
+        return [((server, limiter.name, str(limiter.getDuration())), limiter.used()) for server, limiter in self._limiters() if limiter.used() > 0]
+    
+    def limits(self):
+        """
+        Returns the limit per (server, limiter name, window duration), for the limiters in use
+        """
+        return [((server, limiter.name, str(limiter.getDuration())), limiter.getLimit()) for server, limiter in self._limiters() if limiter.used() > 0]
+    
+def keyId(key):
+    """
+    Returns a short hash of the API key, so it is not stored as is in a shared backend
+    """
+    return hashlib.sha256(key.encode()).hexdigest()[:16] if not key is None else None
+    
 class RateLimiterServer:
     
     #Default application rate limit
     defaultApplicationLimits = [(20,1),(100,120)]
     
-    defaultMethodsLimits = {
-        "get_champion_masteries":[(2000,60)],
-        "get_champion_masteries_by_championId":[(2000,60)],
-        "get_champion_masteries_score":[(2000,60)],
-        "get_champion_rotations":[(30,10),(500,600)],
-        "get_league_by_id":[(500,10)],
-        "get_league_pages":[(50,10)],
-        "get_league_position":[(300,60)],
-        "get_challenger_league":[(30,10),(500,600)],
-        "get_grandmaster_league":[(30,10),(500,600)],
-        "get_master_league":[(30,10),(500,600)],
-        "get_status":[(20000,10),(1200000,600)],
-        "get_match":[(250,10)],
-        "get_timeline":[(250,10)],
-        "get_matchlist":[(500,10)],
-        "get_current_game":[(20000,10),(1200000,600)],
-        "get_featured_games":[(20000,10),(1200000,600)],
-        "get_summoner":[(2000,60)],
-        "get_summoner_by_accountId":[(2000,60)],
-        "get_summoner_by_name":[(2000,60)],
-        "get_summoner_by_puuId":[(2000,60)],
-        "get_third_party_code":[(500,60)],
-        "register_provider":[(10,10),(500,600)],
-        "register_tournament":[(30,10),(500,600)],
-        "create_tournament_code":[(30,10),(500,600)],
-        "get_lobby_events":[(30,10),(500,600)],
-        "get_clash_tournaments":[(10,60)],
-        "get_clash_tournament_by_id":[(10,60)],
-        "get_clash_tournament_by_teamId":[(200,60)],
-        "get_clash_team_by_id":[(200,60)],
-        "get_clash_players_by_summonerId":[(200,60)],
-        "get_tft_league_by_id":[(100,10)],
-        "get_tft_league_pages":[(50,10)],
-        "get_tft_league_position":[(300,60)],
-        "get_tft_challenger_league":[(30,10),(500,600)],
-        "get_tft_grandmaster_league":[(30,10),(500,600)],
-        "get_tft_master_league":[(30,10),(500,600)],
-        "get_tft_match":[(200,10)],
-        "get_tft_matchlist":[(400,10)],
-        "get_tft_summoner":[(2000,60)],
-        "get_tft_summoner_by_accountId":[(2000,60)],
-        "get_tft_summoner_by_name":[(2000,60)],
-        "get_tft_summoner_by_puuId":[(2000,60)],
-        "get_account_by_puuId":[(1000,60)],
-        "get_account_by_riotId":[(1000,60)],
-        "get_active_shards":[(20000,10),(1200000,600)],
-        "get_lor_leaderboard":[(30,10),(500,600)],
-        "get_lor_match":[(100,3600)],
-        "get_lor_matchlist":[(200,3600)],
-        "get_valorant_content":[(60,60)],
-        "get_valorant_match":[(60,60)],
-        "get_valorant_matchlist":[(120,60)],
-        "get_valorant_recent_matches":[(60,60)],
-        "get_valorant_leaderboard":[(10,10)]
-    }
-    
-    def __init__(self, debug):
+    #Default method rate limits, as declared for each endpoint
+    defaultMethodsLimits = {endpoint.name:endpoint.limits for endpoint in ENDPOINTS}
+    
+    def __init__(self, debug, server="", backend=None, shares=None, keyId=None):
         
         self.debug=debug
+        self.server = server
+        
+        #Name of the limiters in the backend, the same server of different keys being counted apart
+        self.scope = server if keyId is None else keyId + ":" + server
+        self.backend = backend if not backend is None else MemoryBackend()
+        self.shares = shares if not shares is None else {}
+        
+        #Guards the changes of limits. The lists of limiters are replaced instead of modified, so they can be iterated without it
+        self._lock = threading.RLock()
         
         self.application = []
         for appLimit in self.defaultApplicationLimits:
-            self.application.append(RateLimiter(self.debug,appLimit, "App"))
+            self.application.append(self._limiter(appLimit, "App"))
             
         self.methods = {}
         
         for method in self.defaultMethodsLimits:
             self.methods[method] = []
             for methodLimit in self.defaultMethodsLimits[method]:
-                self.methods[method].append(RateLimiter(self.debug,methodLimit, method))
+                self.methods[method].append(self._limiter(methodLimit, method))
         
+    def _limiter(self, limits, name, new=False):
+        limiter = self.backend.limiter(self.debug, limits, name, self.scope, new)
+        limiter.shares = self.shares
+        return limiter
+    
     def __str__(self):
         s = "Rate limits : \n"
         for l in self.application:
@@ -100,20 +112,25 @@ class RateLimiterServer:
         return s
     
     def locked(self):
-        return any([l.locked() for l in self.application] + [ml.locked() for m in self.methods for ml in self.methods[m]])
+        return any([l.locked() for l in self.application] + [ml.locked() for limiters in list(self.methods.values()) for ml in limiters])
     
     def updateApplicationLimit(self, duration:int, limit:int):
-        for appLimit in self.application:
-            if duration == appLimit.getDuration():
-                appLimit.updateLimit(limit)
-                return
-        self.application.append(RateLimiter(self.debug,(limit,duration),"App"))
+        with self._lock:
+            for appLimit in self.application:
+                if duration == appLimit.getDuration():
+                    appLimit.updateLimit(limit)
+                    return appLimit
+            appLimit = self._limiter((limit,duration),"App",True)
+            self.application = self.application + [appLimit]
+            return appLimit
         
     def deleteApplicationLimit(self, duration:int):
-        for appLimit in self.application:
-            if duration == appLimit.getDuration():
-                self.application.remove(appLimit)
-                return
+        with self._lock:
+            for appLimit in self.application:
+                if duration == appLimit.getDuration():
+                    self.application = [l for l in self.application if not l is appLimit]
+                    appLimit.delete()
+                    return
     
     def displayApplicationLimit(self):
         for appLimit in self.application:
@@ -126,68 +143,75 @@ class RateLimiterServer:
     
     
     def updateMethodsLimit(self, method:str, duration:int, limit:int):
-        if method in self.methods:
-            for methodLimit in self.methods[method]:
+        with self._lock:
+            for methodLimit in self.methods.get(method, []):
                 if duration == methodLimit.getDuration():
                     methodLimit.updateLimit(limit)
-                    return
-            self.methods[method].append(RateLimiter(self.debug,(limit,duration),method))
-        else:
-            self.methods[method] = []
-            self.methods[method].append(RateLimiter(self.debug,(limit,duration),method))
+                    return methodLimit
+            methodLimit = self._limiter((limit,duration),method,True)
+            self.methods[method] = self.methods.get(method, []) + [methodLimit]
+            return methodLimit
         
     def deleteMethodsLimit(self, method:str, duration:int):
-        for methodLimit in self.methods[method]:
-            if duration == methodLimit.getDuration():
-                self.methods[method].remove(methodLimit)
-                return
+        with self._lock:
+            for methodLimit in self.methods[method]:
+                if duration == methodLimit.getDuration():
+                    self.methods[method] = [l for l in self.methods[method] if not l is methodLimit]
+                    methodLimit.delete()
+                    return
+    
+    async def _getBackLimiters(self, limiters, token, timestamp:float, limits, counts, update, delete):
+        """
+        Gives the token back to the limiters, and update them to match the limits and counts returned in the header
+        """
+        #If the limit is not in the returned header, consider it out of date hence, delete it
+        for limiter in [limiter for limiter in limiters if not limiter.getDuration() in limits]:
+            delete(limiter.getDuration())
+        
+        for duration in limits:
+            limiter = update(duration, limits[duration])
+            if limiter in token:
+                await limiter.getBack(token[limiter], timestamp, limits[duration], counts.get(duration))
+            else:
+                #Limiter created after the token was given, the request is counted by the server anyway
+                limiter.countRequest()
             
-    async def getBack(self, method:str, token, timestamp:int, limits):
+    async def getBack(self, method:str, token, timestamp:float, limits, counts=None):
+        """
+        :param tuple limits: application and method limits returned in the header, as dicts of limit per duration
+        :param tuple counts: application and method counts returned in the header, as dicts of count per duration
+        """
         if limits is None:
-            for i,appLimit in enumerate(self.application):
-                await appLimit.getBack(token[0][i], timestamp)
-            for i,methodLimit in enumerate(self.methods[method]):
-                await methodLimit.getBack(token[1][i], timestamp)
+            for appLimit in self.application:
+                if appLimit in token[0]:
+                    await appLimit.getBack(token[0][appLimit], timestamp)
+            for methodLimit in self.methods[method]:
+                if methodLimit in token[1]:
+                    await methodLimit.getBack(token[1][methodLimit], timestamp)
         else:
-            appLimitsToDelete = []
-            methodsLimitsToDelete = []
-            
-            for i,appLimit in enumerate(self.application):
-                if appLimit.getDuration() in limits[0]:
-                    await appLimit.getBack(token[0][i], timestamp, limits[0][appLimit.getDuration()])
-                    del(limits[0][appLimit.getDuration()])
-                else:
-                    #If the limit is not in the returned header, consider it out of date hence, queue to delete it
-                    appLimitsToDelete.append(appLimit.getDuration())
-                    
-            #Delete the out of date limits
-            for i in appLimitsToDelete:
-                self.deleteApplicationLimit(i)
-            
-            for duration in limits[0]:
-                #If the limit exists in the returned header but not in the manager, create it
-                self.updateApplicationLimit(duration,limits[0][duration])
-                
-            
-            for i,methodLimit in enumerate(self.methods[method]):
-                if methodLimit.getDuration() in limits[1]:
-                    await methodLimit.getBack(token[1][i], timestamp, limits[1][methodLimit.getDuration()])
-                    del(limits[1][methodLimit.getDuration()])
-                else:
-                    #If the limit is not in the returned header, consider it out of date hence, queue to delete it
-                    methodsLimitsToDelete.append(methodLimit.getDuration())
-            
-            #Delete the out of date limits
-            for i in methodsLimitsToDelete:
-                self.deleteMethodsLimit(method, i)
-                
-            for duration in limits[1]:
-                #If the limit exists in the returned header but not in the manager, create it
-                self.updateMethodsLimit(method, duration, limits[1][duration])
-                for methodLimit in self.methods[method]:
-                    if duration == methodLimit.getDuration():
-                        methodLimit.count += 1
-                        return
+            if counts is None:
+                counts = ({}, {})
+            await self._getBackLimiters(self.application, token[0], timestamp, limits[0], counts[0], self.updateApplicationLimit, self.deleteApplicationLimit)
+            await self._getBackLimiters(self.methods[method], token[1], timestamp, limits[1], counts[1], lambda duration, limit: self.updateMethodsLimit(method, duration, limit), lambda duration: self.deleteMethodsLimit(method, duration))
+    
+    def block(self, method:str, limitType:str, retryAfter:float, counts=None):
+        """
+        Blocks the limiters exceeded according to a 429, until Retry-After is over.
+        A 429 of the service is not caused by the key, nothing is blocked.
+        
+        :param string limitType: value of X-Rate-Limit-Type, application or method
+        :param tuple counts: application and method counts returned in the header, to find the exceeded limits
+        """
+        if limitType == "application":
+            limiters, counts = self.application, counts[0] if not counts is None else {}
+        elif limitType == "method":
+            limiters, counts = self.methods[method], counts[1] if not counts is None else {}
+        else:
+            return
+        
+        exceeded = [limiter for limiter in limiters if counts.get(limiter.getDuration(), 0) >= limiter.getLimit()]
+        for limiter in exceeded or limiters:
+            limiter.block(retryAfter)
                 
     
     def displayMethodsLimit(self):
@@ -203,17 +227,84 @@ class RateLimiterServer:
     
     
         
-    async def getToken(self, method:str):
-        appToken=[]
-        methodToken=[]
-        for appLimit in self.application:
-            appToken.append(await appLimit.getToken())
-        
+    def _prepare(self, method:str):
         if not method in self.methods:
             self.updateMethodsLimit(method, 10, 20000)
         
-        for methodLimit in self.methods[method]:
-            methodToken.append(await methodLimit.getToken())
-        return (appToken,methodToken)
-            
-        
\ No newline at end of file
+        #The limits may have been changed by another process
+        with self._lock:
+            self.application = self.backend.refresh(self.scope, "App", self.application, self._limiter)
+            self.methods[method] = self.backend.refresh(self.scope, method, self.methods[method], self._limiter)
+    
+    def _takeAll(self, method:str, held=None):
+        """
+        Takes a token of every application and method limiter without waiting, or none of them.
+        Returns the token, or None and the first limiter without a token available
+        
+        :param tuple held: limiter and window num of a token already taken, used instead of taking another one
+        """
+        token = ({}, {})
+        for limiters, tokens in ((self.application, token[0]), (self.methods[method], token[1])):
+            for limiter in limiters:
+                num = held[1] if not held is None and limiter is held[0] else limiter.tryToken()
+                if num is None:
+                    self.release(token)
+                    if not held is None and not held[0] in token[0] and not held[0] in token[1]:
+                        held[0].release(held[1])
+                    return None, limiter
+                tokens[limiter] = num
+        
+        #The held limiter may have been deleted meanwhile
+        if not held is None and not held[0] in token[0] and not held[0] in token[1]:
+            held[0].release(held[1])
+        return token, None
+    
+    def release(self, token):
+        """
+        Gives back a token that was not used to send a request
+        """
+        for tokens in token:
+            for limiter, num in tokens.items():
+                limiter.release(num)
+    
+    def tryAcquire(self, method:str):
+        """
+        Returns the token if all the application and method limiters have one available now and no one is waiting, else None, without waiting nor taking anything.
+        The token must be given back with getBack once the request is back, or with release if it is not sent.
+        """
+        self._prepare(method)
+        token, blocking = self._takeAll(method)
+        return token
+    
+    def reserve(self, method:str, priority:int=0):
+        """
+        Returns the seconds before a request of the method could get its token, all the application and method limits being evaluated together.
+        0 means tryAcquire would succeed now. Nothing is taken, it is a lower bound as the requests in flight are assumed to be back by then.
+        
+        :param int priority: lane of the request, the requests waiting in the same or higher lanes being served before
+        """
+        self._prepare(method)
+        return max(limiter.eta(priority) for limiter in self.application + self.methods[method])
+        
+    def headroom(self, method:str):
+        """
+        Returns the lowest share of tokens left in the current time windows of the application and method limiters
+        """
+        return min((limiter.getLimit() - limiter.used()) / max(limiter.getLimit(), 1) for limiter in self.application + self.methods.get(method, []))
+        
+    async def getToken(self, method:str, priority:int=0):
+        """
+        Returns the token, the window num given by each limiter.
+        The tokens of all the limiters are taken at once : the request only waits in line on the limiter that is full,
+        without holding a token of the other ones meanwhile.
+        
+        :param int priority: lane of the request, the requests of the highest lanes get their tokens first
+        """
+        self._prepare(method)
+        
+        held = None
+        while True:
+            token, blocking = self._takeAll(method, held)
+            if not token is None:
+                return token
+            held = (blocking, await blocking.getToken(priority))
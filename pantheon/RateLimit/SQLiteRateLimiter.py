@@ -0,0 +1,212 @@
+import os, time
+from contextlib import contextmanager
+
+from .RateLimiter import RateLimiter, _runningLoop
+
+class SQLiteRateLimiter(RateLimiter):
+    """
+    Rate limiter whose state is kept in a SQLite file, shared by all the processes using the same file.
+    The counting rules are the ones of RateLimiter, the state being loaded and stored back in a transaction around each operation.
+    As the other processes cannot wake up the local waiters, they also check the shared state every pollInterval seconds while blocked.
+    The pending tokens are also recorded per process with a lease, so the tokens of a process killed before getting its requests back
+    are not counted forever.
+    """
+
+    #State stored in the database
+    FIELDS = ("limit", "time", "count", "num", "currentlyPending", "previouslyPending", "synced", "serverCount", "blockedUntil")
+
+    def __init__(self, debug, limits : (int,int), name: str, db, server: str, new: bool = False, pollInterval: float = 0.05, mutex=None, requestTimeout: float = 300):
+        RateLimiter.__init__(self, debug, limits, name)
+
+        self._db = db
+        #The limiters using the same connection share its lock, their transactions can not overlap
+        if not mutex is None:
+            self._mutex = mutex
+        self._key = "{}:{}:{}".format(server, name, limits[1])
+        self.pollInterval = pollInterval
+
+        #A pending token is not counted anymore once its request could not be in flight
+        self.lease = limits[1] + requestTimeout
+
+        #Depth of nested state operations, the state is only loaded and stored by the outermost one
+        self._depth = 0
+
+        #The window start is stored as a finite number
+        self.time = -1e18
+        self.blockedUntil = -1e18
+
+        with self._mutex:
+            self._db.execute(
+                "INSERT OR IGNORE INTO limiters (key, server, name, duration, deleted, {}) VALUES (?, ?, ?, ?, 0, {})".format(", ".join('"'+f+'"' for f in self.FIELDS), ", ".join("?" for f in self.FIELDS)),
+                (self._key, server, name, limits[1]) + tuple(self._fields())
+            )
+            if new:
+                self._db.execute('UPDATE limiters SET deleted = 0, "limit" = ? WHERE key = ?', (limits[0], self._key))
+
+    def _fields(self):
+        return [self.limit, self.time, self.count, self.num, self.currentlyPending, self.previouslyPending, int(self.synced), self.serverCount, self.blockedUntil]
+
+    @contextmanager
+    def _state(self):
+        """
+        Exclusive access to the shared state, loaded at the beginning and stored back at the end
+        """
+        with self._mutex:
+            if self._depth > 0:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+
+            self._depth = 1
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT deleted, {} FROM limiters WHERE key = ?".format(", ".join('"'+f+'"' for f in self.FIELDS)), (self._key,)).fetchone()
+                deleted, self.limit, self.time, self.count, self.num, self.currentlyPending, self.previouslyPending, synced, self.serverCount, self.blockedUntil = row
+                self.deleted = bool(deleted)
+                self.synced = bool(synced)
+                if self.currentlyPending or self.previouslyPending:
+                    self._dropStale(self._now())
+
+                yield
+
+                self._db.execute(
+                    "UPDATE limiters SET {} WHERE key = ?".format(", ".join('"'+f+'" = ?' for f in self.FIELDS)),
+                    tuple(self._fields()) + (self._key,)
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            finally:
+                self._depth = 0
+
+    def _now(self):
+        #Shared between processes, so on the wall clock
+        return time.time()
+
+    def _own(self, num: int, tokens: int):
+        """
+        Records tokens taken (or given back if negative) by this process in the time window num.
+        Returns False if there was no token left to give back, its lease being over.
+        """
+        owner = os.getpid()
+        row = self._db.execute("SELECT tokens FROM pending WHERE key = ? AND owner = ? AND num = ?", (self._key, owner, num)).fetchone()
+        current = 0 if row is None else row[0]
+        if current + tokens < 0:
+            return False
+
+        if current + tokens == 0:
+            self._db.execute("DELETE FROM pending WHERE key = ? AND owner = ? AND num = ?", (self._key, owner, num))
+        elif row is None:
+            self._db.execute("INSERT INTO pending (key, owner, num, tokens, expires) VALUES (?, ?, ?, ?, ?)", (self._key, owner, num, current + tokens, self._now() + self.lease))
+        else:
+            self._db.execute("UPDATE pending SET tokens = ?, expires = ? WHERE key = ? AND owner = ? AND num = ?", (current + tokens, self._now() + self.lease, self._key, owner, num))
+        return True
+
+    def _dropStale(self, now):
+        #The tokens of the processes gone and the ones whose lease is over are not pending anymore
+        pid = os.getpid()
+        for owner, num, tokens, expires in self._db.execute("SELECT owner, num, tokens, expires FROM pending WHERE key = ?", (self._key,)).fetchall():
+            if expires >= now and (owner == pid or _alive(owner)):
+                continue
+            if num == self.num:
+                self.currentlyPending = max(self.currentlyPending - tokens, 0)
+            else:
+                self.previouslyPending = max(self.previouslyPending - tokens, 0)
+            self._db.execute("DELETE FROM pending WHERE key = ? AND owner = ? AND num = ?", (self._key, owner, num))
+
+    def _restore(self, num: int):
+        #The token was dropped as stale, count it again as pending so it is uncounted only once
+        if num == self.num:
+            self.currentlyPending += 1
+        else:
+            self.previouslyPending += 1
+
+    def _take(self, now):
+        num = RateLimiter._take(self, now)
+        self._own(num, 1)
+        return num
+
+    def _giveBack(self, num: int):
+        if not self._own(num, -1):
+            self._restore(num)
+        RateLimiter._giveBack(self, num)
+
+    def updateLimit(self, limit: int):
+        with self._state():
+            self.limit = limit
+
+    def countRequest(self):
+        with self._state():
+            self.count += 1
+
+    def delete(self):
+        with self._mutex:
+            self._db.execute("UPDATE limiters SET deleted = 1 WHERE key = ?", (self._key,))
+            self._dispatch()
+
+    def block(self, retryAfter: float):
+        with self._state():
+            RateLimiter.block(self, retryAfter)
+
+    def _tryTake(self):
+        with self._state():
+            return RateLimiter._tryTake(self)
+
+    def eta(self, priority: int = 0):
+        with self._state():
+            return RateLimiter.eta(self, priority)
+
+    def _release(self, num: int):
+        with self._state():
+            RateLimiter._release(self, num)
+
+    def _dispatch(self):
+        with self._state():
+            RateLimiter._dispatch(self)
+            now = self._now()
+
+        #Requests of the other processes can only be seen by checking again
+        if self.locked() and self._expired(now):
+            self._scheduleWakeup(now)
+
+    def _scheduleWakeup(self, now):
+        #Wake up at the end of the window, or sooner to check for the requests got back by the other processes
+        delay = self.time + self.duration - now
+        if delay <= 0 or delay > self.pollInterval:
+            delay = self.pollInterval
+
+        loop = _runningLoop()
+        if loop is None or loop in self._timers:
+            return
+
+        for closed in [closed for closed in self._timers if closed.is_closed()]:
+            del self._timers[closed]
+        self._timers[loop] = (loop.call_later(delay + 0.001, self._onTimer, loop), None)
+
+    async def getBack(self, num: int, timestamp: float, limit=None, count=None):
+        #The timestamp is on the monotonic clock of this process
+        timestamp += time.time() - time.monotonic()
+        with self._state():
+            if not self._own(num, -1):
+                self._restore(num)
+            await RateLimiter.getBack(self, num, timestamp, limit, count)
+
+
+def _alive(pid):
+    """
+    Returns False if no process has this pid anymore
+    """
+    if os.name == "nt":
+        #os.kill would terminate the process, only the lease is used
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,66 @@
+import time
+
+from ..utils import exceptions as exc
+
+class CircuitBreaker:
+    """
+    Fails fast the requests to a server that is down.
+    After a number of consecutive server errors or timeouts, the circuit of the server opens and its requests raise CircuitOpen without being sent.
+    Once the timeout is over, a single request is let through : the circuit closes if it succeeds, and opens again otherwise.
+    """
+    
+    def __init__(self, threshold=5, timeout=30):
+        """
+        :param int threshold: number of consecutive failures opening the circuit. Default is 5
+        :param float timeout: number of seconds the circuit stays open before a request is tried again. Default is 30
+        """
+        self.threshold = threshold
+        self.timeout = timeout
+        
+        #Per server, [consecutive failures, time the circuit was opened or None, trial request in flight]
+        self._servers = {}
+    
+    def _state(self, server:str):
+        state = self._servers.get(server)
+        if state is None:
+            state = [0, None, False]
+            self._servers[server] = state
+        return state
+    
+    def isOpen(self, server:str):
+        state = self._servers.get(server)
+        return not state is None and not state[1] is None
+    
+    def before(self, server:str):
+        """
+        Raises CircuitOpen if the request should not be sent
+        """
+        state = self._state(server)
+        if state[1] is None:
+            return
+        
+        remaining = state[1] + self.timeout - time.monotonic()
+        if remaining > 0 or state[2]:
+            raise exc.CircuitOpen(server, max(remaining, 0))
+        
+        #Half open, this request is the trial
+        state[2] = True
+    
+    def success(self, server:str):
+        state = self._state(server)
+        state[0] = 0
+        state[1] = None
+        state[2] = False
+    
+    def failure(self, server:str):
+        state = self._state(server)
+        state[0] += 1
+        state[2] = False
+        if state[0] >= self.threshold or not state[1] is None:
+            state[1] = time.monotonic()
+    
+    def cancel(self, server:str):
+        """
+        The request was cancelled before its outcome was known
+        """
+        self._state(server)[2] = False
@@ -0,0 +1,82 @@
+import random
+import time
+
+from ..utils import exceptions as exc
+
+class RetryPolicy:
+    """
+    Decides if and when a failed request is retried.
+    The delay grows exponentially with the attempts, capped, with full jitter so that the requests failing together are not retried together.
+    A 429 with a Retry-After header is retried exactly after the given time.
+    The retries of each endpoint are bounded by a budget : a share of the requests sent in the current time window.
+    """
+    
+    def __init__(self, maxRetries=3, base=1, cap=30, jitter=True, budget=0.2, budgetMinimum=10, budgetWindow=10, budgets=None, retryOn=(exc.RateLimit, exc.ServerError, exc.Timeout)):
+        """
+        :param int maxRetries: maximum number of retries of a request. Default is 3
+        :param float base: delay in seconds before the first retry, doubled for each following one. Default is 1
+        :param float cap: maximum delay in seconds between two attempts, except when the server gives a Retry-After. Default is 30
+        :param boolean jitter: wait a random time between 0 and the delay instead of the delay. Default is True
+        :param float budget: number of retries allowed per request sent, for each endpoint. Default is 0.2
+        :param int budgetMinimum: number of retries always allowed in each time window, for each endpoint. Default is 10
+        :param float budgetWindow: duration in seconds of the time window of the budgets. Default is 10
+        :param dict budgets: budget per endpoint method name, overriding the default one
+        :param tuple retryOn: exceptions retried. Default is 429, 5XX and timeouts
+        """
+        self.maxRetries = maxRetries
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+        self.budget = budget
+        self.budgetMinimum = budgetMinimum
+        self.budgetWindow = budgetWindow
+        self.budgets = budgets if not budgets is None else {}
+        self.retryOn = retryOn
+        
+        #Per endpoint, [start of the time window, requests, retries]
+        self._windows = {}
+        
+        self._random = random.Random()
+    
+    def _window(self, method:str):
+        now = time.monotonic()
+        window = self._windows.get(method)
+        if window is None or window[0] + self.budgetWindow <= now:
+            window = [now, 0, 0]
+            self._windows[method] = window
+        return window
+    
+    def request(self, method:str):
+        """
+        Counts a request sent for the first time, increasing the retry budget of the endpoint
+        """
+        self._window(method)[1] += 1
+    
+    def backoff(self, attempt:int):
+        """
+        Returns the delay before the given retry, starting at 0
+        """
+        delay = min(self.cap, self.base * 2 ** attempt)
+        if self.jitter:
+            return self._random.uniform(0, delay)
+        return delay
+    
+    def delay(self, method:str, error:Exception, attempt:int):
+        """
+        Returns the number of seconds to wait before retrying the request, None if it should not be retried
+        
+        :param string method: name of the endpoint method
+        :param Exception error: exception raised by the last attempt
+        :param int attempt: number of retries already done
+        """
+        if not isinstance(error, self.retryOn) or isinstance(error, exc.CircuitOpen) or attempt >= self.maxRetries:
+            return None
+        
+        window = self._window(method)
+        if window[2] >= self.budgetMinimum + self.budgets.get(method, self.budget) * window[1]:
+            return None
+        window[2] += 1
+        
+        if isinstance(error, exc.RateLimit) and not error.retryAfter is None:
+            return error.retryAfter
+        return self.backoff(attempt)
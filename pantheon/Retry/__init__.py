@@ -0,0 +1,2 @@
+from .RetryPolicy import RetryPolicy
+from .CircuitBreaker import CircuitBreaker
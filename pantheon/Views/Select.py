@@ -0,0 +1,153 @@
+import json, re
+from functools import lru_cache
+from json.decoder import scanstring
+
+#Scanner of the json module, decoding the value starting at an index. It is the C one when available
+_scan = json.JSONDecoder().scan_once
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_SCALAR = r'(?:' + _STRING + r'|-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null)'
+
+@lru_cache(maxsize=256)
+def _pairs(keys):
+    """
+    Returns a regex matching a run of the members of an object having a scalar value and a key not in keys, followed by a comma.
+    Most of the members of a match are skipped by one call to it, instead of one iteration each
+    """
+    excluded = "|".join(re.escape(json.dumps(key, ensure_ascii=False)) for key in sorted(keys))
+    key = r'(?!(?:' + excluded + r')\s*:)' + _STRING if excluded else _STRING
+    return re.compile(r'(?:' + key + r'\s*:\s*' + _SCALAR + r'\s*,\s*)*')
+
+def _tree(paths):
+    """
+    Returns the selected paths as a tree of dicts, None marking a value selected whole
+    """
+    tree = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is None:
+                #A parent is already selected whole
+                break
+            node = child
+        else:
+            node[parts[-1]] = None
+    return tree
+
+def _merge(a, b):
+    if a is None or b is None:
+        return None
+    merged = dict(a)
+    for key, value in b.items():
+        merged[key] = _merge(merged[key], value) if key in merged else value
+    return merged
+
+def _skip(s, idx):
+    return _whitespace.match(s, idx).end()
+
+def _value(s, idx):
+    try:
+        return _scan(s, idx)
+    except StopIteration as e:
+        raise json.JSONDecodeError("Expecting value", s, e.value) from None
+
+def _walk(s, idx, tree):
+    """
+    Returns the value starting at idx with only the selected paths of its objects, and the index following it
+    """
+    idx = _skip(s, idx)
+    if tree is None or not s[idx] in "{[":
+        return _value(s, idx)
+
+    if s[idx] == "{" and all(child is None for child in tree.values()):
+        #Only members of this object are selected : decoding it whole in C is faster than walking through its members in Python,
+        #and only one such object at a time is in memory
+        value, idx = _value(s, idx)
+        return {key: value[key] for key in tree if key in value}, idx
+
+    if s[idx] == "{":
+        result = {}
+        idx = _skip(s, idx + 1)
+        if s[idx] == "}":
+            return result, idx + 1
+        pairs = _pairs(frozenset(tree))
+        while True:
+            idx = pairs.match(s, idx).end()
+            if s[idx] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", s, idx)
+            key, idx = scanstring(s, idx + 1)
+            idx = _skip(s, idx)
+            if s[idx] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", s, idx)
+            if key in tree:
+                result[key], idx = _walk(s, idx + 1, tree[key])
+            else:
+                #Decoded and dropped right away, the memory used is the one of the biggest value skipped instead of the whole document
+                idx = _value(s, _skip(s, idx + 1))[1]
+            idx = _skip(s, idx)
+            if s[idx] == "}":
+                return result, idx + 1
+            if s[idx] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", s, idx)
+            idx = _skip(s, idx + 1)
+
+    #List, "*" selecting in all its items, kept as a list, and an index in one item, kept in a dict by index
+    everyItem = "*" in tree
+    result = [] if everyItem else {}
+    position = 0
+    idx = _skip(s, idx + 1)
+    if s[idx] == "]":
+        return result, idx + 1
+    while True:
+        key = str(position)
+        if everyItem:
+            value, idx = _walk(s, idx, _merge(tree["*"], tree[key]) if key in tree else tree["*"])
+            result.append(value)
+        elif key in tree:
+            result[key], idx = _walk(s, idx, tree[key])
+        else:
+            idx = _value(s, _skip(s, idx))[1]
+        position += 1
+        idx = _skip(s, idx)
+        if s[idx] == "]":
+            return result, idx + 1
+        if s[idx] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", s, idx)
+        idx += 1
+
+def _extract(value, parts):
+    for i, part in enumerate(parts):
+        if part == "*":
+            return [_extract(item, parts[i+1:]) for item in value] if isinstance(value, list) else None
+        if isinstance(value, list):
+            value = value[int(part)] if part.isdigit() and int(part) < len(value) else None
+        elif isinstance(value, dict):
+            value = value.get(part)
+        else:
+            value = None
+        if value is None:
+            return None
+    return value
+
+def select(body, *paths):
+    """
+    Returns the values at the given paths of a JSON document, without building the objects outside of them.
+    A path is made of the keys separated by dots, an index or * selecting in the items of a list.
+    Returns one value per path, None for the missing ones, as a list for the paths with a * :
+
+    matchId, puuids, wins = select(body, "metadata.matchId", "metadata.participants", "info.participants.*.win")
+
+    Cheaper in memory than decoding the whole document, as only the selected values are kept.
+    The parts skipped still need to be scanned, with the json module as no parser of the standard library can jump over a value :
+    with orjson installed, decoding the whole document and reading the paths is faster, select being worth it for its memory only.
+
+    :param body: JSON document, as bytes or str. Pantheon(raw=True) returns the bodies of the responses as bytes
+    :param string paths: paths of the values to return
+    """
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        body = bytes(body).decode("utf-8")
+    value = _walk(body, 0, _tree(paths))[0]
+    return [_extract(value, path.split(".")) for path in paths]
@@ -0,0 +1,159 @@
+from itertools import chain
+from operator import itemgetter, methodcaller
+
+from .Views import View
+from ..utils import utils
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#Stats of the participant frames decoded by default, the ones of nested objects written with a dot
+FRAME_STATS = ("totalGold", "currentGold", "xp", "level", "minionsKilled", "jungleMinionsKilled", "position.x", "position.y",
+    "damageStats.totalDamageDoneToChampions", "damageStats.totalDamageTaken")
+
+class TimelineArrays:
+    """
+    Stats of the participant frames and events of timelines, as NumPy arrays.
+
+    frames : array indexed [match, frame, participant, stat], participant 0 being the participantId 1. The frames after the end of a match are NaN
+    frameCounts : number of frames of each match
+    stats : names of the stats, in the order of the last axis of frames
+    matchIds : ids of the matches, in the order of the first axis
+    events : structured array with one row per event, with the fields match, frame, timestamp, type, participantId, victimId, itemId, x and y.
+    participantId is the killer of the kills and the creator of the wards, 0 when unknown. x and y are -1 for the events without position
+    eventTypes : names of the types of events, the type field of events being an index in it
+    """
+
+    def __init__(self, matchIds, stats, frames, frameCounts, events, eventTypes):
+        self.matchIds = matchIds
+        self.stats = stats
+        self.frames = frames
+        self.frameCounts = frameCounts
+        self.events = events
+        self.eventTypes = eventTypes
+
+    def stat(self, name):
+        """
+        Returns the values of a stat, indexed [match, frame, participant]
+        """
+        return self.frames[..., self.stats.index(name)]
+
+    def eventsOf(self, type):
+        """
+        Returns the rows of the events of a type, as CHAMPION_KILL
+        """
+        if not type in self.eventTypes:
+            return self.events[:0]
+        return self.events[self.events["type"] == self.eventTypes.index(type)]
+
+
+EVENT_DTYPE = [("match", "i4"), ("frame", "i2"), ("timestamp", "i4"), ("type", "i2"), ("participantId", "i1"), ("victimId", "i1"), ("itemId", "i4"), ("x", "i4"), ("y", "i4")]
+
+def _rowGetter(stats):
+    """
+    Returns a function returning the values of the stats of a participant frame as a tuple, grouped by nested object, and the order of the stats in it.
+    Each participant frame is read in one go while in the CPU cache, the stats of a nested object being taken together by an itemgetter
+    """
+    groups = {}
+    for stat in stats:
+        parent, dot, key = stat.rpartition(".")
+        groups.setdefault(parent, []).append(key)
+
+    getters = []
+    for parent, keys in groups.items():
+        path = parent.split(".") if parent else []
+        getters.append((path, itemgetter(*keys) if len(keys) > 1 else (lambda obj, key=keys[0]: (obj[key],))))
+
+    def row(participantFrame):
+        values = ()
+        for path, getter in getters:
+            obj = participantFrame
+            for part in path:
+                obj = obj[part]
+            values += getter(obj)
+        return values
+
+    order = [parent + "." + key if parent else key for parent, keys in groups.items() for key in keys]
+    return row, [order.index(stat) for stat in stats]
+
+def _safeRow(stats):
+    """
+    Slower version of the row getter, returning NaN for the missing stats
+    """
+    paths = [stat.split(".") for stat in stats]
+
+    def row(participantFrame):
+        values = []
+        for path in paths:
+            value = participantFrame
+            for part in path:
+                value = value.get(part) if isinstance(value, dict) else None
+            values.append(numpy.nan if value is None else value)
+        return values
+
+    return row, list(range(len(stats)))
+
+def decodeTimelines(timelines, stats=FRAME_STATS, events=True, dtype=None):
+    """
+    Decodes timelines of match-v5 into arrays, see TimelineArrays. Needs numpy, installed with pantheon[numpy]
+
+    :param timelines: a timeline or a list of timelines, as returned by get_timeline : dicts, bodies with raw=True or views with views=True
+    :param tuple stats: names of the stats of the participant frames to decode, the ones of nested objects written with a dot as position.x. Default is FRAME_STATS
+    :param boolean events: False to skip the events, about half of the decoding time, TimelineArrays.events being empty. Default is True
+    :param dtype: type of the values of the frames array, a floating type as the missing frames are NaN. Default is None, float32
+    """
+    if numpy is None:
+        raise ImportError("numpy is needed to decode the timelines to arrays, install it with pip install pantheon[numpy]")
+    if dtype is None:
+        dtype = numpy.float32
+
+    if isinstance(timelines, (dict, bytes, View)):
+        timelines = [timelines]
+    timelines = [utils.loads(timeline) if isinstance(timeline, bytes) else timeline.data if isinstance(timeline, View) else timeline for timeline in timelines]
+
+    matchIds = [timeline["metadata"]["matchId"] for timeline in timelines]
+    frameLists = [timeline["info"]["frames"] for timeline in timelines]
+    frameCounts = numpy.fromiter(map(len, frameLists), numpy.int32, count=len(frameLists))
+    nbFrames = int(frameCounts.max()) if len(frameLists) else 0
+    nbParticipants = max((len(frames[0]["participantFrames"]) for frames in frameLists if frames), default=0)
+    allFrames = list(chain.from_iterable(frameLists))
+
+    #One row per participant frame, in the order of the array, streamed to numpy : each row is freed right away,
+    #instead of being kept in a list that triggers garbage collections going through all the timelines
+    keys = [str(participantId) for participantId in range(1, nbParticipants + 1)]
+    count = len(allFrames) * nbParticipants * len(stats)
+    try:
+        row, order = _rowGetter(stats)
+        values = numpy.fromiter(chain.from_iterable(row(participantFrames[key]) for participantFrames in map(itemgetter("participantFrames"), allFrames) for key in keys), dtype, count=count)
+    except (KeyError, TypeError):
+        row, order = _safeRow(stats)
+        values = numpy.fromiter(chain.from_iterable(row(participantFrames.get(key, {})) for participantFrames in map(methodcaller("get", "participantFrames", {}), allFrames) for key in keys), dtype, count=count)
+
+    frames = numpy.full((len(frameLists), nbFrames, nbParticipants, len(stats)), numpy.nan, dtype)
+    if count:
+        frames[numpy.arange(nbFrames) < frameCounts[:, None]] = values.reshape(-1, nbParticipants, len(stats))[..., order]
+
+    #Match and frame of each frame, then of each event
+    frameMatch = numpy.repeat(numpy.arange(len(frameLists), dtype=numpy.int32), frameCounts)
+    frameIndex = numpy.arange(len(allFrames), dtype=numpy.int32) - numpy.repeat(numpy.cumsum(frameCounts) - frameCounts, frameCounts)
+    eventLists = list(map(methodcaller("get", "events", []), allFrames)) if events else [[]] * len(allFrames)
+    eventCounts = numpy.fromiter(map(len, eventLists), numpy.int32, count=len(eventLists))
+
+    typeCodes = {}
+    def eventRow(event):
+        #The actor of an event is given by a different field depending on its type
+        position = event.get("position")
+        return (typeCodes.setdefault(event["type"], len(typeCodes)), event.get("timestamp", 0), event.get("participantId") or event.get("killerId") or event.get("creatorId") or 0,
+            event.get("victimId", 0), event.get("itemId", 0), position["x"] if position else -1, position["y"] if position else -1)
+
+    nbEvents = int(eventCounts.sum())
+    table = numpy.zeros(nbEvents, EVENT_DTYPE)
+    table["match"] = numpy.repeat(frameMatch, eventCounts)
+    table["frame"] = numpy.repeat(frameIndex, eventCounts)
+    values = numpy.fromiter(chain.from_iterable(map(eventRow, chain.from_iterable(eventLists))), numpy.int64, count=nbEvents * 7).reshape(nbEvents, 7)
+    for index, field in enumerate(("type", "timestamp", "participantId", "victimId", "itemId", "x", "y")):
+        table[field] = values[:, index]
+
+    return TimelineArrays(matchIds, tuple(stats), frames, frameCounts, table, list(typeCodes))
@@ -0,0 +1,169 @@
+from ..utils import utils
+
+class View:
+    """
+    Read-only view of a JSON object, decoded from the raw body on first access only.
+    The fields are read as attributes or items, the nested objects being wrapped in views as well : match.info.gameDuration.
+    A view that is only stored or passed along costs the size of its body, several times smaller than the decoded dict.
+    """
+
+    __slots__ = ("_body", "_data", "_decoder")
+
+    def __init__(self, body=None, data=None, decoder=None):
+        """
+        :param bytes body: raw JSON document, decoded on first access
+        :param dict data: already decoded object, used instead of the body
+        :param function decoder: function decoding the body. Default is None, using orjson or ujson if installed, json otherwise
+        """
+        self._body = body
+        self._data = data
+        self._decoder = decoder
+
+    @property
+    def data(self):
+        """
+        Returns the decoded object, decoding the body if not done yet
+        """
+        if self._data is None:
+            self._data = (self._decoder or utils.loads)(self._body)
+            #The decoded object is enough from now on
+            self._body = None
+        return self._data
+
+    @property
+    def body(self):
+        """
+        Returns the raw JSON document, encoded again if the body was already decoded
+        """
+        if self._body is None:
+            return utils.dumps(self._data)
+        return self._body
+
+    def _wrap(self, value, cls=None):
+        if isinstance(value, dict):
+            return (cls or View)(data=value)
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            return [(cls or View)(data=item) for item in value]
+        return value
+
+    def __getattr__(self, name):
+        #Only called for the names that are not slots, properties or methods
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._wrap(self.data[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key):
+        return self._wrap(self.data[key])
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        value = self.data.get(key, default)
+        return self._wrap(value) if not value is default else default
+
+    def keys(self):
+        return self.data.keys()
+
+    def __eq__(self, other):
+        if isinstance(other, View):
+            other = other.data
+        return self.data == other
+
+    def __repr__(self):
+        if self._data is None:
+            return "<{} ({} bytes, not decoded)>".format(type(self).__name__, len(self._body))
+        return "<{} {}>".format(type(self).__name__, list(self._data))
+
+    def __getstate__(self):
+        return (self.body, None)
+
+    def __setstate__(self, state):
+        self._body, self._data = state
+        self._decoder = None
+
+
+class Participant(View):
+    """
+    Participant of a Match. Its fields are read as attributes : participant.puuid, participant.win, participant.placement for TFT
+    """
+
+    __slots__ = ()
+
+
+class Match(View):
+    """
+    Match of match-v5 or tft-match-v1, as returned by get_match and get_tft_match with Pantheon(views=True)
+    """
+
+    __slots__ = ()
+
+    @property
+    def matchId(self):
+        return self.data["metadata"]["matchId"]
+
+    @property
+    def puuids(self):
+        """
+        Returns the puuIds of the participants, in the order of the participants
+        """
+        return self.data["metadata"]["participants"]
+
+    @property
+    def participants(self):
+        return self._wrap(self.data["info"]["participants"], Participant)
+
+    def participant(self, puuId):
+        """
+        Returns the Participant of a player, or None if the player is not in the match
+        """
+        for participant in self.data["info"]["participants"]:
+            if participant.get("puuid") == puuId:
+                return Participant(data=participant)
+        return None
+
+
+class Timeline(View):
+    """
+    Timeline of a match-v5 match, as returned by get_timeline with Pantheon(views=True)
+    """
+
+    __slots__ = ()
+
+    @property
+    def matchId(self):
+        return self.data["metadata"]["matchId"]
+
+    @property
+    def frames(self):
+        return self._wrap(self.data["info"]["frames"])
+
+    def participantFrames(self, participantId):
+        """
+        Returns the frames of a participant, one per minute, as views
+
+        :param int participantId: id of the participant in the match, from 1 to 10
+        """
+        key = str(participantId)
+        return [View(data=frame["participantFrames"][key]) for frame in self.data["info"]["frames"]]
+
+    def events(self, type=None):
+        """
+        Returns the events of all the frames, in order, as views
+
+        :param string type: only returns the events of this type, as CHAMPION_KILL. Default is None, all the events
+        """
+        return [View(data=event) for frame in self.data["info"]["frames"] for event in frame["events"] if type is None or event.get("type") == type]
+
+
+#View returned by each endpoint with Pantheon(views=True)
+VIEWS = {"get_match": Match, "get_tft_match": Match, "get_timeline": Timeline}
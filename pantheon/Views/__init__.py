@@ -0,0 +1,3 @@
+from .Views import View, Match, Participant, Timeline
+from .Select import select
+from .TimelineArrays import TimelineArrays, decodeTimelines
@@ -1 +1,2 @@
-from pantheon.pantheon import Pantheon
\ No newline at end of file
+from pantheon.pantheon import Pantheon
+from pantheon.sync import SyncPantheon
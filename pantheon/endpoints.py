@@ -0,0 +1,607 @@
+from string import Formatter
+from urllib.parse import quote, urlencode
+
+class Endpoint:
+    """
+    Description of an endpoint of the Riot API, from which the method of Pantheon calling it is generated
+    """
+    
+    def __init__(self, name, routing, path, limits, args=(), defaults=None, query=None, params=None, method="GET", body=None, convert=None, servers=None, doc=None):
+        """
+        :param string name: name of the generated method, also used as the key of the method rate limits
+        :param string routing: server the endpoint is called on : "platform", "region" or "tournament"
+        :param string path: template of the path, relative to the server url, with the arguments between braces
+        :param list limits: default method rate limits, list of (limit, duration)
+        :param tuple args: names of the arguments of the method, in order
+        :param dict defaults: default values of the optional arguments
+        :param dict query: query string parameter name per argument name, the arguments set to None are left out
+        :param string params: name of the argument holding a dict of free query string parameters
+        :param string method: HTTP method
+        :param function body: function building the JSON body from the dict of arguments values
+        :param dict convert: function converting the value of an argument before it is put in the path, per argument name
+        :param dict servers: server to put in the url instead of the routing value, when they differ
+        :param string doc: docstring of the generated method
+        """
+        self.name = name
+        self.routing = routing
+        self.path = path
+        self.limits = limits
+        self.args = args
+        self.defaults = defaults if not defaults is None else {}
+        self.query = query if not query is None else {}
+        self.params = params
+        self.method = method
+        self.body = body
+        self.convert = convert if not convert is None else {}
+        self.servers = servers if not servers is None else {}
+        self.doc = doc
+        
+        #Compile the path template once into its literal parts and fields
+        self._parts = [(literal, field) for literal, field, spec, conversion in Formatter().parse(path)]
+    
+    def bind(self, args, params):
+        """
+        Returns the dict of the values of all arguments, from the positional and keyword arguments of a call
+        """
+        if len(args) > len(self.args):
+            raise TypeError("{}() takes {} positional arguments but {} were given".format(self.name, len(self.args), len(args)))
+        
+        values = dict(self.defaults)
+        values.update(zip(self.args, args))
+        
+        for name in params:
+            if not name in self.defaults and not name in self.args:
+                raise TypeError("{}() got an unexpected keyword argument '{}'".format(self.name, name))
+            if self.args.index(name) < len(args):
+                raise TypeError("{}() got multiple values for argument '{}'".format(self.name, name))
+        values.update(params)
+        
+        if len(values) < len(self.args):
+            missing = [name for name in self.args if not name in values]
+            raise TypeError("{}() missing required arguments : {}".format(self.name, ", ".join(missing)))
+        
+        return values
+    
+    def url(self, base, values):
+        """
+        Returns the url of the endpoint for the given arguments values, path and query parameters being percent-encoded
+        
+        :param string base: url of the targeted server
+        :param dict values: arguments values, as returned by bind
+        """
+        url = base
+        for literal, field in self._parts:
+            url += literal
+            if not field is None:
+                value = values[field]
+                if field in self.convert:
+                    value = self.convert[field](value)
+                url += quote(str(value), safe="")
+        
+        query = [(name, values[arg]) for name, arg in self.query.items() if not values[arg] is None]
+        if not self.params is None and values[self.params]:
+            query += list(values[self.params].items())
+        if query:
+            url += "?" + urlencode(query, doseq=True)
+        
+        return url
+    
+
+class Request:
+    """
+    A request to send, built from a call of an endpoint method
+    """
+    
+    __slots__ = ("name", "server", "url", "method", "data", "priority", "key")
+    
+    def __init__(self, name, server, url, method="GET", data=None, priority=0):
+        """
+        :param string name: name of the endpoint method, used for the method rate limits
+        :param string server: platform or region the request is rate limited on
+        :param string url: full url of the request
+        :param string method: HTTP method
+        :param data: JSON body of the request
+        :param int priority: lane of the request in the rate limiters, the highest lanes get their tokens first
+        """
+        self.name = name
+        self.server = server
+        self.url = url
+        self.method = method
+        self.data = data
+        self.priority = priority
+        
+        #API key the request is sent with, chosen when it gets its rate limit token
+        self.key = None
+    
+    def __repr__(self):
+        return "Request({} {})".format(self.method, self.url)
+
+
+def stubPrefix(stub):
+    return "-stub" if stub else ""
+
+#LoR uses sea instead of asia
+LOR_SERVERS = {"asia":"sea"}
+
+ENDPOINTS = [
+    #Champion mastery
+    Endpoint("get_champion_masteries", "platform", "lol/champion-mastery/v4/champion-masteries/by-summoner/{summonerId}", [(2000,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#champion-mastery-v4/GET_getAllChampionMasteries
+        """),
+    
+    Endpoint("get_champion_masteries_by_championId", "platform", "lol/champion-mastery/v4/champion-masteries/by-summoner/{summonerId}/by-champion/{championId}", [(2000,60)],
+        args=("summonerId", "championId"),
+        doc="""
+            :param string summonerId: summonerId of the player
+            :param int championId: id of the champion
+
+            Returns the result of https://developer.riotgames.com/api-methods/#champion-mastery-v4/GET_getChampionMastery
+        """),
+    
+    Endpoint("get_champion_masteries_score", "platform", "lol/champion-mastery/v4/scores/by-summoner/{summonerId}", [(2000,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#champion-mastery-v4/GET_getChampionMasteryScore
+        """),
+    
+    #Champions
+    Endpoint("get_champion_rotations", "platform", "lol/platform/v3/champion-rotations", [(30,10),(500,600)],
+        doc="""
+        Returns the result of https://developer.riotgames.com/api-methods/#champion-v3/GET_getChampionInfo
+        """),
+    
+    #League
+    Endpoint("get_league_by_id", "platform", "lol/league/v4/leagues/{leagueId}", [(500,10)],
+        args=("leagueId",),
+        doc="""
+        :param string leagueId: id of the league
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueById
+        """),
+    
+    Endpoint("get_league_pages", "platform", "lol/league/v4/entries/{queue}/{tier}/{division}", [(50,10)],
+        args=("queue", "tier", "division", "page"),
+        defaults={"queue":"RANKED_SOLO_5x5", "tier":"DIAMOND", "division":"I", "page":1},
+        query={"page":"page"},
+        doc="""
+        :param string queue: queue to get the page of
+        :param string tier: tier to get the page of
+        :param string division: division to get the page of
+        :param int page: page to get
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueEntriesForSummoner
+        """),
+    
+    Endpoint("get_league_position", "platform", "lol/league/v4/entries/by-summoner/{summonerId}", [(300,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueEntriesForSummoner
+        """),
+    
+    Endpoint("get_challenger_league", "platform", "lol/league/v4/challengerleagues/by-queue/{queue}", [(30,10),(500,600)],
+        args=("queue",),
+        defaults={"queue":"RANKED_SOLO_5x5"},
+        doc="""
+        :param string queue: queue to get the challenger league of
+            Values accepted : 
+             * RANKED_SOLO_5x5 *(default)*
+             * RANKED_FLEX_SR
+             * RANKED_FLEX_TT
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getChallengerLeague
+        """),
+    
+    Endpoint("get_grandmaster_league", "platform", "lol/league/v4/grandmasterleagues/by-queue/{queue}", [(30,10),(500,600)],
+        args=("queue",),
+        defaults={"queue":"RANKED_SOLO_5x5"},
+        doc="""
+        :param string queue: queue to get the master league of
+            Values accepted : 
+             * RANKED_SOLO_5x5 *(default)*
+             * RANKED_FLEX_SR
+             * RANKED_FLEX_TT
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getGrandmasterLeague
+        """),
+    
+    Endpoint("get_master_league", "platform", "lol/league/v4/masterleagues/by-queue/{queue}", [(30,10),(500,600)],
+        args=("queue",),
+        defaults={"queue":"RANKED_SOLO_5x5"},
+        doc="""
+        :param string queue: queue to get the master league of
+            Values accepted : 
+             * RANKED_SOLO_5x5 *(default)*
+             * RANKED_FLEX_SR
+             * RANKED_FLEX_TT
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getMasterLeague
+        """),
+    
+    #Status
+    Endpoint("get_status", "platform", "lol/status/v4/platform-data", [(20000,10),(1200000,600)],
+        doc="""
+        Returns the result of https://developer.riotgames.com/apis#lol-status-v4/GET_getPlatformData
+        """),
+    
+    #Match
+    Endpoint("get_match", "region", "lol/match/v5/matches/{matchId}", [(250,10)],
+        args=("matchId",),
+        doc="""
+        :param int matchId: matchId of the match, also known as gameId
+        
+        Returns the result of https://developer.riotgames.com/apis#match-v5/GET_getMatch
+        """),
+    
+    Endpoint("get_timeline", "region", "lol/match/v5/matches/{matchId}/timeline", [(250,10)],
+        args=("matchId",),
+        doc="""
+        :param int matchId: matchId of the match, also known as gameId
+        
+        Returns the result of https://developer.riotgames.com/apis#match-v5/GET_getTimeline
+        """),
+    
+    Endpoint("get_matchlist", "region", "lol/match/v5/matches/by-puuid/{puuId}/ids", [(500,10)],
+        args=("puuId", "params"),
+        defaults={"params":None},
+        params="params",
+        doc="""
+        :param string puuId: puuId of the player
+        :param object params: all key:value params to add to the request
+        
+        Returns the result of https://developer.riotgames.com/apis#match-v5/GET_getMatchIdsByPUUID
+        """),
+    
+    #Spectator
+    Endpoint("get_current_game", "platform", "lol/spectator/v4/active-games/by-summoner/{summonerId}", [(20000,10),(1200000,600)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#spectator-v4/GET_getCurrentGameInfoBySummoner
+        """),
+    
+    Endpoint("get_featured_games", "platform", "lol/spectator/v4/featured-games", [(20000,10),(1200000,600)],
+        doc="""
+        Returns the result of https://developer.riotgames.com/api-methods/#spectator-v3/GET_getFeaturedGames
+        """),
+    
+    #Summoner
+    Endpoint("get_summoner", "platform", "lol/summoner/v4/summoners/{summonerId}", [(2000,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#summoner-v4/GET_getBySummonerId
+        """),
+    
+    Endpoint("get_summoner_by_accountId", "platform", "lol/summoner/v4/summoners/by-account/{accountId}", [(2000,60)],
+        args=("accountId",),
+        doc="""
+        :param string accountId: accountId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#summoner-v4/GET_getByAccountId
+        """),
+    
+    Endpoint("get_summoner_by_name", "platform", "lol/summoner/v4/summoners/by-name/{summonerName}", [(2000,60)],
+        args=("summonerName",),
+        doc="""
+        :param string summonerName: name of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#summoner-v4/GET_getBySummonerName
+        """),
+    
+    Endpoint("get_summoner_by_puuId", "platform", "lol/summoner/v4/summoners/by-puuid/{puuId}", [(2000,60)],
+        args=("puuId",),
+        doc="""
+        :param string puuId: puuId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#summoner-v4/GET_getByPUUID
+        """),
+    
+    #Third Party Code
+    Endpoint("get_third_party_code", "platform", "lol/platform/v4/third-party-code/by-summoner/{summonerId}", [(500,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#third-party-code-v4/GET_getThirdPartyCodeBySummonerId
+        """),
+    
+    #Tournaments
+    Endpoint("register_provider", "tournament", "lol/tournament{stub}/v4/providers", [(10,10),(500,600)],
+        args=("region", "callback_url", "stub"),
+        defaults={"stub":False},
+        method="POST",
+        body=lambda values: {"region":values["region"], "url":values["callback_url"]},
+        convert={"stub":stubPrefix},
+        doc="""
+        :param str region: region to get a provider for
+        :param str callback_url: url to which a callback will be sent after each match created with a tournament code from this provider
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/POST_registerProviderData
+        """),
+    
+    Endpoint("register_tournament", "tournament", "lol/tournament{stub}/v4/tournaments", [(30,10),(500,600)],
+        args=("providerId", "name", "stub"),
+        defaults={"stub":False},
+        method="POST",
+        body=lambda values: {"providerId":values["providerId"], "name":values["name"]},
+        convert={"stub":stubPrefix},
+        doc="""
+        :param int providerId: providerId to create a tournament
+        :param str name: name of the tournament
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/POST_registerTournament
+        """),
+    
+    Endpoint("create_tournament_code", "tournament", "lol/tournament{stub}/v4/codes", [(30,10),(500,600)],
+        args=("tournamentId", "data", "nb_codes", "stub"),
+        defaults={"nb_codes":1, "stub":False},
+        method="POST",
+        query={"count":"nb_codes", "tournamentId":"tournamentId"},
+        body=lambda values: values["data"],
+        convert={"stub":stubPrefix},
+        doc="""
+        :param int tournamentId: tournamentId for which the code will be created
+        :param int nb_codes: number of codes to generate
+        :param dict data: datafor the code generation, including : 
+            list[str] allowedSummonerIds: list of all summonerId (optional)
+            str mapType: map for the game
+            str pickType: pick type for the game
+            str spectatorType: spectator type for the game
+            int teamSize: max number of player in a team
+            str metadata: additional data to get back with the callback (optional)
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/POST_createTournamentCode
+        """),
+    
+    Endpoint("get_lobby_events", "tournament", "lol/tournament{stub}/v4/lobby-events/by-code/{tournamentCode}", [(30,10),(500,600)],
+        args=("tournamentCode", "stub"),
+        defaults={"stub":False},
+        convert={"stub":stubPrefix},
+        doc="""
+        :param str tournamentCode: code of the tournament game
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/GET_getLobbyEventsByCode
+        """),
+    
+    #Clash
+    Endpoint("get_clash_tournaments", "platform", "lol/clash/v1/tournaments", [(10,60)],
+        doc="""        
+        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTournaments
+        """),
+    
+    Endpoint("get_clash_tournament_by_id", "platform", "lol/clash/v1/tournaments/{tournamentId}", [(10,60)],
+        args=("tournamentId",),
+        doc="""
+        :param int tournamentId: id of the tournament
+        
+        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTournamentById
+        """),
+    
+    Endpoint("get_clash_tournament_by_teamId", "platform", "lol/clash/v1/tournaments/by-team/{teamId}", [(200,60)],
+        args=("teamId",),
+        doc="""
+        :param string teamId: id of the team
+        
+        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTournamentByTeam
+        """),
+    
+    Endpoint("get_clash_team_by_id", "platform", "lol/clash/v1/teams/{teamId}", [(200,60)],
+        args=("teamId",),
+        doc="""
+        :param string teamId: id of the team
+        
+        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTeamById
+        """),
+    
+    Endpoint("get_clash_players_by_summonerId", "platform", "lol/clash/v1/players/by-summoner/{summonerId}", [(200,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: id of the summoner
+        
+        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getPlayersBySummoner
+        """),
+    
+    #TFT
+    Endpoint("get_tft_league_by_id", "platform", "tft/league/v1/leagues/{leagueId}", [(100,10)],
+        args=("leagueId",),
+        doc="""
+        :param string leagueId: id of the league
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueById
+        """),
+    
+    Endpoint("get_tft_league_pages", "platform", "tft/league/v1/entries/{tier}/{division}", [(50,10)],
+        args=("tier", "division", "page"),
+        defaults={"tier":"DIAMOND", "division":"I", "page":1},
+        query={"page":"page"},
+        doc="""
+        :param string tier: tier to get the page of
+        :param string division: division to get the page of
+        :param int page: page to get
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueEntries
+        """),
+    
+    Endpoint("get_tft_league_position", "platform", "tft/league/v1/entries/by-summoner/{summonerId}", [(300,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueEntriesForSummoner
+        """),
+    
+    Endpoint("get_tft_challenger_league", "platform", "tft/league/v1/challenger", [(30,10),(500,600)],
+        doc="""
+        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getChallengerLeague
+        """),
+    
+    Endpoint("get_tft_grandmaster_league", "platform", "tft/league/v1/grandmaster", [(30,10),(500,600)],
+        doc="""
+        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getGrandmasterLeague
+        """),
+    
+    Endpoint("get_tft_master_league", "platform", "tft/league/v1/master", [(30,10),(500,600)],
+        doc="""
+        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getMasterLeague
+        """),
+    
+    Endpoint("get_tft_match", "region", "tft/match/v1/matches/{matchId}", [(200,10)],
+        args=("matchId",),
+        doc="""
+        :param string matchId: matchId of the match, also known as gameId
+        
+        Returns the result of https://developer.riotgames.com/api-methods/#match-v4/GET_getMatch
+        """),
+    
+    Endpoint("get_tft_matchlist", "region", "tft/match/v1/matches/by-puuid/{puuId}/ids", [(400,10)],
+        args=("puuId", "params"),
+        defaults={"params":None},
+        params="params",
+        doc="""
+        :param string puuId: puuId of the player
+        :param object params: all key:value params to add to the request
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-match-v1/GET_getMatchIdsByPUUID
+        """),
+    
+    Endpoint("get_tft_summoner", "platform", "tft/summoner/v1/summoners/{summonerId}", [(2000,60)],
+        args=("summonerId",),
+        doc="""
+        :param string summonerId: summonerId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getBySummonerId
+        """),
+    
+    Endpoint("get_tft_summoner_by_accountId", "platform", "tft/summoner/v1/summoners/by-account/{accountId}", [(2000,60)],
+        args=("accountId",),
+        doc="""
+        :param string accountId: accountId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getByAccountId
+        """),
+    
+    Endpoint("get_tft_summoner_by_puuId", "platform", "tft/summoner/v1/summoners/by-puuid/{puuId}", [(2000,60)],
+        args=("puuId",),
+        doc="""
+        :param string puuId: puuId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getByPUUID
+        """),
+    
+    Endpoint("get_tft_summoner_by_name", "platform", "tft/summoner/v1/summoners/by-name/{summonerName}", [(2000,60)],
+        args=("summonerName",),
+        doc="""
+        :param string summonerName: name of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getBySummonerName
+        """),
+    
+    #Riot (general account endpoints)
+    Endpoint("get_account_by_puuId", "region", "riot/account/v1/accounts/by-puuid/{puuId}", [(1000,60)],
+        args=("puuId",),
+        doc="""
+        :param string puuId: puuId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#account-v1/GET_getByPuuid
+        """),
+    
+    Endpoint("get_account_by_riotId", "region", "riot/account/v1/accounts/by-riot-id/{gameName}/{tagLine}", [(1000,60)],
+        args=("gameName", "tagLine"),
+        doc="""
+        :param string gameName: name of the player
+        :param string tagLine: tag of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#account-v1/GET_getByRiotId
+        """),
+    
+    Endpoint("get_active_shards", "region", "riot/account/v1/active-shards/by-game/{game}/by-puuid/{puuId}", [(20000,10),(1200000,600)],
+        args=("puuId", "game"),
+        doc="""
+        :param string puuId: puuId of the player
+        :param string game: targeted game ("val" or "lor")
+        
+        Returns the result of https://developer.riotgames.com/apis#account-v1/GET_getActiveShard
+        """),
+    
+    #LoR
+    Endpoint("get_lor_leaderboard", "region", "lor/ranked/v1/leaderboards", [(30,10),(500,600)],
+        servers=LOR_SERVERS,
+        doc="""
+        Returns the result of https://developer.riotgames.com/apis#lor-ranked-v1/GET_getLeaderboards
+        """),
+    
+    Endpoint("get_lor_match", "region", "lor/match/v1/matches/{matchId}", [(100,3600)],
+        args=("matchId",),
+        servers=LOR_SERVERS,
+        doc="""
+        :param string matchId: matchId of the match, also known as gameId
+        Returns the result of https://developer.riotgames.com/apis#lor-match-v1/GET_getMatch
+        """),
+    
+    Endpoint("get_lor_matchlist", "region", "lor/match/v1/matches/by-puuid/{puuId}/ids", [(200,3600)],
+        args=("puuId",),
+        servers=LOR_SERVERS,
+        doc="""
+        :param string puuId: puuId of the player
+        Returns the result of https://developer.riotgames.com/apis#lor-match-v1/GET_getMatchIdsByPUUID
+        """),
+    
+    #Valorant
+    Endpoint("get_valorant_content", "region", "val/content/v1/contents", [(60,60)],
+        args=("locale",),
+        defaults={"locale":None},
+        query={"locale":"locale"},
+        doc="""
+        :param string locale: language return. Default to None
+        
+        Returns the result of https://developer.riotgames.com/apis#val-content-v1/GET_getContent
+        """),
+    
+    Endpoint("get_valorant_match", "region", "val/match/v1/matches/{matchId}", [(60,60)],
+        args=("matchId",),
+        doc="""
+        :param string matchId: id of the match
+        
+        Returns the result of https://developer.riotgames.com/apis#val-match-v1/GET_getMatch
+        """),
+    
+    Endpoint("get_valorant_matchlist", "region", "val/match/v1/matchlists/by-puuid/{puuId}", [(120,60)],
+        args=("puuId",),
+        doc="""
+        :param string puuId: puuId of the player
+        
+        Returns the result of https://developer.riotgames.com/apis#val-match-v1/GET_getMatchlist
+        """),
+    
+    Endpoint("get_valorant_recent_matches", "region", "val/match/v1/recent-matches/by-queue/{queue}", [(60,60)],
+        args=("queue",),
+        doc="""
+        :param string queue: queue of the matches
+        
+        Returns the result of https://developer.riotgames.com/apis#val-match-v1/GET_getRecent
+        """),
+    
+    Endpoint("get_valorant_leaderboard", "region", "val/ranked/v1/leaderboards/by-act/{actId}", [(10,10)],
+        args=("actId", "size", "startIndex"),
+        defaults={"size":200, "startIndex":0},
+        query={"size":"size", "startIndex":"startIndex"},
+        doc="""
+        :param string actId: id of the act for the leaderboards
+        :param int size: size of the leaderboard list
+        :param int startIndex: index to start the leaderboard list
+        
+        Returns the result of https://developer.riotgames.com/apis#val-ranked-v1/GET_getLeaderboard
+        """)
+]
+
+ENDPOINTS_BY_NAME = {endpoint.name:endpoint for endpoint in ENDPOINTS}
@@ -3,12 +3,19 @@ import aiohttp
 import ssl
 import certifi
 import json
-from functools import wraps
+import inspect
+import time
+from functools import partial, wraps
 
 from .utils import utils as utils
 from .utils import exceptions as exc
 
 from .RateLimit.RateLimiterManager import RateLimiterManager
+from .RateLimit.KeyPool import KeyPool
+from .Cache.Cache import CachedResponse
+from .Retry.RetryPolicy import RetryPolicy
+from .Views.Views import VIEWS
+from .endpoints import ENDPOINTS, ENDPOINTS_BY_NAME, Request
 
 class Pantheon():
     
@@ -26,189 +33,391 @@ class Pantheon():
     SSL_CONTEXT = ssl.create_default_context(cafile=certifi.where())
     
     
-    def __init__(self, server, api_key, auto_retry = False, requests_logging_function = None, debug=False):
+    def __init__(self, server, api_key, auto_retry = False, requests_logging_function = None, debug=False, connections_per_host=50, keepalive_timeout=60, dns_cache_ttl=300, cache=None, decoder=None, raw=False, views=False, ratelimit_backend=None, metrics=None, circuit_breaker=None, priorities=None, lane_shares=None):
         """
         Initialize an instance of Pantheon class
         
-        :param string server: The server Pantheon will target for the requests. An instance is intended to only call one server. Use multiple instances of Pantheon to call multiples servers.
-        It can take the values described there : https://developer.riotgames.com/regional-endpoints.html (euw1, na1...)
-        :param string api_key: The API key needed to call the Riot API
-        :param boolean auto_retry: Precise if Pantheon should automatically retry after a ratelimit (429) or server error (5XX). Default is False
+        :param string server: The default server Pantheon will target for the requests. Each call can target another one with the platform or region keyword arguments, so one instance can call all the servers.
+        It can take the values described there : https://developer.riotgames.com/regional-endpoints.html (euw1, na1...), or None to always give the server in the calls
+        :param api_key: The API key needed to call the Riot API, or a KeyPool of several keys, each request being sent with the key having the most headroom, see pantheon.RateLimit.KeyPool
+        :param auto_retry: Precise if Pantheon should automatically retry after a ratelimit (429), server error (5XX) or timeout. True uses the default RetryPolicy, a RetryPolicy can be given to tune the backoff and the retry budgets, see pantheon.Retry. Default is False
         :param boolean debug: Allows to print debug messages. Default is False
-        """
-        self._key = api_key
-        self._rl = RateLimiterManager(debug)
-        
-        self.set_server(server)
+        :param int connections_per_host: Maximum number of simultaneous connections opened to a single platform/region host. Default is 50
+        :param int keepalive_timeout: Number of seconds an idle connection is kept open for reuse. Default is 60
+        :param int dns_cache_ttl: Number of seconds a resolved host is kept in the DNS cache. Default is 300
+        :param Cache cache: Cache serving the responses already fetched, see pantheon.Cache (MemoryCache, DiskCache). Default is None, no cache
+        :param function decoder: Function decoding the body (bytes) of the responses. Default is None, using orjson or ujson if installed, json otherwise
+        :param boolean raw: Return the undecoded body (bytes) of the responses instead of the decoded JSON. Default is False
+        :param boolean views: Return the matches of get_match and get_tft_match and the timelines of get_timeline as views decoded on first access, see pantheon.Views. Default is False
+        :param ratelimit_backend: Where the rate limits state is kept, see pantheon.RateLimit.Backends. SQLiteBackend shares it between the processes using the same file. Default is None, in memory
+        :param CircuitBreaker circuit_breaker: Stops sending requests to a server for a while after consecutive server errors, raising CircuitOpen instead, see pantheon.Retry. Default is None, no circuit breaker
+        :param dict priorities: Priority of the requests per endpoint method name, e.g. {"get_current_game":10}. The requests of the highest priorities get their rate limit tokens first. Each call can also be given a priority keyword argument. Default is None, all at priority 0
+        :param dict lane_shares: Guaranteed share of the tokens per priority, so that the low priorities are not starved, e.g. {0:0.2}. It applies to all the instances using the same rate limit backend. Default is None, no guaranteed share
+        :param Metrics metrics: Registry recording the requests, rate limit waits, decoding time, retries and limiters fill, see pantheon.Metrics. Default is None, no metrics
+        """
+        self._pool = api_key if isinstance(api_key, KeyPool) else KeyPool([api_key])
+        self._key = self._pool.keys[0]
+        
+        #Rate limiters of each key
+        self._rls = {key:RateLimiterManager(debug, ratelimit_backend, key) for key in self._pool.keys}
+        self._rl = self._rls[self._key]
+        if not lane_shares is None:
+            for rl in self._rls.values():
+                rl.setShares(lane_shares)
+        self._priorities = priorities if not priorities is None else {}
+        
+        if server is None:
+            self._platform = None
+            self._region = None
+        else:
+            self.set_server(server)
         
-        self._auto_retry = auto_retry
+        if auto_retry is True:
+            auto_retry = RetryPolicy()
+        self._auto_retry = auto_retry if auto_retry else None
+        self._circuit_breaker = circuit_breaker
         self._requests_logging_function = requests_logging_function
         self._debug = debug
         
+        #Connection pool settings, the session itself is created on first request as it needs a running event loop
+        self._connections_per_host = connections_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._session = None
+        self._sessionLoop = None
+        
+        self._cache = cache
+        
+        self._decoder = decoder if not decoder is None else utils.loads
+        self._raw = raw
+        self._views = VIEWS if views else {}
+        
+        #Identical requests currently in flight, shared by their callers
+        self._inFlight = {}
+        
+        #Url of each host, built once
+        self._baseUrls = {}
+        
+        self._metrics = metrics
+        if not metrics is None:
+            self._requestsMetric = metrics.counter("pantheon_requests_total", "Requests sent to the API, by status code", ("endpoint", "server", "status"))
+            self._waitMetric = metrics.histogram("pantheon_ratelimit_wait_seconds", "Time spent waiting for a rate limit token", ("endpoint", "server"))
+            self._wireMetric = metrics.histogram("pantheon_request_seconds", "Time spent on the wire, from sending the request to reading the whole response", ("endpoint", "server"))
+            self._decodeMetric = metrics.histogram("pantheon_decode_seconds", "Time spent decoding the JSON responses", ("endpoint",), buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+            self._retriesMetric = metrics.counter("pantheon_retries_total", "Requests retried by auto_retry, by exception", ("endpoint", "reason"))
+            metrics.gauge("pantheon_ratelimit_used", "Requests counted in the current time window of the limiters", ("server", "limiter", "window")).collectFrom(lambda: self._sumLimiters("used"))
+            metrics.gauge("pantheon_ratelimit_limit", "Limit of the limiters having requests counted in their current time window", ("server", "limiter", "window")).collectFrom(lambda: self._sumLimiters("limits"))
+        
     def __str__(self):
         return str(self._rl.on(self._platform))
     
+    def _sumLimiters(self, values):
+        """
+        Returns the used or limits values of the limiters, summed over the keys of the pool
+        """
+        if len(self._rls) == 1:
+            return getattr(self._rl, values)()
+        total = {}
+        for rl in self._rls.values():
+            for labelValues, value in getattr(rl, values)():
+                total[labelValues] = total.get(labelValues, 0) + value
+        return list(total.items())
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _get_session(self):
+        """
+        Returns the shared session, creating it if needed.
+        All requests go through the same connector so connections, TLS sessions and DNS lookups are reused between calls.
+        A session created by another event loop, as by a previous asyncio.run, is closed and replaced, it cannot be used by this one.
+        """
+        loop = asyncio.get_running_loop()
+        previous = None
+        if self._session is not None and self._sessionLoop is not loop:
+            previous, previousLoop, self._session = self._session, self._sessionLoop, None
+        
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self._connections_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=self._dns_cache_ttl,
+                ssl=self.SSL_CONTEXT
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._sessionLoop = loop
+        session = self._session
+        
+        if not previous is None and not previous.closed:
+            if previousLoop.is_running():
+                #Still used by another thread, closed by its own loop
+                asyncio.run_coroutine_threadsafe(previous.close(), previousLoop)
+            else:
+                await previous.close()
+        return session
+    
+    async def close(self):
+        """
+        Close the shared session and all the pooled connections
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     def set_server(self, server):
         if server in self.PLATFORMS:
             self.set_platform(server)
         elif server in self.REGIONS:
             self.set_region(server)
         else:
-            raise InvalidServer(server, self.PLATFORMS + self.REGIONS)
+            raise exc.InvalidServer(server, self.PLATFORMS + self.REGIONS)
     
     def set_platform(self, platform):
         if platform in self.PLATFORMS:
             self._platform = platform
             self._region = self.PLATFORMS_TO_REGIONS[platform]
         else:
-            raise InvalidServer(platform, self.PLATFORMS)
+            raise exc.InvalidServer(platform, self.PLATFORMS)
             
     def set_region(self, region):
         if region in self.REGIONS:
             self._platform = None
             self._region = region
         else:
-            raise InvalidServer(region, self.REGIONS)
+            raise exc.InvalidServer(region, self.REGIONS)
     
     
     def locked(self, server):
         """
         Return True if at least one limiter is locked
         """
-        return self._rl.on(server).locked()
+        return any(self._rls[key].on(server).locked() for key in self._pool.active())
+    
+    def reserve(self, method, priority=None, platform=None, region=None):
+        """
+        :param string method: name of the endpoint method, as get_match
+        :param int priority: lane of the call. Default is the priority of the endpoint
+        :param string platform: platform of the call. Default is None, the platform of the instance
+        :param string region: region of the call. Default is None, the region of the platform given or of the instance
+        
+        Returns the seconds before a call of the method could be sent, all the application and method limits of its server being evaluated together.
+        0 means it would be sent right away. Nothing is reserved, so a scheduler can route its work to the servers and endpoints having capacity now.
+        """
+        endpoint = ENDPOINTS_BY_NAME[method]
+        if priority is None:
+            priority = self._priorities.get(method, 0)
+        server = self._server(endpoint, platform, region)
+        return min(self._rls[key].on(server).reserve(method, priority) for key in self._pool.active(method))
 
-    def ratelimit_platform(func):
+    def ratelimit(func):
         """
-        Decorator for rate limiting at platform level.
+        Decorator for rate limiting, on the server the request is routed to.
         It will handle the operations needed by the RateLimiterManager to ensure the rate limiting and the change of limits considering the returned header.
+        With a KeyPool, the request is sent with the key having the most headroom, and sent again with another key if it is refused.
         """
         @wraps(func)
         async def waitLimit(*args, **params):
-            rl = args[0]._rl.on(args[0]._platform)
-            token = await rl.getToken(func.__name__)
+            pool = args[0]._pool
+            request = args[1]
+            while True:
+                request.key = pool.choose(lambda key: args[0]._rls[key].on(request.server), request.name, request.priority)
+                response = await waitToken(*args, **params)
+                
+                if response is None or not response.status in (401, 403):
+                    return response
+                
+                #The key is not valid anymore, the other keys of the pool are used instead, unless it is the last one
+                if response.status == 401:
+                    if pool.drop(request.key, str(response.status)) and args[0]._debug:
+                        print("Key {}... dropped from the pool after a 401".format(request.key[:10]))
+                #The key may only be refused by this endpoint, it is kept for the others
+                elif pool.forbid(request.key, request.name) and args[0]._debug:
+                    print("Key {}... not used for {} anymore after a 403".format(request.key[:10], request.name))
+                
+                if request.key in pool.active(request.name):
+                    return response
+        
+        async def waitToken(*args, **params):
+            request = args[1]
+            rl = args[0]._rls[request.key].on(request.server)
+            metrics = args[0]._metrics
             
-            response = await func(*args, **params)
+            if not metrics is None:
+                start = time.perf_counter()
+            token = await rl.getToken(request.name, request.priority)
+            if not metrics is None:
+                sent = time.perf_counter()
+                args[0]._waitMetric.observe((request.name, request.server), sent - start)
             
+            response = None
             try:
-                limits = utils.getLimits(response.headers)
-                timestamp = utils.getTimestamp(response.headers)
-            except:
-                limits = None
-                timestamp = utils.getTimestamp(None)
-            
-            await rl.getBack(func.__name__, token, timestamp, limits)
+                response = await func(*args, **params)
+            finally:
+                #Always give the token back, even if the request was cancelled
+                try:
+                    limits = utils.getLimits(response.headers)
+                    counts = utils.getCounts(response.headers)
+                    timestamp = utils.getTimestamp(response.headers)
+                except:
+                    limits = None
+                    counts = None
+                    timestamp = utils.getTimestamp(None)
+                
+                await rl.getBack(request.name, token, timestamp, limits, counts)
+                
+                #Only the limiters exceeded wait for Retry-After, the other endpoints keep going
+                if not response is None and response.status == 429 and "Retry-After" in response.headers:
+                    rl.block(request.name, response.headers.get("X-Rate-Limit-Type"), float(response.headers["Retry-After"]), counts)
+                
+                if not metrics is None:
+                    args[0]._wireMetric.observe((request.name, request.server), time.perf_counter() - sent)
+                    args[0]._requestsMetric.inc((request.name, request.server, str(response.status) if not response is None else "timeout"))
             
             return response
             
         return waitLimit
-
-    def ratelimit_region(func):
+    
+    def coalesced(func):
         """
-        Decorator for rate limiting at region level.
-        It will handle the operations needed by the RateLimiterManager to ensure the rate limiting and the change of limits considering the returned header.
+        Decorator merging identical requests in flight.
+        Concurrent GET requests to the same url await a single call, and all get the same result object or exception.
+        A call only joins a request sent at its priority or a higher one : a higher priority call does not wait in a lower lane,
+        it sends its own request, joined by the next calls.
+        The call is only cancelled if all its callers are.
         """
         @wraps(func)
-        async def waitLimit(*args, **params):
-            rl = args[0]._rl.on(args[0]._region)
-            token = await rl.getToken(func.__name__)
+        async def _coalesced(*args, **params):
+            request = args[1]
+            if request.method != "GET":
+                return await func(*args, **params)
             
-            response = await func(*args, **params)
+            #Calls in flight per url, by priority
+            inFlight = args[0]._inFlight
+            key = request.url
+            calls = inFlight.setdefault(key, {})
             
-            try:
-                limits = utils.getLimits(response.headers)
-                timestamp = utils.getTimestamp(response.headers)
-            except:
-                limits = None
-                timestamp = utils.getTimestamp(None)
+            def forget(task):
+                if calls.get(request.priority) is entry:
+                    del calls[request.priority]
+                if not calls and inFlight.get(key) is calls:
+                    del inFlight[key]
             
-            await rl.getBack(func.__name__, token, timestamp, limits)
+            priority = max(calls) if calls else None
+            if not priority is None and priority >= request.priority:
+                entry = calls[priority]
+            else:
+                entry = [asyncio.ensure_future(func(*args, **params)), 0]
+                calls[request.priority] = entry
+                entry[0].add_done_callback(forget)
             
-            return response
+            entry[1] += 1
+            try:
+                return await asyncio.shield(entry[0])
+            except asyncio.CancelledError:
+                if entry[1] == 1 and not entry[0].done():
+                    entry[0].cancel()
+                raise
+            finally:
+                entry[1] -= 1
             
-        return waitLimit
-
-    def ratelimit_tournament(func):
+        return _coalesced
+    
+    def cached(func):
         """
-        Decorator for rate limiting for tournaments.
-        It will handle the operations needed by the RateLimiterManager to ensure the rate limiting and the change of limits considering the returned header.
+        Decorator serving the responses from the cache when possible.
+        It is applied before the circuit breaker and the rate limiting decorators so a cache hit does not consume any token, nor need the server.
         """
         @wraps(func)
-        async def waitLimit(*args, **params):
-            rl = args[0]._rl.on(args[0].TOURNAMENT_REGION)
-            token = await rl.getToken(func.__name__)
-            
-            response = await func(*args, **params)
-            
-            try:
-                limits = utils.getLimits(response.headers)
-                timestamp = utils.getTimestamp(response.headers)
-            except:
-                limits = None
-                timestamp = utils.getTimestamp(None)
+        async def _cached(*args, **params):
+            request = args[1]
+            cache = args[0]._cache
+            if cache is None or not cache.cacheable(request.name):
+                return await func(*args, **params)
             
-            await rl.getBack(func.__name__, token, timestamp, limits)
+            body = cache.get(request.name, request.url)
+            if not body is None:
+                return CachedResponse(body)
             
+            response = await func(*args, **params)
+            if not response is None and response.status == 200:
+                cache.set(request.name, request.url, await response.read())
             return response
             
-        return waitLimit
+        return _cached
     
     def auto_retry(func):
         """
-        Decorator for handling some errors and retrying if needed.
+        Decorator retrying the failed requests as decided by the RetryPolicy.
+        The retries go through the rate limiting again, so they consume a token as any request.
         """
         @wraps(func)
         async def _auto_retry(*args, **params):
             """
             Error handling function for decorator
             """
-            if not args[0]._auto_retry:
+            policy = args[0]._auto_retry
+            if policy is None:
                 return await func(*args, **params)
-            else:
+            
+            request = args[1]
+            policy.request(request.name)
+            attempt = 0
+            while True:
                 try:
                     return await func(*args, **params)
-                #Errors that should be retried
-                except exc.RateLimit as e:
-                    if args[0]._debug:
-                        print(e)
-                        print("Retrying")
-                    i = e.waitFor()
-                    while i < 6:
-                        await asyncio.sleep(i)
-                        try:
-                            return await func(*args, **params)
-                        except Exception as e2:
-                            if args[0]._debug:
-                                print(e2)
-                        i += 2
-                    raise e
-                except (exc.ServerError, exc.Timeout) as e:
+                except Exception as e:
+                    delay = policy.delay(request.name, e, attempt)
+                    if delay is None:
+                        raise
                     if args[0]._debug:
                         print(e)
-                        print("Retrying")
-                    i = 1
-                    while i < 6:
-                        await asyncio.sleep(i)
-                        try:
-                            return await func(*args, **params)
-                        except (exc.Timeout, exc.ServerError) as e2:
-                    
-                            pass
-                        i += 2
-                        if args[0]._debug:
-                            print(e2)
-                            print("Retrying")
-                    print("there is no bug")
-                    raise e
-                except (exc.NotFound, exc.BadRequest) as e:
-                    raise e
-                except (exc.Forbidden, exc.Unauthorized,) as e:
-                    print(e)
-                    raise SystemExit(0)
-                except Exception as e:
-                    raise e
+                        print("Retrying in {:.2f} seconds".format(delay))
+                    if not args[0]._metrics is None:
+                        args[0]._retriesMetric.inc((request.name, type(e).__name__))
+                
+                await asyncio.sleep(delay)
+                attempt += 1
                 
         return _auto_retry
     
+    def circuit(func):
+        """
+        Decorator failing fast the requests to a server whose circuit is open, and recording the outcome of the others.
+        It is applied after the cache, so the cached responses are still served while the circuit is open.
+        """
+        @wraps(func)
+        async def _circuit(*args, **params):
+            breaker = args[0]._circuit_breaker
+            if breaker is None:
+                return await func(*args, **params)
+            
+            server = args[1].server
+            breaker.before(server)
+            try:
+                response = await func(*args, **params)
+            except exc.Timeout:
+                breaker.failure(server)
+                raise
+            except Exception:
+                breaker.success(server)
+                raise
+            except BaseException:
+                breaker.cancel(server)
+                raise
+            
+            #Server errors and timeouts, any other answer means the server is up
+            if response is None or response.status in [500,502,503,504,408]:
+                breaker.failure(server)
+            else:
+                breaker.success(server)
+            return response
+            
+        return _circuit
+    
     def exceptions(func):
         """
         Decorator translating status code into exceptions
@@ -222,7 +431,18 @@ class Pantheon():
                 raise exc.Timeout
             
             elif response.status == 200:
-                return json.loads(await response.text())
+                body = await response.read()
+                if args[0]._raw:
+                    return body
+                if args[1].name in args[0]._views:
+                    return args[0]._views[args[1].name](body, decoder=args[0]._decoder)
+                if args[0]._metrics is None:
+                    return args[0]._decoder(body)
+                
+                start = time.perf_counter()
+                data = args[0]._decoder(body)
+                args[0]._decodeMetric.observe((args[1].name,), time.perf_counter() - start)
+                return data
 
             elif response.status == 404:
                 raise exc.NotFound
@@ -250,695 +470,329 @@ class Pantheon():
             
         return _exceptions
         
-    async def fetch(self, url, method="GET", data=None):
+    def _server(self, endpoint, platform=None, region=None):
         """
-        Returns the result of the request of the url given in parameter after attaching the api_key to the header
+        Returns the server the calls of the endpoint are routed to, the platform or region given overriding the ones of the instance
         """
+        if not platform is None and not platform in self.PLATFORMS:
+            raise exc.InvalidServer(platform, self.PLATFORMS)
+        if not region is None and not region in self.REGIONS:
+            raise exc.InvalidServer(region, self.REGIONS)
         
-        async with aiohttp.ClientSession() as session:
-            headers = {
-                "X-Riot-Token": self._key
-            }
-            
-            try:
-                if method=="GET":
-                    response = await session.request("GET", url, headers=headers, ssl=self.SSL_CONTEXT)
-                else:
-                    response = await session.request(method, url, headers=headers, data=json.dumps(data), ssl=self.SSL_CONTEXT)
-            #In case of timeout
-            except Exception as e:
-                print(e)
-                return None
-            
-            #If a logging function is passed, send it url, status code and headers
-            if self._requests_logging_function:
-                self._requests_logging_function(url, response.status, response.headers)
-            
-            #await response.text() needed here in the client session, dunno why
-            await response.text()
-            return response
+        if endpoint.routing == "platform":
+            if platform is None and not region is None:
+                #A region covers several platforms
+                raise exc.InvalidServer(region, self.PLATFORMS)
+            server = platform if not platform is None else self._platform
+            if server is None:
+                raise exc.InvalidServer(server, self.PLATFORMS)
+            return server
+        elif endpoint.routing == "region":
+            if not region is None:
+                return region
+            server = self.PLATFORMS_TO_REGIONS[platform] if not platform is None else self._region
+            if server is None:
+                raise exc.InvalidServer(server, self.REGIONS)
+            return server
+        return self.TOURNAMENT_REGION
     
-    #Champion mastery
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_champion_masteries(self, summonerId):
+    def _request(self, endpoint, args, params, priority=None, platform=None, region=None):
         """
-        :param string summonerId: summonerId of the player
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#champion-mastery-v4/GET_getAllChampionMasteries
+        Returns the Request for a call of the endpoint method with the given arguments
         """
-        return await self.fetch((self.BASE_URL_LOL + "champion-mastery/v4/champion-masteries/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_champion_masteries_by_championId(self, summonerId, championId):
-        """
-            :param string summonerId: summonerId of the player
-            :param int championId: id of the champion
-
-            Returns the result of https://developer.riotgames.com/api-methods/#champion-mastery-v4/GET_getChampionMastery
-        """
-        return await self.fetch((self.BASE_URL_LOL + "champion-mastery/v4/champion-masteries/by-summoner/{summonerId}/by-champion/{championId}").format(server=self._platform, summonerId=summonerId, championId=championId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_champion_masteries_score(self, summonerId):
-        """
-        :param string summonerId: summonerId of the player
+        values = endpoint.bind(args, params)
+        server = self._server(endpoint, platform, region)
         
-        Returns the result of https://developer.riotgames.com/api-methods/#champion-mastery-v4/GET_getChampionMasteryScore
-        """
-        return await self.fetch((self.BASE_URL_LOL + "champion-mastery/v4/scores/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    #Champions
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_champion_rotations(self):
-        """
-        Returns the result of https://developer.riotgames.com/api-methods/#champion-v3/GET_getChampionInfo
-        """
-        return await self.fetch((self.BASE_URL_LOL + "platform/v3/champion-rotations").format(server=self._platform))
-    
-    
-    #League
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_league_by_id(self, leagueId):
-        """
-        :param string leagueId: id of the league
+        #The host may differ from the server used for rate limiting
+        host = endpoint.servers.get(server, server)
+        if not host in self._baseUrls:
+            self._baseUrls[host] = self.BASE_URL.format(server=host)
         
-        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueById
-        """
-        return await self.fetch((self.BASE_URL_LOL + "league/v4/leagues/{leagueId}").format(server=self._platform, leagueId=leagueId))
-    
+        data = endpoint.body(values) if not endpoint.body is None else None
+        if priority is None:
+            priority = self._priorities.get(endpoint.name, 0)
+        return Request(endpoint.name, server, endpoint.url(self._baseUrls[host], values), endpoint.method, data, priority)
     
+    @coalesced
     @auto_retry
     @exceptions
-    @ratelimit_platform
-    async def get_league_pages(self, queue="RANKED_SOLO_5x5", tier="DIAMOND", division="I", page=1):
+    @cached
+    @circuit
+    @ratelimit
+    async def _send(self, request):
         """
-        :param string queue: queue to get the page of
-        :param string tier: tier to get the page of
-        :param string division: division to get the page of
-        :param int page: page to get
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueEntriesForSummoner
+        Sends the request through the whole pipeline : coalescing, retries, circuit breaker, status code handling, cache and rate limiting
         """
-        
-        return await self.fetch((self.BASE_URL_LOL + "league/v4/entries/{queue}/{tier}/{division}?page={page}").format(server=self._platform, queue=queue, tier=tier, division=division, page=page))
-    
+        return await self.fetch(request.url, request.method, request.data, request.key)
     
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_league_position(self, summonerId):
+    async def fetch(self, url, method="GET", data=None, key=None):
         """
-        :param string summonerId: summonerId of the player
+        Returns the result of the request of the url given in parameter after attaching the api_key to the header.
+        Raises Timeout if the request times out or the connection fails
         
-        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueEntriesForSummoner
-        """
-        return await self.fetch((self.BASE_URL_LOL + "league/v4/entries/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_challenger_league(self, queue="RANKED_SOLO_5x5"):
+        :param string key: API key to send the request with. Default is None, the first key
         """
-        :param string queue: queue to get the challenger league of
-            Values accepted : 
-             * RANKED_SOLO_5x5 *(default)*
-             * RANKED_FLEX_SR
-             * RANKED_FLEX_TT
         
-        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getChallengerLeague
-        """
-        return await self.fetch((self.BASE_URL_LOL + "league/v4/challengerleagues/by-queue/{queue}").format(server=self._platform, queue=queue))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_grandmaster_league(self, queue="RANKED_SOLO_5x5"):
-        """
-        :param string queue: queue to get the master league of
-            Values accepted : 
-             * RANKED_SOLO_5x5 *(default)*
-             * RANKED_FLEX_SR
-             * RANKED_FLEX_TT
+        session = await self._get_session()
+        headers = {
+            "X-Riot-Token": key if not key is None else self._key
+        }
         
-        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getGrandmasterLeague
-        """
-        return await self.fetch((self.BASE_URL_LOL + "league/v4/grandmasterleagues/by-queue/{queue}").format(server=self._platform, queue=queue))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_master_league(self, queue="RANKED_SOLO_5x5"):
-        """
-        :param string queue: queue to get the master league of
-            Values accepted : 
-             * RANKED_SOLO_5x5 *(default)*
-             * RANKED_FLEX_SR
-             * RANKED_FLEX_TT
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#league-v4/GET_getMasterLeague
-        """
-        return await self.fetch((self.BASE_URL_LOL + "league/v4/masterleagues/by-queue/{queue}").format(server=self._platform, queue=queue))
-    
-    
-    #Status
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_status(self):
-        """
-        Returns the result of https://developer.riotgames.com/apis#lol-status-v4/GET_getPlatformData
-        """
-        return await self.fetch((self.BASE_URL_LOL + "status/v4/platform-data").format(server=self._platform))
-    
-    
-    #Match
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_match(self, matchId):
-        """
-        :param int matchId: matchId of the match, also known as gameId
-        
-        Returns the result of https://developer.riotgames.com/apis#match-v5/GET_getMatch
-        """
-        return await self.fetch((self.BASE_URL_LOL + "match/v5/matches/{matchId}").format(server=self._region, matchId=matchId))
-        
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_timeline(self, matchId):
-        """
-        :param int matchId: matchId of the match, also known as gameId
-        
-        Returns the result of https://developer.riotgames.com/apis#match-v5/GET_getTimeline
-        """
-        return await self.fetch((self.BASE_URL_LOL + "match/v5/matches/{matchId}/timeline").format(server=self._region, matchId=matchId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_matchlist(self, puuId, params=None):
-        """
-        :param string puuId: puuId of the player
-        :param object params: all key:value params to add to the request
-        
-        Returns the result of https://developer.riotgames.com/apis#match-v5/GET_getMatchIdsByPUUID
-        """
-        return await self.fetch((self.BASE_URL_LOL + "match/v5/matches/by-puuid/{puuId}/ids{params}").format(server=self._region, puuId=puuId, params = utils.urlParams(params)))
-
-    #Spectator
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_current_game(self, summonerId):
-        """
-        :param string summonerId: summonerId of the player
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#spectator-v4/GET_getCurrentGameInfoBySummoner
-        """
-        return await self.fetch((self.BASE_URL_LOL + "spectator/v4/active-games/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_featured_games(self):
-        """
-        Returns the result of https://developer.riotgames.com/api-methods/#spectator-v3/GET_getFeaturedGames
-        """
-        return await self.fetch((self.BASE_URL_LOL + "spectator/v4/featured-games").format(server=self._platform))
-    
-    
-    #Summoner
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_summoner(self, summonerId):
-        """
-        :param string summonerId: summonerId of the player
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#summoner-v4/GET_getBySummonerId
-        """
-        return await self.fetch((self.BASE_URL_LOL + "summoner/v4/summoners/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_summoner_by_accountId(self, accountId):
-        """
-        :param string accountId: accountId of the player
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#summoner-v4/GET_getByAccountId
-        """
-        return await self.fetch((self.BASE_URL_LOL + "summoner/v4/summoners/by-account/{accountId}").format(server=self._platform, accountId=accountId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_summoner_by_name(self, summonerName):
-        """
-        :param string summonerName: name of the player
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#summoner-v4/GET_getBySummonerName
-        """
-        return await self.fetch((self.BASE_URL_LOL + "summoner/v4/summoners/by-name/{summonerName}").format(server=self._platform, summonerName=summonerName))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_summoner_by_puuId(self, puuId):
-        """
-        :param string puuId: puuId of the player
-        
-        Returns the result of https://developer.riotgames.com/apis#summoner-v4/GET_getByPUUID
-        """
-        return await self.fetch((self.BASE_URL_LOL + "summoner/v4/summoners/by-puuid/{puuId}").format(server=self._platform, puuId=puuId))
-    
-    
-    #Third Party Code
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_third_party_code(self, summonerId):
-        """
-        :param string summonerId: summonerId of the player
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#third-party-code-v4/GET_getThirdPartyCodeBySummonerId
-        """
-        return await self.fetch((self.BASE_URL_LOL + "platform/v4/third-party-code/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    #Tournaments
-    @auto_retry
-    @exceptions
-    @ratelimit_tournament
-    async def register_provider(self, region, callback_url, stub=False):
-        """
-        :param str region: region to get a provider for
-        :param str callback_url: url to which a callback will be sent after each match created with a tournament code from this provider
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/POST_registerProviderData
-        """
-        return await self.fetch((self.BASE_URL_LOL+"tournament{stub}/v4/providers").format(server=self.TOURNAMENT_REGION, stub="-stub" if stub else ""), method="POST", data={"region":region, "url":callback_url})
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_tournament
-    async def register_tournament(self, providerId, name, stub=False):
-        """
-        :param int providerId: providerId to create a tournament
-        :param str name: name of the tournament
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/POST_registerTournament
-        """
-        return await self.fetch((self.BASE_URL_LOL+"tournament{stub}/v4/tournaments").format(server=self.TOURNAMENT_REGION, stub="-stub" if stub else ""), method="POST", data={"providerId":providerId, "name":name})
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_tournament
-    async def create_tournament_code(self, tournamentId, data, nb_codes=1, stub=False):
-        """
-        :param int tournamentId: tournamentId for which the code will be created
-        :param int nb_codes: number of codes to generate
-        :param dict data: datafor the code generation, including : 
-            list[str] allowedSummonerIds: list of all summonerId (optional)
-            str mapType: map for the game
-            str pickType: pick type for the game
-            str spectatorType: spectator type for the game
-            int teamSize: max number of player in a team
-            str metadata: additional data to get back with the callback (optional)
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/POST_createTournamentCode
-        """
-        return await self.fetch((self.BASE_URL_LOL+"tournament{stub}/v4/codes?count={nb_codes}&tournamentId={tournamentId}").format(server=self.TOURNAMENT_REGION, stub="-stub" if stub else "", tournamentId=tournamentId, nb_codes=nb_codes), method="POST", data=data)
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_tournament
-    async def get_lobby_events(self, tournamentCode, stub=False):
-        """
-        :param int providerId: providerId to create a tournament
-        :param str name: name of the tournament
-        
-        Returns the result of https://developer.riotgames.com/api-methods/#tournament-stub-v4/GET_getLobbyEventsByCode
-        """
-        return await self.fetch((self.BASE_URL_LOL+"tournament{stub}/v4/lobby-events/by-code/{code}").format(server=self.TOURNAMENT_REGION, stub="-stub" if stub else "", code=tournamentCode))
-    
-    
-    # Clash
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_clash_tournaments(self):
-        """        
-        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTournaments
-        """
-        return await self.fetch((self.BASE_URL_LOL + "clash/v1/tournaments").format(server=self._platform))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_clash_tournament_by_id(self, tournamentId):
-        """
-        :param int tournamentId: id of the tournament
-        
-        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTournamentById
-        """
-        return await self.fetch((self.BASE_URL_LOL + "clash/v1/tournaments/{tournamentId}").format(server=self._platform, tournamentId=tournamentId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_clash_tournament_by_teamId(self, teamId):
-        """
-        :param string teamId: id of the team
-        
-        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTournamentByTeam
-        """
-        return await self.fetch((self.BASE_URL_LOL + "clash/v1/tournaments/by-team/{teamId}").format(server=self._platform, teamId=teamId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_clash_team_by_id(self, teamId):
-        """
-        :param string teamId: id of the team
-        
-        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getTeamById
-        """
-        return await self.fetch((self.BASE_URL_LOL + "clash/v1/teams/{teamId}").format(server=self._platform, teamId=teamId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_clash_players_by_summonerId(self, summonerId):
-        """
-        :param string summonerId: id of the summoner
-        
-        Returns the result of https://developer.riotgames.com/apis#clash-v1/GET_getPlayersBySummoner
-        """
-        return await self.fetch((self.BASE_URL_LOL + "clash/v1/players/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    
-    # TFT
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_league_by_id(self, leagueId):
-        """
-        :param string leagueId: id of the league
-        
-        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueById
-        """
-        return await self.fetch((self.BASE_URL_TFT + "league/v1/leagues/{leagueId}").format(server=self._platform, leagueId=leagueId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_league_pages(self,  tier="DIAMOND", division="I", page=1):
-        """
-        :param string tier: tier to get the page of
-        :param string division: division to get the page of
-        :param int page: page to get
-        
-        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueEntries
-        """
-        return await self.fetch((self.BASE_URL_TFT + "league/v1/entries/{tier}/{division}?page={page}").format(server=self._platform, tier=tier, division=division, page=page))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_league_position(self, summonerId):
-        """
-        :param string summonerId: summonerId of the player
-        
-        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueEntriesForSummoner
-        """
-        return await self.fetch((self.BASE_URL_TFT + "league/v1/entries/by-summoner/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_challenger_league(self):
-        """
-        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getChallengerLeague
-        """
-        return await self.fetch((self.BASE_URL_TFT + "league/v1/challenger").format(server=self._platform))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_grandmaster_league(self):
-        """
-        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getGrandmasterLeague
-        """
-        return await self.fetch((self.BASE_URL_TFT + "league/v1/grandmaster").format(server=self._platform))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_master_league(self):
-        """
-        Returns the result of https://developer.riotgames.com/apis#tft-league-v1/GET_getMasterLeague
-        """
-        return await self.fetch((self.BASE_URL_TFT + "league/v1/master").format(server=self._platform))
-    
+        try:
+            if method=="GET":
+                response = await session.request("GET", url, headers=headers)
+            else:
+                response = await session.request(method, url, headers=headers, data=json.dumps(data))
+            
+            #Read the whole body so the connection is released back to the pool
+            await response.read()
+        #Timeout or connection error, retried by auto_retry as a timeout
+        except Exception as e:
+            raise exc.Timeout from e
+        
+        #If a logging function is passed, send it url, status code and headers
+        if self._requests_logging_function:
+            self._requests_logging_function(url, response.status, response.headers)
+        
+        return response
+    
+    async def get_many(self, method, args, concurrency=10, ordered=False, priority=None, platform=None, region=None):
+        """
+        Calls the same endpoint for many arguments with a bounded number of requests in flight.
+        It is an async generator, to be used with `async for arg, result in panth.get_many(...)`
+        
+        :param string method: name of the endpoint method to call, e.g. "get_match"
+        :param iterable args: arguments of each call, a tuple is unpacked as positional arguments and a dict as keyword arguments. It can be a generator, it is consumed lazily
+        :param int concurrency: maximum number of calls in flight. Default is 10
+        :param boolean ordered: yield the results in the order of args instead of completion order. Default is False
+        :param int priority: priority of the calls in the rate limiters. Default is None, the priority of the endpoint
+        :param string platform: platform of the calls. Default is None, the platform of the instance
+        :param string region: region of the calls. Default is None, the region of the platform given or of the instance
+        
+        Yields (arg, result) tuples, result being the exception raised if the call failed
+        """
+        func = _bind(getattr(self, method), priority=priority, platform=platform, region=region)
+        
+        def call(arg):
+            if isinstance(arg, tuple):
+                return func(*arg)
+            elif isinstance(arg, dict):
+                return func(**arg)
+            return func(arg)
+        
+        iterator = iter(args)
+        exhausted = False
+        
+        #Calls in flight and, when ordered, results waiting for the previous ones
+        pending = {}
+        finished = {}
+        started = 0
+        nextIndex = 0
+        
+        try:
+            while True:
+                #When ordered, never get further than concurrency calls ahead of the next result to yield, so the buffer stays bounded
+                while not exhausted and len(pending) < concurrency and (not ordered or started < nextIndex + concurrency):
+                    try:
+                        arg = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[asyncio.ensure_future(call(arg))] = (started, arg)
+                    started += 1
+                
+                if not pending:
+                    return
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, arg = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+                    
+                    if ordered:
+                        finished[index] = (arg, result)
+                    else:
+                        yield arg, result
+                
+                while nextIndex in finished:
+                    yield finished.pop(nextIndex)
+                    nextIndex += 1
+        finally:
+            #The consumer stopped early, do not leave calls running, and wait for them to be cancelled
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
     
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_tft_match(self, matchId):
+    async def get_many_servers(self, method, args, concurrency=10, priority=None):
         """
-        :param string matchId: matchId of the match, also known as gameId
+        Calls the same endpoint for many arguments on several servers, the servers being called in parallel as each one has its own rate limits.
+        It is an async generator, to be used with `async for server, arg, result in panth.get_many_servers(...)`
         
-        Returns the result of https://developer.riotgames.com/api-methods/#match-v4/GET_getMatch
-        """
-        return await self.fetch((self.BASE_URL_TFT + "match/v1/matches/{matchId}").format(server=self._region, matchId=matchId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_tft_matchlist(self, puuId, params=None):
-        """
-        :param string puuId: puuId of the player
-        :param object params: all key:value params to add to the request
+        :param string method: name of the endpoint method to call, e.g. "get_match"
+        :param dict args: arguments of the calls per platform or region, each one given as in get_many
+        :param int concurrency: maximum number of calls in flight per server. Default is 10
+        :param int priority: priority of the calls in the rate limiters. Default is None, the priority of the endpoint
         
-        Returns the result of https://developer.riotgames.com/apis#tft-match-v1/GET_getMatchIdsByPUUID
+        Yields (server, arg, result) tuples in completion order, result being the exception raised if the call failed
         """
-        return await self.fetch((self.BASE_URL_TFT + "match/v1/matches/by-puuid/{puuId}/ids{params}").format(server=self._region, puuId=puuId, params = utils.urlParams(params)))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_summoner(self, summonerId):
-        """
-        :param string summonerId: summonerId of the player
+        for server in args:
+            if not server in self.PLATFORMS + self.REGIONS:
+                raise exc.InvalidServer(server, self.PLATFORMS + self.REGIONS)
         
-        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getBySummonerId
-        """
-        return await self.fetch((self.BASE_URL_TFT + "summoner/v1/summoners/{summonerId}").format(server=self._platform, summonerId=summonerId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_summoner_by_accountId(self, accountId):
-        """
-        :param string accountId: accountId of the player
+        results = asyncio.Queue(maxsize=concurrency * max(len(args), 1))
         
-        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getByAccountId
-        """
-        return await self.fetch((self.BASE_URL_TFT + "summoner/v1/summoners/by-account/{accountId}").format(server=self._platform, accountId=accountId))
-    
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_summoner_by_puuId(self, puuId):
-        """
-        :param string puuId: puuId of the player
-        
-        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getByPUUID
-        """
-        return await self.fetch((self.BASE_URL_TFT + "summoner/v1/summoners/by-puuid/{puuId}").format(server=self._platform, puuId=puuId))
-    
+        async def callServer(server, serverArgs):
+            servers = {"platform": server} if server in self.PLATFORMS else {"region": server}
+            calls = self.get_many(method, serverArgs, concurrency, priority=priority, **servers)
+            try:
+                async for arg, result in calls:
+                    await results.put((server, arg, result))
+            finally:
+                #Cancelled while waiting for the queue, the calls of the server are cancelled as well
+                await calls.aclose()
+            await results.put(None)
+        
+        tasks = [asyncio.ensure_future(callServer(server, serverArgs)) for server, serverArgs in args.items()]
+        running = len(tasks)
+        try:
+            while running:
+                item = await results.get()
+                if item is None:
+                    running -= 1
+                else:
+                    yield item
+        finally:
+            #The consumer stopped early, do not leave calls running, and wait for them to be cancelled
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
     
-    @auto_retry
-    @exceptions
-    @ratelimit_platform
-    async def get_tft_summoner_by_name(self, summonerName):
+    async def _iter_pages(self, fetchPage, pageSize=None):
         """
-        :param string summonerName: name of the player
+        Walks through paginated results, yielding the items one by one.
+        The next page is fetched while the current one is consumed, only two pages are held at most.
+        It stops on the first empty page or the first page shorter than the page size (or than the previous pages if the size is unknown).
         
-        Returns the result of https://developer.riotgames.com/apis#tft-summoner-v1/GET_getBySummonerName
-        """
-        return await self.fetch((self.BASE_URL_TFT + "summoner/v1/summoners/by-name/{summonerName}").format(server=self._platform, summonerName=summonerName))
-    
-    
-    
-    # Riot (general account endpoints)
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_account_by_puuId(self, puuId):
+        :param function fetchPage: coroutine function returning the page of the given index, starting at 0
+        :param int pageSize: number of items of a full page, if known
         """
-        :param string puuId: puuId of the player
+        index = 0
+        nextPage = asyncio.ensure_future(fetchPage(index))
         
-        Returns the result of https://developer.riotgames.com/apis#account-v1/GET_getByPuuid
-        """
-        return await self.fetch((self.BASE_URL_RIOT + "account/v1/accounts/by-puuid/{puuId}").format(server=self._region, puuId=puuId))
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_account_by_riotId(self, gameName, tagLine):
-        """
-        :param string gameName: name of the player
-        :param string tagLine: tag of the player
-        
-        Returns the result of https://developer.riotgames.com/apis#account-v1/GET_getByRiotId
-        """
-        return await self.fetch((self.BASE_URL_RIOT + "account/v1/accounts/by-riot-id/{gameName}/{tagLine}").format(server=self._region, gameName=gameName, tagLine=tagLine))
+        try:
+            while not nextPage is None:
+                page = await nextPage
+                nextPage = None
+                
+                if not page:
+                    return
+                
+                if pageSize is None or len(page) > pageSize:
+                    pageSize = len(page)
+                
+                #A full page, there may be more
+                if len(page) >= pageSize:
+                    index += 1
+                    nextPage = asyncio.ensure_future(fetchPage(index))
+                
+                for item in page:
+                    yield item
+        finally:
+            if not nextPage is None:
+                nextPage.cancel()
+                await asyncio.gather(nextPage, return_exceptions=True)
     
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_active_shards(self, puuId, game):
+    def iter_matchlist(self, puuId, params=None, count=100, platform=None, region=None):
         """
         :param string puuId: puuId of the player
-        :param string game: targeted game ("val" or "lor")
+        :param object params: all key:value params to add to the request, start is used as the starting index
+        :param int count: number of match ids requested per page. Default is 100, the maximum allowed
+        :param string platform: platform of the player, to call its region. Default is None, the server of the instance
+        :param string region: region to call. Default is None, the server of the instance
         
-        Returns the result of https://developer.riotgames.com/apis#account-v1/GET_getActiveShard
+        Returns an async generator of all the match ids from https://developer.riotgames.com/apis#match-v5/GET_getMatchIdsByPUUID
         """
-        return await self.fetch((self.BASE_URL_RIOT + "account/v1/active-shards/by-game/{game}/by-puuid/{puuId}").format(server=self._region, game=game, puuId=puuId))
+        return self._iter_pages(self._matchlistPages(_bind(self.get_matchlist, platform=platform, region=region), puuId, params, count), count)
     
-    
-    # LoR
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_lor_leaderboard(self):
-        """
-        Returns the result of https://developer.riotgames.com/apis#lor-ranked-v1/GET_getLeaderboards
-        """
-        server = self._region if not self._region == "asia" else "sea"
-        return await self.fetch((self.BASE_URL_LOR + "ranked/v1/leaderboards").format(server=server))
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_lor_match(self, matchId):
-        """
-        :param string matchId: matchId of the match, also known as gameId
-        Returns the result of https://developer.riotgames.com/apis#lor-match-v1/GET_getMatch
-        """
-        server = self._region if not self._region == "asia" else "sea"
-        return await self.fetch((self.BASE_URL_LOR + "match/v1/matches/{matchId}").format(server=server, matchId=matchId))
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_lor_matchlist(self, puuId):
+    def iter_tft_matchlist(self, puuId, params=None, count=100, platform=None, region=None):
         """
         :param string puuId: puuId of the player
-        Returns the result of https://developer.riotgames.com/apis#lor-match-v1/GET_getMatchIdsByPUUID
-        """
-        server = self._region if not self._region == "asia" else "sea"
-        return await self.fetch((self.BASE_URL_LOR + "match/v1/matches/by-puuid/{puuid}/ids").format(server=server, puuid=puuId))
-    
-    
-    # Valorant
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_valorant_content(self, locale=None):
-        """
-        :param string locale: language return. Default to None
+        :param object params: all key:value params to add to the request, start is used as the starting index
+        :param int count: number of match ids requested per page. Default is 100
+        :param string platform: platform of the player, to call its region. Default is None, the server of the instance
+        :param string region: region to call. Default is None, the server of the instance
         
-        Returns the result of https://developer.riotgames.com/apis#val-content-v1/GET_getContent
+        Returns an async generator of all the match ids from https://developer.riotgames.com/apis#tft-match-v1/GET_getMatchIdsByPUUID
         """
-        return await self.fetch((self.BASE_URL_VAL + "content/v1/contents{locale}").format(server=self._region, locale="?locale="+locale if locale is not None else ""))
+        return self._iter_pages(self._matchlistPages(_bind(self.get_tft_matchlist, platform=platform, region=region), puuId, params, count), count)
     
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_valorant_match(self, matchId):
-        """
-        :param string matchId: id of the match
+    def _matchlistPages(self, method, puuId, params, count):
+        params = dict(params) if not params is None else {}
+        start = int(params.get("start", 0))
         
-        Returns the result of https://developer.riotgames.com/apis#val-match-v1/GET_getMatch
-        """
-        return await self.fetch((self.BASE_URL_VAL + "match/v1/matches/{matchId}").format(server=self._region, matchId=matchId))
-    
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_valorant_matchlist(self, puuId):
-        """
-        :param string puuId: puuId of the player
+        def fetchPage(index):
+            pageParams = dict(params, start=start + index * count, count=count)
+            return method(puuId, pageParams)
         
-        Returns the result of https://developer.riotgames.com/apis#val-match-v1/GET_getMatchlist
-        """
-        return await self.fetch((self.BASE_URL_VAL + "match/v1/matchlists/by-puuid/{puuId}").format(server=self._region, puuId=puuId))
+        return fetchPage
     
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_valorant_recent_matches(self, queue):
+    def iter_league_entries(self, queue="RANKED_SOLO_5x5", tier="DIAMOND", division="I", page=1, platform=None):
         """
-        :param string queue: queue of the matches
+        :param string queue: queue to get the entries of
+        :param string tier: tier to get the entries of
+        :param string division: division to get the entries of
+        :param int page: first page to get. Default is 1
+        :param string platform: platform to call. Default is None, the server of the instance
         
-        Returns the result of https://developer.riotgames.com/apis#val-match-v1/GET_getRecent
+        Returns an async generator of all the entries from https://developer.riotgames.com/api-methods/#league-v4/GET_getLeagueEntries
         """
-        return await self.fetch((self.BASE_URL_VAL + "match/v1/recent-matches/by-queue/{queue}").format(server=self._region, queue=queue))
+        getPage = _bind(self.get_league_pages, platform=platform)
+        return self._iter_pages(lambda index: getPage(queue, tier, division, page + index))
     
-    @auto_retry
-    @exceptions
-    @ratelimit_region
-    async def get_valorant_leaderboard(self, actId, size=200, startIndex=0):
+    def iter_tft_league_entries(self, tier="DIAMOND", division="I", page=1, platform=None):
         """
-        :param string actId: id of the act for the leaderboards
-        :param int size: size of the leaderboard list
-        :param int startIndex: index to start the leaderboard list
+        :param string tier: tier to get the entries of
+        :param string division: division to get the entries of
+        :param int page: first page to get. Default is 1
+        :param string platform: platform to call. Default is None, the server of the instance
         
-        Returns the result of https://developer.riotgames.com/apis#val-ranked-v1/GET_getLeaderboard
+        Returns an async generator of all the entries from https://developer.riotgames.com/apis#tft-league-v1/GET_getLeagueEntries
         """
-        return await self.fetch((self.BASE_URL_VAL + "ranked/v1/leaderboards/by-act/{actId}?size={}size&startIndex={startIndex}").format(server=server, size=size, startIndex=startIndex))
+        getPage = _bind(self.get_tft_league_pages, platform=platform)
+        return self._iter_pages(lambda index: getPage(tier, division, page + index))
 
-    
+
+def _bind(func, **keywords):
+    """
+    Returns the function with the keyword arguments given, the ones being None left out
+    """
+    keywords = {name:value for name, value in keywords.items() if not value is None}
+    return partial(func, **keywords) if keywords else func
+
+def _endpointMethod(endpoint):
+    """
+    Returns the method of Pantheon calling the endpoint
+    """
+    #The server keyword arguments, unless the endpoint has an argument of the same name
+    servers = tuple(name for name in ("platform", "region") if not name in endpoint.args)
+    
+    async def method(self, *args, priority=None, **params):
+        if not servers:
+            return await self._send(self._request(endpoint, args, params, priority))
+        return await self._send(self._request(endpoint, args, params, priority, **{name:params.pop(name, None) for name in servers}))
+    
+    method.__name__ = endpoint.name
+    method.__qualname__ = "Pantheon." + endpoint.name
+    method.__doc__ = endpoint.doc
+    method.__signature__ = inspect.Signature(
+        [inspect.Parameter("self", inspect.Parameter.POSITIONAL_OR_KEYWORD)] +
+        [inspect.Parameter(arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, default=endpoint.defaults.get(arg, inspect.Parameter.empty)) for arg in endpoint.args] +
+        [inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, default=None) for name in ("priority",) + servers]
+    )
+    return method
+
+for endpoint in ENDPOINTS:
+    setattr(Pantheon, endpoint.name, _endpointMethod(endpoint))
@@ -0,0 +1,106 @@
+import asyncio
+import inspect
+import threading
+
+from .pantheon import Pantheon
+
+class SyncPantheon():
+    """
+    Synchronous version of Pantheon, for the code not running an event loop, as Django views or batch scripts.
+    The calls run on one event loop in a background thread : all the threads using the instance share its rate limiters and connection pool,
+    and no event loop is created per call. It can be used by many threads at the same time.
+    The methods are the ones of Pantheon, returning the result instead of a coroutine. get_many, get_many_servers and the iter methods return iterators.
+    """
+
+    def __init__(self, *args, **params):
+        """
+        Takes the arguments of Pantheon, or an instance of Pantheon as only argument, see Pantheon
+        """
+        if len(args) == 1 and not params and isinstance(args[0], Pantheon):
+            self.panth = args[0]
+        else:
+            self.panth = Pantheon(*args, **params)
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="pantheon-loop", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __str__(self):
+        return self._call("__str__", (), {})
+
+    def _run(self, coro):
+        """
+        Runs a coroutine on the loop of the instance and returns its result, from any thread
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("SyncPantheon can not be called from its own event loop, use the Pantheon instance in panth instead")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _call(self, name, args, params):
+        """
+        Calls a method of the Pantheon instance on the loop, the coroutines being awaited and the async iterators turned into iterators
+        """
+        async def call():
+            result = getattr(self.panth, name)(*args, **params)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        result = self._run(call())
+        if hasattr(result, "__anext__"):
+            return self._iterate(result)
+        return result
+
+    def _iterate(self, iterator):
+        async def step():
+            return await iterator.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield self._run(step())
+                except StopAsyncIteration:
+                    return
+        finally:
+            #Stopped before the end, the calls in flight are cancelled
+            if not self._loop.is_closed() and hasattr(iterator, "aclose"):
+                self._run(iterator.aclose())
+
+    def close(self):
+        """
+        Closes the connections and stops the event loop thread
+        """
+        if self._loop.is_closed():
+            return
+        try:
+            self._run(self.panth.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+
+
+def _syncMethod(name, func):
+    """
+    Returns the method of SyncPantheon calling the method of Pantheon
+    """
+    def method(self, *args, **params):
+        return self._call(name, args, params)
+
+    method.__name__ = name
+    method.__qualname__ = "SyncPantheon." + name
+    method.__doc__ = func.__doc__
+    method.__signature__ = inspect.signature(func)
+    return method
+
+#All the public methods of Pantheon, the endpoints included, except the one returning an aiohttp response and the decorators
+for name, func in inspect.getmembers(Pantheon, inspect.isfunction):
+    if not name.startswith("_") and not name in ("close", "fetch") and list(inspect.signature(func).parameters)[:1] == ["self"]:
+        setattr(SyncPantheon, name, _syncMethod(name, func))
@@ -8,14 +8,27 @@ class ServerError(Exception):
         Exception.__init__(self,"Server error, try again later")
         
 
+class CircuitOpen(ServerError):
+    def __init__(self, server, retryIn):
+        self.server = server
+        self.retryIn = retryIn
+        Exception.__init__(self,"Server {} is failing, requests are stopped for {:.1f} seconds".format(server, retryIn))
+        
+
 class RateLimit(Exception):
     def __init__(self, headers):
         messageToAdd = ""
         if "Retry-After" in headers:
             self.timeToWait = headers["Retry-After"]
+            self.retryAfter = float(self.timeToWait)
             messageToAdd = ", Retry-After = "+str(self.timeToWait)
         else:
             self.timeToWait = 1
+            self.retryAfter = None
+        #application, method or service
+        self.limitType = headers.get("X-Rate-Limit-Type")
+        if not self.limitType is None:
+            messageToAdd += ", type = "+self.limitType
         Exception.__init__(self,"Rate limit exceeded" + messageToAdd)
         
     def waitFor(self):
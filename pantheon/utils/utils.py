@@ -1,5 +1,24 @@
 
-import time, datetime
+import time, calendar, json, threading
+from collections import deque
+from functools import lru_cache
+
+#Fastest JSON decoder available, all of them accept bytes. The encoders return bytes as well
+try:
+    import orjson
+    loads = orjson.loads
+    dumps = orjson.dumps
+    JSON_DECODER = "orjson"
+except ImportError:
+    try:
+        import ujson
+        loads = ujson.loads
+        dumps = lambda obj: ujson.dumps(obj, ensure_ascii=False).encode()
+        JSON_DECODER = "ujson"
+    except ImportError:
+        loads = json.loads
+        dumps = lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+        JSON_DECODER = "json"
 
 def getLimits(headers):
     if 'X-Method-Rate-Limit' in headers and 'X-App-Rate-Limit' in headers:
@@ -14,32 +33,69 @@ def getLimits(headers):
         return (appLimits,methodLimits)
     return None
 
+def getCounts(headers):
+    """
+    Returns the number of requests counted by the server in the current time window of each limit, per duration, as (application, method)
+    """
+    if 'X-Method-Rate-Limit-Count' in headers and 'X-App-Rate-Limit-Count' in headers:
+        appCounts = {}
+        for appCount in headers['X-App-Rate-Limit-Count'].split(","):
+            appCounts[int(appCount.split(":")[1])] = int(appCount.split(":")[0])
+
+        methodCounts = {}
+        for methodCount in headers['X-Method-Rate-Limit-Count'].split(","):
+            methodCounts[int(methodCount.split(":")[1])] = int(methodCount.split(":")[0])
+
+        return (appCounts,methodCounts)
+    return None
+
+@lru_cache(maxsize=16)
 def dateToTimestamp(date):
-    return int(time.mktime(datetime.datetime.strptime(date, '%a, %d %b %Y %H:%M:%S GMT').timetuple()))
+    #Every response sent during the same second carries the same Date header, only parse it once
+    return calendar.timegm(time.strptime(date, '%a, %d %b %Y %H:%M:%S GMT'))
+
+#Offsets between the server clock and the local monotonic clock observed during the last CLOCK_WINDOW seconds, as (local time, offset),
+#decreasing so the first one is the highest
+CLOCK_WINDOW = 60
+_clockOffsets = deque()
+_clockLock = threading.Lock()
 
 def getTimestamp(headers):
+    """
+    Returns the time of the response on the local monotonic clock, synced with the server Date header.
+    The header has a one second resolution and arrives after some latency, so (server time - local time) is always
+    lower than the real offset, the highest value seen during the last CLOCK_WINDOW seconds is kept as the best estimate.
+    An offset too high, as after a change of the server clock, is forgotten once out of the window.
+    """
+    now = time.monotonic()
     try:
-        timestamp = dateToTimestamp(headers['Date'])
+        serverTime = dateToTimestamp(headers['Date'])
     except Exception as e:
-        timestamp = int(time.time())
-    return timestamp
-
-def urlParams(params):
-    if params is None:
-        return ""
-    else:
-        strParams = "?"
-        for i in params:
-            if type(params[i]) == list:
-                for p in params[i]:
-                    strParams+= i+"="+str(p)+"&"
-            else:
-                strParams+= i+"="+str(params[i])+"&"
-        return strParams[:-1]
+        return now
     
+    observed = serverTime - now
+    with _clockLock:
+        while _clockOffsets and _clockOffsets[-1][1] <= observed:
+            _clockOffsets.pop()
+        _clockOffsets.append((now, observed))
+        while _clockOffsets[0][0] < now - CLOCK_WINDOW:
+            _clockOffsets.popleft()
+        offset = _clockOffsets[0][1]
+    
+    #The request was counted at the latest at the end of the second given by the header
+    return min(now, serverTime + 1 - offset)
+
 class Singleton(type):
+    """
+    One instance per class, or per key if the class defines a _singletonKey classmethod taking the constructor arguments
+    """
     _instances = {}
+    #Two threads creating the same instance at once must get the same one
+    _lock = threading.Lock()
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
\ No newline at end of file
+        key = (cls, cls._singletonKey(*args, **kwargs)) if hasattr(cls, "_singletonKey") else cls
+        if key not in cls._instances:
+            with Singleton._lock:
+                if key not in cls._instances:
+                    cls._instances[key] = super(Singleton, cls).__call__(*args, **kwargs)
+        return cls._instances[key]
\ No newline at end of file
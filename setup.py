@@ -23,4 +23,9 @@ setup(
     "aiohttp",
     "certifi"
   ],
+  extras_require={
+    "fast": ["orjson"],
+    "parquet": ["pyarrow"],
+    "numpy": ["numpy"]
+  },
 )
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+from pantheon import Pantheon
+
+#Rate limits high enough for the tests not to wait
+LIMITS = {"X-App-Rate-Limit": "100000:1", "X-Method-Rate-Limit": "100000:1"}
+
+
+class FakeResponse:
+
+    def __init__(self, status=200, body=b'{"id":"summonerId"}', headers=None):
+        self.status = status
+        self.body = body
+        self.headers = dict(headers) if not headers is None else {}
+
+    async def read(self):
+        return self.body
+
+
+def summoner(url, key):
+    """
+    Default answer of FakePantheon : a summoner, or a 404 for the urls ending with unknown
+    """
+    if url.endswith("unknown"):
+        return FakeResponse(404, b"")
+    return FakeResponse(200, b'{"id":"summonerId"}')
+
+
+class FakePantheon(Pantheon):
+    """
+    Pantheon answering the requests without calling the API, for the offline tests
+    """
+
+    def __init__(self, server="euw1", api_key="RGAPI-TEST", respond=summoner, delay=0, headers=None, **params):
+        """
+        :param function respond: function of (url, key) returning the FakeResponse of a request, or the body of a 200 response
+        :param delay: seconds before answering, or function returning them. Default is 0
+        :param dict headers: headers added to all the responses, as LIMITS. Default is None, no header
+        :param params: other parameters of Pantheon
+        """
+        Pantheon.__init__(self, server, api_key, **params)
+        self.respond = respond
+        self.delay = delay
+        self.headers = headers if not headers is None else {}
+
+        #Urls and keys of the requests sent, and threads they were sent from
+        self.calls = []
+        self.keys = []
+        self.threads = set()
+
+    async def fetch(self, url, method="GET", data=None, key=None):
+        self.calls.append(url)
+        self.keys.append(key)
+        self.threads.add(threading.current_thread().name)
+
+        delay = self.delay() if callable(self.delay) else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+
+        response = self.respond(url, key)
+        if not isinstance(response, FakeResponse):
+            response = FakeResponse(200, response)
+        response.headers = dict(self.headers, **response.headers)
+        return response
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
@@ -0,0 +1,175 @@
+import os
+import tempfile
+
+import pytest
+
+from pantheon.Cache import Cache, MemoryCache, DiskCache, MatchStore
+
+from .fake import FakePantheon, run
+
+
+def test_memory_cache_hit():
+    cache = MemoryCache()
+    assert cache.get("get_match", "EUW1_1") is None
+    cache.set("get_match", "EUW1_1", b'{"metadata":{}}')
+    
+    assert cache.get("get_match", "EUW1_1") == b'{"metadata":{}}'
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_cacheable():
+    cache = MemoryCache(ttl={"get_summoner":0})
+    
+    assert cache.cacheable("get_match")
+    assert not cache.cacheable("get_summoner")
+    assert not cache.cacheable("get_current_game")
+
+
+def test_memory_cache_expired():
+    cache = MemoryCache(ttl={"get_summoner":-1})
+    cache.set("get_summoner", "summonerId", b"{}")
+    
+    assert cache.get("get_summoner", "summonerId") is None
+    assert len(cache) == 0
+
+
+def test_memory_cache_lru():
+    cache = MemoryCache(maxBytes=10)
+    cache.set("get_match", "1", b"1234")
+    cache.set("get_match", "2", b"1234")
+    cache.get("get_match", "1")
+    cache.set("get_match", "3", b"1234")
+    
+    assert cache.get("get_match", "2") is None
+    assert cache.get("get_match", "1") == b"1234"
+    assert cache.size == 8
+
+
+def test_cache_incomplete_backend():
+    class GetOnlyCache(Cache):
+        def _get(self, key, now):
+            return None
+
+    #The missing _set is reported when the cache is created, not at its first write
+    with pytest.raises(TypeError):
+        GetOnlyCache()
+    with pytest.raises(TypeError):
+        Cache()
+
+
+def test_disk_cache_persistent():
+    path = os.path.join(tempfile.mkdtemp(), "cache.db")
+    cache = DiskCache(path)
+    cache.set("get_match", "EUW1_1", b"{}")
+    cache.close()
+    
+    cache = DiskCache(path)
+    assert cache.get("get_match", "EUW1_1") == b"{}"
+    cache.close()
+
+
+def test_match_store_persistent():
+    path = tempfile.mkdtemp()
+    store = MatchStore(path)
+    #Keyed by match id, whatever the server in the url
+    store.set("get_match", "https://europe.api.riotgames.com/lol/match/v5/matches/EUW1_1", b'{"id":1}')
+    store.set("get_timeline", "https://europe.api.riotgames.com/lol/match/v5/matches/EUW1_1/timeline", b'{"frames":[]}')
+    assert store.get("get_match", "EUW1_1") == b'{"id":1}'
+    assert store.get("get_timeline", "EUW1_1") == b'{"frames":[]}'
+    assert store.get("get_match", "EUW1_2") is None
+    store.close()
+
+    store = MatchStore(path)
+    assert len(store) == 2
+    assert ("get_match", "EUW1_1") in store
+    assert store.get("get_match", "https://americas.api.riotgames.com/lol/match/v5/matches/EUW1_1") == b'{"id":1}'
+    assert not store.cacheable("get_summoner")
+    store.close()
+
+
+def test_match_store_segments_and_resize():
+    path = tempfile.mkdtemp()
+    store = MatchStore(path, segmentSize=1000, capacity=4)
+    for i in range(100):
+        store.set("get_tft_match", "NA1_" + str(i), b'{"match":' + str(i).encode() + b', "padding":"' + b"x" * i + b'"}')
+    store.set("get_lor_match", "lor-1", b"{}")
+
+    assert len(store) == 101
+    assert store.stats()["segments"] > 1
+    assert all(store.get("get_tft_match", "NA1_" + str(i)).startswith(b'{"match":' + str(i).encode()) for i in range(100))
+    assert [matchId for method, matchId, body in store.scan("get_tft_match")] == ["NA1_" + str(i) for i in range(100)]
+    assert [(method, matchId) for method, matchId, body in store.scan(["get_lor_match"])] == [("get_lor_match", "lor-1")]
+    store.close()
+
+
+def test_match_store_recovery():
+    path = tempfile.mkdtemp()
+    store = MatchStore(path)
+    store.set("get_match", "EUW1_1", b'{"id":1}')
+    store.close()
+
+    #A record written but never committed, as after a crash
+    with open(os.path.join(path, "segment-00000"), "ab") as f:
+        f.write(b"garbage")
+    store = MatchStore(path)
+    store.set("get_match", "EUW1_2", b'{"id":2}')
+    assert [matchId for method, matchId, body in store.scan()] == ["EUW1_1", "EUW1_2"]
+    store.close()
+
+    #The index is built again from the segments
+    os.remove(os.path.join(path, "index"))
+    store = MatchStore(path)
+    assert store.get("get_match", "EUW1_2") == b'{"id":2}'
+    assert len(store) == 2
+    store.close()
+
+
+def test_match_store_truncated_segment():
+    path = tempfile.mkdtemp()
+    store = MatchStore(path, capacity=64)
+    store.set("get_match", "EUW1_1", b'{"id":1}')
+    store.flush()
+
+    #The index was written but the segment was cut
+    os.truncate(os.path.join(path, "segment-00000"), 5)
+    assert store.get("get_match", "EUW1_1") is None
+    assert not ("get_match", "EUW1_1") in store
+    store.close()
+
+    #Opened again, the index is built from what is left of the segment
+    store = MatchStore(path, capacity=64)
+    assert len(store) == 0
+    store.set("get_match", "EUW1_1", b'{"id":1}')
+    assert store.get("get_match", "EUW1_1") == b'{"id":1}'
+    store.close()
+
+    #A missing segment is a miss as well
+    os.remove(os.path.join(path, "segment-00000"))
+    store = MatchStore(path, capacity=64)
+    assert store.get("get_match", "EUW1_1") is None
+    store.close()
+
+
+def echo(url, key):
+    return b'{"url":"' + url.encode() + b'"}'
+
+
+def test_match_store_pantheon():
+    store = MatchStore(tempfile.mkdtemp(), cache=MemoryCache())
+    panth = FakePantheon(respond=echo, cache=store)
+
+    async def scenario():
+        for i in range(2):
+            await panth.get_match("EUW1_1")
+            await panth.get_match("EUW1_1", platform="na1")
+            await panth.get_summoner("summonerId")
+            await panth.get_current_game("summonerId")
+
+    run(scenario())
+
+    #The match is fetched once, from any region, the summoner from the other cache, the current game not cached
+    assert [url.rsplit("/", 1)[1] for url in panth.calls] == ["EUW1_1", "summonerId", "summonerId", "summonerId"]
+    assert store.stats()["hits"] == 3
+    assert store.stats()["cache"]["hits"] == 1
+    store.close()
@@ -0,0 +1,75 @@
+import asyncio
+
+from pantheon.utils import exceptions as exc
+
+from .fake import FakePantheon, run
+
+
+def test_coalesced_result():
+    panth = FakePantheon(delay=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*[panth.get_summoner("a") for i in range(5)], panth.get_summoner("b"))
+
+    results = run(scenario())
+
+    assert len(panth.calls) == 2
+    assert all(result is results[0] for result in results[:5])
+    assert results[5] == {"id": "summonerId"}
+    assert panth._inFlight == {}
+
+
+def test_coalesced_exception():
+    panth = FakePantheon(delay=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*[panth.get_summoner("unknown") for i in range(3)], return_exceptions=True)
+
+    results = run(scenario())
+
+    assert len(panth.calls) == 1
+    assert all(isinstance(result, exc.NotFound) for result in results)
+
+
+def test_coalesced_sequential():
+    panth = FakePantheon(delay=0.01)
+
+    async def scenario():
+        await panth.get_summoner("a")
+        await panth.get_summoner("a")
+
+    run(scenario())
+    assert len(panth.calls) == 2
+
+
+def test_coalesced_post():
+    panth = FakePantheon(delay=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*[panth.register_tournament(1, "Test", stub=True) for i in range(3)])
+
+    run(scenario())
+    assert len(panth.calls) == 3
+
+
+def test_coalesced_priority():
+    panth = FakePantheon(delay=0.01)
+
+    async def scenario():
+        low = asyncio.ensure_future(panth.get_summoner("a"))
+        await asyncio.sleep(0)
+        #A higher priority call does not wait in the lane of the request in flight, the next calls join it
+        high = asyncio.ensure_future(panth.get_summoner("a", priority=10))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(panth.get_summoner("a", priority=priority)) for priority in (0, 10)]
+        await asyncio.sleep(0)
+        lanes = {url: sorted(calls) for url, calls in panth._inFlight.items()}
+        return lanes, await asyncio.gather(low, high, *others)
+
+    lanes, results = run(scenario())
+
+    assert list(lanes.values()) == [[0, 10]]
+    assert len(panth.calls) == 2
+    assert not results[0] is results[1]
+    assert results[2] is results[1] and results[3] is results[1]
+    assert panth._inFlight == {}
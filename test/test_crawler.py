@@ -0,0 +1,89 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+
+from pantheon.Crawler import Crawler
+from pantheon.utils import exceptions as exc
+
+from .fake import FakePantheon, run
+
+
+class CrawlPantheon(FakePantheon):
+    """
+    Each player played matches 0 to 4 of its own, with the players of the previous and next numbers
+    """
+
+    def __init__(self):
+        FakePantheon.__init__(self)
+        self.calls = []
+
+    async def get_league_pages(self, queue="RANKED_SOLO_5x5", tier="DIAMOND", division="I", page=1):
+        self.calls.append(("league", page))
+        return [{"summonerId": "summoner-" + str(i)} for i in range(2)] if page == 1 else []
+
+    async def get_summoner(self, summonerId):
+        self.calls.append(("summoner", summonerId))
+        return {"puuid": "player-" + summonerId.split("-")[1]}
+
+    async def get_matchlist(self, puuId, params=None):
+        self.calls.append(("matchlist", puuId))
+        player = int(puuId.split("-")[1])
+        return ["EUW1_{}_{}".format(player, i) for i in range(params["start"], min(params["start"] + params["count"], 5))]
+
+    async def get_match(self, matchId):
+        self.calls.append(("match", matchId))
+        await asyncio.sleep(0.001)
+        player, i = [int(value) for value in matchId.split("_")[1:]]
+        if i == 4:
+            raise exc.NotFound
+        return {
+            "metadata": {"matchId": matchId, "participants": ["player-" + str(p) for p in (player - 1, player, player + 1) if p >= 0]},
+            "info": {"queueId": 420 if i < 3 else 440, "gameCreation": 1000 * i}
+        }
+
+
+def read(path):
+    with gzip.open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_crawl():
+    directory = tempfile.mkdtemp()
+    panth = CrawlPantheon()
+    crawler = Crawler(panth, os.path.join(directory, "crawl.db"), os.path.join(directory, "matches.ndjson.gz"), maxDepth=2, queues=[420], concurrency=4)
+    crawler.addLeague()
+    stats = run(crawler.run())
+    crawler.close()
+
+    matches = [match["metadata"]["matchId"] for match in read(os.path.join(directory, "matches.ndjson.gz"))]
+    #Players 0 and 1 from the league, 2 at depth 1 and 3 at depth 2, 3 matches of queue 420 each
+    assert sorted(matches) == sorted("EUW1_{}_{}".format(player, i) for player in range(4) for i in range(3))
+    assert stats["written"] == 12
+    #Nothing fetched twice
+    assert len(panth.calls) == len(set(panth.calls))
+
+
+def test_crawl_resume():
+    directory = tempfile.mkdtemp()
+    paths = (os.path.join(directory, "crawl.db"), os.path.join(directory, "matches.ndjson.gz"))
+
+    crawler = Crawler(CrawlPantheon(), *paths, maxDepth=2, queues=[420], maxMatches=5, concurrency=4)
+    crawler.addPlayers(["player-0"])
+    assert run(crawler.run())["written"] == 5
+    crawler.close()
+
+    #Written after the last checkpoint, dropped when resuming
+    with gzip.open(paths[1], "ab") as f:
+        f.write(b'{"partial":')
+
+    panth = CrawlPantheon()
+    crawler = Crawler(panth, *paths, maxDepth=2, queues=[420], concurrency=4)
+    crawler.addPlayers(["player-0"])
+    assert run(crawler.run())["written"] == 9
+    crawler.close()
+
+    matches = [match["metadata"]["matchId"] for match in read(paths[1])]
+    assert len(matches) == len(set(matches)) == 9
+    assert not ("matchlist", "player-0") in panth.calls
@@ -0,0 +1,48 @@
+import importlib.util
+import sys
+
+from pantheon.utils import utils
+
+from .fake import FakePantheon, run
+
+BODY = b'{"id": "summonerId",\n "name": "\xc3\xa9t\xc3\xa9", "level": 30}'
+
+
+def test_raw():
+    panth = FakePantheon(respond=lambda url, key: BODY, raw=True)
+    assert run(panth.get_summoner("a")) == BODY
+
+
+def test_custom_decoder():
+    bodies = []
+
+    def decoder(body):
+        bodies.append(body)
+        return {"decoded": len(body)}
+
+    panth = FakePantheon(respond=lambda url, key: BODY, decoder=decoder)
+    assert run(panth.get_summoner("a")) == {"decoded": len(BODY)}
+    assert bodies == [BODY]
+
+
+def test_default_decoder():
+    panth = FakePantheon(respond=lambda url, key: BODY)
+    assert run(panth.get_summoner("a")) == {"id": "summonerId", "name": "été", "level": 30}
+    assert utils.loads(utils.dumps({"name": "été"})) == {"name": "été"}
+
+
+def test_stdlib_fallback(monkeypatch):
+    #A copy of the module loaded without orjson and ujson, the one used by Pantheon is left as is
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "ujson", None)
+    spec = importlib.util.spec_from_file_location("pantheon_utils_fallback", utils.__file__)
+    fallback = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fallback)
+
+    assert fallback.JSON_DECODER == "json"
+    data = fallback.loads(BODY)
+    assert data == {"id": "summonerId", "name": "été", "level": 30}
+    assert isinstance(fallback.dumps(data), bytes)
+    assert fallback.loads(fallback.dumps(data)) == data
+    #Same compact encoding as orjson
+    assert fallback.dumps({"a": [1, "é"]}) == '{"a":[1,"é"]}'.encode()
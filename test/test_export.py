@@ -0,0 +1,126 @@
+import gzip
+import json
+import os
+import tempfile
+import time
+
+import pytest
+
+from pantheon.Export import NDJSONWriter, ParquetWriter, Sink, flattenParticipants
+from pantheon.utils import exceptions as exc
+
+from .fake import run
+
+
+class SlowWriter(NDJSONWriter):
+
+    def write(self, record):
+        time.sleep(0.001)
+        NDJSONWriter.write(self, record)
+
+
+def test_sink_backpressure():
+    path = os.path.join(tempfile.mkdtemp(), "matches.ndjson.gz")
+    sink = Sink(SlowWriter(path), maxBuffer=10, batchSize=5)
+    buffered = []
+
+    async def results():
+        produced = 0
+        for i in range(100):
+            if i % 10 == 0:
+                yield ("EUW1_" + str(i), exc.NotFound())
+            else:
+                produced += 1
+                buffered.append(produced - sink.written)
+                yield ("EUW1_" + str(i), {"id": i})
+        #A raw body is written as is, on a single line
+        yield b'{\n  "id": 100\n}'
+
+    async def scenario():
+        async with sink:
+            return await sink.export(results())
+
+    assert run(scenario()) == 91
+    #The producer never got further than the buffer and the batch being written
+    assert max(buffered) <= 10 + 5 + 1
+
+    with gzip.open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["id"] for record in records] == [i for i in range(100) if i % 10 != 0] + [100]
+    assert sink.skipped == 10
+
+
+def test_writer_restore():
+    path = os.path.join(tempfile.mkdtemp(), "matches.ndjson.gz")
+    writer = NDJSONWriter(path)
+    writer.write({"id": 1})
+    position = writer.checkpoint()
+    writer.write({"id": 2})
+    writer.restore(position)
+    writer.write({"id": 3})
+    writer.close()
+
+    with gzip.open(path) as f:
+        assert [json.loads(line)["id"] for line in f] == [1, 3]
+
+
+def test_flatten_participants():
+    match = {
+        "metadata": {"matchId": "EUW1_1"},
+        "info": {"gameDuration": 1800, "queueId": 420, "participants": [
+            {"puuid": "a", "kills": 3, "challenges": {"kda": 2.5, "list": [1]}, "perks": {"styles": []}},
+            {"puuid": "b", "kills": 1, "challenges": {"kda": 1.0}}
+        ]}
+    }
+    rows = flattenParticipants(match)
+    assert rows[0] == {"matchId": "EUW1_1", "gameCreation": None, "gameDuration": 1800, "gameVersion": None, "gameMode": None, "queueId": 420, "mapId": None, "platformId": None, "puuid": "a", "kills": 3, "challenges_kda": 2.5}
+    assert rows[1]["puuid"] == "b"
+
+
+def match(matchId, kills):
+    return {"metadata": {"matchId": matchId}, "info": {"gameDuration": 1800, "queueId": 420, "participants": [
+        {"puuid": matchId + "-a", "kills": kills, "win": True, "challenges": {"kda": 2.5}, "perks": {"styles": []}},
+        {"puuid": matchId + "-b", "kills": kills + 1, "win": False, "challenges": {"kda": 1.0}}
+    ]}}
+
+
+def test_parquet_participants():
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tempfile.mkdtemp()
+    writer = ParquetWriter(path, rowGroupSize=3, flatten=flattenParticipants)
+    writer.write(match("EUW1_1", 3))
+    writer.write(json.dumps(match("EUW1_2", 5)).encode())
+    writer.close()
+
+    rows = parquet.read_table(path).to_pylist()
+    assert [(row["matchId"], row["puuid"], row["kills"], row["win"]) for row in rows] == [
+        ("EUW1_1", "EUW1_1-a", 3, True), ("EUW1_1", "EUW1_1-b", 4, False), ("EUW1_2", "EUW1_2-a", 5, True), ("EUW1_2", "EUW1_2-b", 6, False)
+    ]
+    assert [row["challenges_kda"] for row in rows] == [2.5, 1.0, 2.5, 1.0]
+    assert all(row["queueId"] == 420 and row["gameVersion"] is None for row in rows)
+    assert not "perks" in rows[0]
+
+
+def test_parquet_restore():
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = tempfile.mkdtemp()
+    writer = ParquetWriter(path)
+    writer.write({"id": 1})
+    position = writer.checkpoint()
+    writer.write({"id": 2})
+    writer.checkpoint()
+    writer.write({"id": 3})
+
+    #The files written after the position are deleted, the rows not written yet dropped
+    writer.restore(position)
+    assert sorted(os.listdir(path)) == ["part-00000.parquet"]
+    writer.write({"id": 4})
+    writer.close()
+    assert parquet.read_table(path).column("id").to_pylist() == [1, 4]
+
+    #A new writer adds files after the existing ones
+    writer = ParquetWriter(path)
+    writer.write({"id": 5})
+    writer.close()
+    assert sorted(os.listdir(path)) == ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"]
+    assert parquet.read_table(path).column("id").to_pylist() == [1, 4, 5]
@@ -0,0 +1,133 @@
+import asyncio
+import random
+
+from pantheon.utils import exceptions as exc
+
+from .fake import FakePantheon, run
+
+
+class ManyPantheon(FakePantheon):
+
+    def __init__(self):
+        FakePantheon.__init__(self)
+        self.inFlight = 0
+        self.maxInFlight = 0
+
+    async def get_fake(self, value, fail=False):
+        self.inFlight += 1
+        self.maxInFlight = max(self.maxInFlight, self.inFlight)
+        await asyncio.sleep(random.random() / 100)
+        self.inFlight -= 1
+        if fail or value % 7 == 0:
+            raise exc.NotFound
+        return value * 2
+
+
+def collect(panth, *args, **params):
+    async def scenario():
+        return [item async for item in panth.get_many(*args, **params)]
+
+    return run(scenario())
+
+
+def test_get_many_ordered():
+    panth = ManyPantheon()
+    results = collect(panth, "get_fake", range(1, 50), concurrency=5, ordered=True)
+
+    assert [arg for arg, result in results] == list(range(1, 50))
+    assert panth.maxInFlight <= 5
+    for arg, result in results:
+        if arg % 7 == 0:
+            assert isinstance(result, exc.NotFound)
+        else:
+            assert result == arg * 2
+
+
+def test_get_many_completion_order():
+    panth = ManyPantheon()
+    results = collect(panth, "get_fake", (i for i in range(1, 50)), concurrency=8)
+
+    assert sorted(arg for arg, result in results) == list(range(1, 50))
+    assert panth.maxInFlight <= 8
+
+
+def test_get_many_arguments():
+    panth = ManyPantheon()
+    results = collect(panth, "get_fake", [(1,), (2, True), {"value": 3}])
+
+    assert dict((str(arg), type(result)) for arg, result in results) == {
+        "(1,)": int,
+        "(2, True)": exc.NotFound,
+        "{'value': 3}": int
+    }
+
+
+def servers():
+    """
+    Pantheon not bound to a server, answering every request with a matchlist
+    """
+    return FakePantheon(None, respond=lambda url, key: b'["match"]', delay=lambda: random.random() / 100)
+
+
+def test_call_servers():
+    panth = servers()
+
+    async def scenario():
+        await panth.get_summoner_by_puuId("a", platform="kr")
+        #The region of the platform is called
+        await panth.get_matchlist("a", platform="na1")
+        await panth.get_matchlist("a", region="europe")
+
+        for call, params in ((panth.get_summoner_by_puuId, {}), (panth.get_summoner_by_puuId, {"region": "asia"}), (panth.get_matchlist, {"region": "kr1"})):
+            try:
+                await call("a", **params)
+                assert False
+            except exc.InvalidServer:
+                pass
+
+    run(scenario())
+    assert [url.split(".")[0] for url in panth.calls] == ["https://kr", "https://americas", "https://europe"]
+
+
+def test_get_many_servers():
+    panth = servers()
+
+    async def scenario():
+        return [item async for item in panth.get_many_servers("get_matchlist", {"euw1": ["a", "b"], "asia": ["c"]}, concurrency=2)]
+
+    results = run(scenario())
+
+    assert sorted((server, arg) for server, arg, result in results) == [("asia", "c"), ("euw1", "a"), ("euw1", "b")]
+    assert sorted(url.split(".")[0] for url in panth.calls) == ["https://asia", "https://europe", "https://europe"]
+
+
+def others():
+    return [task for task in asyncio.all_tasks() if not task is asyncio.current_task()]
+
+
+def test_get_many_early_stop():
+    panth = ManyPantheon()
+
+    async def scenario():
+        calls = panth.get_many("get_fake", range(1, 50), concurrency=5)
+        async for arg, result in calls:
+            break
+        await calls.aclose()
+        #The calls still in flight were cancelled and are finished
+        return others()
+
+    assert run(scenario()) == []
+
+
+def test_get_many_servers_early_stop():
+    panth = servers()
+
+    async def scenario():
+        calls = panth.get_many_servers("get_matchlist", {"euw1": list("abcdef"), "asia": list("ghijkl")}, concurrency=2)
+        async for item in calls:
+            break
+        await calls.aclose()
+        return others()
+
+    assert run(scenario()) == []
+    assert len(panth.calls) < 12
@@ -0,0 +1,65 @@
+from .fake import FakePantheon, run
+
+
+class PagesPantheon(FakePantheon):
+
+    def __init__(self, nbMatches, nbEntries):
+        FakePantheon.__init__(self)
+        self.nbMatches = nbMatches
+        self.nbEntries = nbEntries
+        self.requested = []
+
+    async def get_matchlist(self, puuId, params=None):
+        self.requested.append(params["start"])
+        return ["EUW1_" + str(i) for i in range(params["start"], min(params["start"] + params["count"], self.nbMatches))]
+
+    async def get_league_pages(self, queue="RANKED_SOLO_5x5", tier="DIAMOND", division="I", page=1):
+        self.requested.append(page)
+        return [{"summonerId": i} for i in range((page - 1) * 205, min(page * 205, self.nbEntries))]
+
+
+def collect(generator):
+    async def scenario():
+        return [item async for item in generator]
+
+    return run(scenario())
+
+
+def test_iter_matchlist():
+    panth = PagesPantheon(250, 0)
+    matches = collect(panth.iter_matchlist("puuId"))
+
+    assert matches == ["EUW1_" + str(i) for i in range(250)]
+    #Stops on the short page
+    assert panth.requested == [0, 100, 200]
+
+
+def test_iter_matchlist_start():
+    panth = PagesPantheon(200, 0)
+    matches = collect(panth.iter_matchlist("puuId", {"start": 50, "queue": 420}, count=50))
+
+    assert len(matches) == 150
+    #Stops on the empty page
+    assert panth.requested == [50, 100, 150, 200]
+
+
+def test_iter_league_entries():
+    panth = PagesPantheon(0, 500)
+    entries = collect(panth.iter_league_entries())
+
+    assert len(entries) == 500
+    assert panth.requested == [1, 2, 3]
+
+
+def test_iter_league_entries_break():
+    panth = PagesPantheon(0, 5000)
+
+    async def scenario():
+        async for entry in panth.iter_league_entries():
+            if entry["summonerId"] == 300:
+                break
+
+    run(scenario())
+
+    #Only the next page was prefetched
+    assert panth.requested == [1, 2, 3]
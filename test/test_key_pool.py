@@ -0,0 +1,74 @@
+import asyncio
+
+from pantheon.RateLimit.KeyPool import KeyPool
+from pantheon.RateLimit.RateLimiterManager import RateLimiterManager
+from pantheon.utils import exceptions as exc
+
+from .fake import FakePantheon, FakeResponse, run
+
+#Limits of each key of the tests
+HEADERS = {"X-App-Rate-Limit": "20:1,100:120", "X-Method-Rate-Limit": "2000:60"}
+
+
+def pooled(keys, forbidden=(), status=401, endpoint=""):
+    """
+    Pantheon using a pool of the keys, the forbidden ones being refused with the status on the urls containing endpoint
+    """
+    panth = FakePantheon("kr", KeyPool(keys), delay=0.01, headers=HEADERS)
+    panth.forbidden = forbidden
+    panth.respond = lambda url, key: FakeResponse(status, b"") if key in panth.forbidden and endpoint in url else FakeResponse()
+    return panth
+
+
+def test_limiters_per_key():
+    assert RateLimiterManager(False, None, "RGAPI-A") is RateLimiterManager(False, None, "RGAPI-A")
+    assert not RateLimiterManager(False, None, "RGAPI-A") is RateLimiterManager(False, None, "RGAPI-B")
+    assert RateLimiterManager(False, None, "RGAPI-A").on("kr").scope != RateLimiterManager(False, None, "RGAPI-B").on("kr").scope
+
+
+def test_key_pool_spread():
+    panth = pooled(["RGAPI-POOL-1", "RGAPI-POOL-2"])
+
+    async def scenario():
+        return await asyncio.gather(*[panth.get_summoner("summonerId" + str(i)) for i in range(30)])
+
+    assert len(run(scenario())) == 30
+    #Each key has its own budget of 20 per second
+    assert sorted(panth.keys.count(key) for key in ("RGAPI-POOL-1", "RGAPI-POOL-2")) == [15, 15]
+
+
+def test_key_pool_drop():
+    panth = pooled(["RGAPI-DROP-1", "RGAPI-DROP-2"], forbidden=("RGAPI-DROP-1",))
+
+    async def scenario():
+        return await asyncio.gather(*[panth.get_summoner("summonerId" + str(i)) for i in range(5)])
+
+    assert run(scenario()) == [{"id": "summonerId"}] * 5
+    assert panth._pool.active() == ["RGAPI-DROP-2"]
+
+    #The last key is never dropped, its errors are raised
+    panth.forbidden = ("RGAPI-DROP-2",)
+    try:
+        run(panth.get_summoner("summonerId"))
+        assert False
+    except exc.Unauthorized:
+        pass
+    assert panth._pool.active() == ["RGAPI-DROP-2"]
+
+
+def test_key_pool_forbidden_endpoint():
+    panth = pooled(["RGAPI-403-1", "RGAPI-403-2"], forbidden=("RGAPI-403-1",), status=403, endpoint="/league/")
+
+    async def scenario():
+        leagues = await asyncio.gather(*[panth.get_league_pages(page=i) for i in range(1, 4)])
+        summoners = await asyncio.gather(*[panth.get_summoner("summonerId" + str(i)) for i in range(20)])
+        return leagues, summoners
+
+    leagues, summoners = run(scenario())
+
+    assert summoners == [{"id": "summonerId"}] * 20
+    #The key refused by one endpoint is kept for the others
+    assert panth._pool.active() == ["RGAPI-403-1", "RGAPI-403-2"]
+    assert panth._pool.active("get_league_pages") == ["RGAPI-403-2"]
+    assert "RGAPI-403-1" in panth.keys[-20:]
+    assert not panth._pool.dropped
@@ -0,0 +1,50 @@
+from pantheon.Metrics import Metrics
+from pantheon.utils import exceptions as exc
+
+from .fake import FakePantheon, run
+
+#Limits of the key of the tests
+HEADERS = {"X-App-Rate-Limit": "20:1,100:120", "X-Method-Rate-Limit": "2000:60"}
+
+
+def test_registry():
+    metrics = Metrics()
+    counter = metrics.counter("requests_total", "Requests", ("endpoint",))
+    counter.inc(("get_match",))
+    counter.inc(("get_match",), 2)
+    assert metrics.counter("requests_total", "Requests", ("endpoint",)) is counter
+
+    histogram = metrics.histogram("wait_seconds", "Wait", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe((), value)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["requests_total"]["values"] == {("get_match",): 3}
+    assert snapshot["wait_seconds"]["values"][()] == {"buckets": {0.1: 1, 1: 2, float("inf"): 3}, "sum": 5.55, "count": 3}
+
+    text = metrics.prometheus()
+    assert 'requests_total{endpoint="get_match"} 3' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 3' in text
+    assert "# TYPE wait_seconds histogram" in text
+
+
+def test_pantheon_metrics():
+    metrics = Metrics()
+    panth = FakePantheon("jp1", headers=HEADERS, metrics=metrics)
+
+    async def scenario():
+        await panth.get_summoner("a")
+        await panth.get_summoner("b")
+        try:
+            await panth.get_summoner("unknown")
+        except exc.NotFound:
+            pass
+
+    run(scenario())
+
+    snapshot = metrics.snapshot()
+    assert snapshot["pantheon_requests_total"]["values"] == {("get_summoner", "jp1", "200"): 2, ("get_summoner", "jp1", "404"): 1}
+    assert snapshot["pantheon_ratelimit_wait_seconds"]["values"][("get_summoner", "jp1")]["count"] == 3
+    assert snapshot["pantheon_decode_seconds"]["values"][("get_summoner",)]["count"] == 2
+    assert snapshot["pantheon_ratelimit_used"]["values"][("jp1", "get_summoner", "60")] == 3
+    assert 'pantheon_ratelimit_limit{server="jp1",limiter="App",window="120"} 100' in metrics.prometheus()
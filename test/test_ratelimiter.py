@@ -0,0 +1,298 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+from pantheon.RateLimit.RateLimiter import RateLimiter
+from pantheon.utils import utils
+
+from .fake import run
+
+
+def test_token_immediate():
+    async def scenario():
+        rl = RateLimiter(False, (5, 1), "test")
+        return [await rl.getToken() for i in range(5)]
+
+    start = time.time()
+    tokens = run(scenario())
+    assert time.time() - start < 0.5
+    assert len(tokens) == 5
+
+
+def test_token_fifo():
+    async def scenario():
+        rl = RateLimiter(False, (3, 1), "test")
+        order = []
+
+        async def request(i):
+            num = await rl.getToken()
+            order.append(i)
+            await rl.getBack(num, rl._now())
+
+        await asyncio.gather(*[request(i) for i in range(9)])
+        return order
+
+    assert run(scenario()) == list(range(9))
+
+
+def test_token_full_rate():
+    async def scenario():
+        rl = RateLimiter(False, (20, 1), "test")
+
+        async def request():
+            num = await rl.getToken()
+            await rl.getBack(num, rl._now())
+
+        start = time.monotonic()
+        await asyncio.gather(*[request() for i in range(60)])
+        return time.monotonic() - start
+
+    #Three windows of one second, the last one opening after two seconds
+    assert 1.9 < run(scenario()) < 2.5
+
+
+def test_token_wakes_on_get_back():
+    async def scenario():
+        rl = RateLimiter(False, (1, 100), "test")
+        first = await rl.getToken()
+
+        #Window is over but the request may still be counted in the next one
+        rl.time -= 200
+        waiting = asyncio.ensure_future(rl.getToken())
+        await asyncio.sleep(0)
+        assert rl.locked()
+
+        #The request was counted in the previous window
+        await rl.getBack(first, rl.time + 1)
+        return await asyncio.wait_for(waiting, 1)
+
+    assert run(scenario()) == 2
+
+
+def test_token_cancelled():
+    async def scenario():
+        rl = RateLimiter(False, (1, 100), "test")
+        await rl.getToken()
+
+        waiting = asyncio.ensure_future(rl.getToken())
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.sleep(0)
+
+        return rl.locked()
+
+    assert not run(scenario())
+
+
+def test_token_server_count():
+    async def scenario():
+        rl = RateLimiter(False, (10, 100), "test")
+        num = await rl.getToken()
+        await rl.getToken()
+
+        #Another client used the same key, the server counted 8 requests
+        await rl.getBack(num, rl._now(), count=8)
+        assert rl.count == 8
+
+        #An older response is ignored
+        await rl.getBack(num, rl._now(), count=5)
+        return rl.count
+
+    assert run(scenario()) == 8
+
+
+def test_token_blocked():
+    async def scenario():
+        rl = RateLimiter(False, (100, 100), "test")
+        await rl.getToken()
+        rl.block(0.2)
+
+        start = time.monotonic()
+        await rl.getToken()
+        return time.monotonic() - start
+
+    assert 0.2 <= run(scenario()) < 0.5
+
+
+def test_block_exceeded_only():
+    from pantheon.RateLimit.RateLimiterManager import RateLimiterServer
+
+    rl = RateLimiterServer(False, "euw1")
+    rl.block("get_match", "method", 10, ({1: 5, 120: 5}, {10: 250}))
+    assert [limiter.blockedUntil > 0 for limiter in rl.application] == [False, False]
+    assert all(limiter.blockedUntil > 0 for limiter in rl.methods["get_match"])
+    assert all(limiter.blockedUntil < 0 for limiter in rl.methods["get_summoner"])
+
+    rl.block("get_summoner", "service", 10)
+    assert all(limiter.blockedUntil < 0 for limiter in rl.methods["get_summoner"])
+
+
+def test_token_priority():
+    async def scenario():
+        rl = RateLimiter(False, (1, 100), "test")
+        #The only token of the window is taken, the next requests wait
+        await rl.getToken()
+        order = []
+
+        async def request(name, priority):
+            await rl.getToken(priority)
+            order.append(name)
+
+        tasks = [asyncio.ensure_future(request(name, priority)) for name, priority in (("background", 0), ("overlay", 10), ("background2", 0))]
+        await asyncio.sleep(0)
+
+        #Hand out the next tokens one by one
+        for i in range(3):
+            #Window over and previous requests back
+            rl.time -= 200
+            rl.previouslyPending = rl.currentlyPending = 0
+            rl._dispatch()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order
+
+    assert run(scenario()) == ["overlay", "background", "background2"]
+
+
+def test_token_lane_share():
+    async def scenario():
+        rl = RateLimiter(False, (1, 100), "test")
+        rl.shares = {0: 0.25}
+        await rl.getToken()
+        order = []
+
+        async def request(priority):
+            await rl.getToken(priority)
+            order.append(priority)
+
+        tasks = [asyncio.ensure_future(request(priority)) for priority in [0] * 4 + [10] * 12]
+        await asyncio.sleep(0)
+
+        for i in range(16):
+            #Window over and previous requests back
+            rl.time -= 200
+            rl.previouslyPending = rl.currentlyPending = 0
+            rl._dispatch()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return order[:8]
+
+    #The background lane gets one token out of four while the overlay lane is waiting
+    assert run(scenario()).count(0) == 2
+
+
+def test_reserve_eta():
+    from pantheon.RateLimit.RateLimiterManager import RateLimiterServer
+
+    async def scenario():
+        rl = RateLimiterServer(False, "euw1")
+        rl.updateMethodsLimit("get_match", 10, 2)
+        assert rl.reserve("get_match") == 0
+
+        tokens = [rl.tryAcquire("get_match"), await rl.getToken("get_match")]
+        assert not None in tokens
+
+        #The method limit is full for the rest of its window, the application limits are not
+        assert rl.tryAcquire("get_match") is None
+        assert 9 < rl.reserve("get_match") <= 10
+        assert rl.reserve("get_summoner") == 0
+        return [limiter.count for limiter in rl.application]
+
+    assert run(scenario()) == [2, 2]
+
+
+def test_token_no_app_token_while_waiting():
+    from pantheon.RateLimit.RateLimiterManager import RateLimiterServer
+
+    async def scenario():
+        rl = RateLimiterServer(False, "euw1")
+        rl.updateMethodsLimit("get_match", 10, 1)
+        await rl.getToken("get_match")
+
+        #Waiting on the method limiter does not take a token of the application limiters
+        waiting = asyncio.ensure_future(rl.getToken("get_match"))
+        await asyncio.sleep(0.01)
+        counts = [limiter.count for limiter in rl.application]
+
+        waiting.cancel()
+        await asyncio.sleep(0)
+        return counts, [limiter.count for limiter in rl.application]
+
+    assert run(scenario()) == ([1, 1], [1, 1])
+
+
+def test_token_several_loops():
+    rl = RateLimiter(False, (40, 1), "test")
+
+    async def scenario():
+        async def request():
+            num = await rl.getToken()
+            await asyncio.sleep(0.01)
+            await rl.getBack(num, rl._now())
+
+        await asyncio.gather(*[request() for i in range(20)])
+
+    #Each thread runs its own event loop, sharing the limiter
+    threads = [threading.Thread(target=run, args=(scenario(),), daemon=True) for i in range(4)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    #Two windows of one second
+    assert 0.9 < time.monotonic() - start < 1.6
+    assert not any(thread.is_alive() for thread in threads)
+    assert (rl.currentlyPending, rl.previouslyPending, rl.locked()) == (0, 0, False)
+
+
+def test_token_cancelled_other_loop():
+    rl = RateLimiter(False, (1, 100), "test")
+    num = run(rl.getToken())
+
+    #A request of another thread stops waiting for its token
+    async def waiting():
+        try:
+            await asyncio.wait_for(rl.getToken(), 0.05)
+        except asyncio.TimeoutError:
+            return "timeout"
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(run(waiting())), daemon=True)
+    thread.start()
+    thread.join(5)
+    assert result == ["timeout"]
+
+    rl.release(num)
+    assert rl.tryToken() == 1
+    assert (rl.count, rl.currentlyPending, rl.previouslyPending) == (1, 1, 0)
+
+
+def test_timestamp_offset_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(utils.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(utils, "_clockOffsets", deque())
+    date = lambda serverTime: {"Date": time.strftime('%a, %d %b %Y %H:%M:%S GMT', time.gmtime(serverTime))}
+
+    offsets = lambda: [round(offset, 6) for t, offset in utils._clockOffsets]
+
+    #Server clock 1000.5s ahead : the response received at 1000.9 is dated 2001, the offset is seen as 1000.1
+    now[0] = 1000.9
+    assert utils.getTimestamp(date(2001)) == 1000.9
+    #Received at 1001.6 and dated 2002, the highest offset 1000.4 is the best estimate
+    now[0] = 1001.6
+    utils.getTimestamp(date(2002))
+    now[0] = 1001.7
+    utils.getTimestamp(date(2002))
+    assert offsets() == [1000.4, 1000.3]
+    #A response dated 2002 was counted at the latest at 1002.6 on the local clock
+    now[0] = 1003
+    assert round(utils.getTimestamp(date(2002)), 6) == 1002.6
+
+    #The server clock goes 10s back, the old estimate is kept until it is out of the window
+    now[0] = 1010
+    assert round(utils.getTimestamp(date(2000)), 6) == 1000.6
+    now[0] = 1004 + utils.CLOCK_WINDOW
+    assert utils.getTimestamp(date(1994 + utils.CLOCK_WINDOW)) == now[0]
+    assert offsets() == [990]
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from pantheon.Cache import MemoryCache
+from pantheon.Retry import RetryPolicy, CircuitBreaker
+from pantheon.utils import exceptions as exc
+
+from .fake import FakePantheon, FakeResponse, run
+
+
+def sequence(responses, **params):
+    """
+    Pantheon answering with the given responses in order, then with 200
+    """
+    responses = list(responses)
+    return FakePantheon("oc1", respond=lambda url, key: responses.pop(0) if responses else FakeResponse(), **params)
+
+
+def fast(**params):
+    return RetryPolicy(base=0.001, cap=0.01, **params)
+
+
+def test_retry_server_error():
+    panth = sequence([FakeResponse(503), FakeResponse(500)], auto_retry=fast())
+    assert run(panth.get_summoner("a")) == {"id": "summonerId"}
+    assert len(panth.calls) == 3
+
+
+def test_retry_exhausted():
+    panth = sequence([FakeResponse(503)] * 10, auto_retry=fast(maxRetries=2))
+    with pytest.raises(exc.ServerError):
+        run(panth.get_summoner("a"))
+    assert len(panth.calls) == 3
+
+
+def test_no_retry_on_unauthorized():
+    panth = sequence([FakeResponse(401)], auto_retry=True)
+    with pytest.raises(exc.Unauthorized):
+        run(panth.get_summoner("a"))
+    assert len(panth.calls) == 1
+
+
+def test_retry_after_honored():
+    policy = RetryPolicy()
+    assert policy.delay("get_match", exc.RateLimit({"Retry-After": "7"}), 0) == 7
+    assert 0 <= policy.delay("get_match", exc.RateLimit({}), 2) <= 4
+    assert policy.delay("get_match", exc.NotFound(), 0) is None
+
+
+def test_backoff_capped():
+    policy = RetryPolicy(base=1, cap=5, jitter=False)
+    assert [policy.backoff(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+
+def test_retry_budget():
+    policy = RetryPolicy(budget=0.5, budgetMinimum=1)
+    for i in range(4):
+        policy.request("get_match")
+    delays = [policy.delay("get_match", exc.ServerError(), 0) for i in range(5)]
+    assert sum(delay is not None for delay in delays) == 3
+    assert not policy.delay("get_summoner", exc.ServerError(), 0) is None
+
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(threshold=2, timeout=0.05)
+    panth = sequence([FakeResponse(503)] * 2, circuit_breaker=breaker)
+
+    async def scenario():
+        for i in range(2):
+            with pytest.raises(exc.ServerError):
+                await panth.get_summoner("a")
+
+        #Fails fast without sending the request
+        with pytest.raises(exc.CircuitOpen):
+            await panth.get_summoner("a")
+        assert len(panth.calls) == 2
+
+        #The trial request succeeds and closes the circuit
+        await asyncio.sleep(0.06)
+        await panth.get_summoner("a")
+        assert not breaker.isOpen("oc1")
+
+    run(scenario())
+
+
+def test_circuit_open_cache_hit():
+    breaker = CircuitBreaker(threshold=1, timeout=60)
+    panth = sequence([FakeResponse(), FakeResponse(503)], circuit_breaker=breaker, cache=MemoryCache())
+
+    async def scenario():
+        await panth.get_match("OC1_1")
+        with pytest.raises(exc.ServerError):
+            await panth.get_match("OC1_2")
+
+        #The cached match is served without the server, the others fail fast
+        assert await panth.get_match("OC1_1") == {"id": "summonerId"}
+        with pytest.raises(exc.CircuitOpen):
+            await panth.get_match("OC1_3")
+
+    run(scenario())
+    assert len(panth.calls) == 2
@@ -0,0 +1,131 @@
+import asyncio
+import socket
+import threading
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from pantheon import Pantheon
+from pantheon.utils import exceptions as exc
+
+from .fake import LIMITS, run
+
+
+async def handler(request):
+    return web.Response(body=b'{"id":"summonerId"}', headers=LIMITS)
+
+
+async def local(scenario):
+    """
+    Runs the scenario with a Pantheon class calling a local server answering every request with a summoner
+    """
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    class LocalPantheon(Pantheon):
+        BASE_URL = "http://127.0.0.1:{}/{{server}}/".format(port)
+
+    try:
+        return await scenario(LocalPantheon)
+    finally:
+        await runner.cleanup()
+
+
+def test_session_reused():
+    async def scenario(cls):
+        panth = cls("euw1", "RGAPI-SESSION")
+        await panth.get_summoner("a")
+        session = panth._session
+        for i in range(3):
+            assert await panth.get_summoner(str(i)) == {"id": "summonerId"}
+        assert panth._session is session
+        assert isinstance(session, aiohttp.ClientSession)
+        await panth.close()
+        return session
+
+    assert run(local(scenario)).closed
+
+
+def test_session_context_manager():
+    async def scenario(cls):
+        async with cls("euw1", "RGAPI-SESSION") as panth:
+            await panth.get_summoner("a")
+            session = panth._session
+        assert session.closed
+        assert panth._session is None
+
+        #A call after close opens a new session
+        assert await panth.get_summoner("b") == {"id": "summonerId"}
+        assert not panth._session is session
+        assert not panth._session.closed
+        await panth.close()
+
+    run(local(scenario))
+
+
+def test_session_several_loops():
+    #A local server running on its own thread, outliving the event loops of the calls
+    started = threading.Event()
+    server = {}
+
+    def serve():
+        loop = server["loop"] = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        loop.run_until_complete(site.start())
+        server["port"] = site._server.sockets[0].getsockname()[1]
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    started.wait(5)
+
+    class LocalPantheon(Pantheon):
+        BASE_URL = "http://127.0.0.1:{}/{{server}}/".format(server["port"])
+
+    panth = LocalPantheon("euw1", "RGAPI-SESSION")
+
+    async def call():
+        return await panth.get_summoner("a"), panth._session
+
+    try:
+        #The session of the first event loop is replaced by the second one
+        first, firstSession = asyncio.run(call())
+        second, secondSession = asyncio.run(call())
+        assert first == second == {"id": "summonerId"}
+        assert not firstSession is secondSession
+        assert firstSession.closed
+        asyncio.run(panth.close())
+    finally:
+        server["loop"].call_soon_threadsafe(server["loop"].stop)
+        thread.join(5)
+
+
+def test_connection_error():
+    #A port nobody listens on
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    class ClosedPantheon(Pantheon):
+        BASE_URL = "http://127.0.0.1:{}/{{server}}/".format(port)
+
+    async def scenario():
+        async with ClosedPantheon("euw1", "RGAPI-SESSION") as panth:
+            await panth.get_summoner("a")
+
+    with pytest.raises(exc.Timeout) as error:
+        run(scenario())
+    assert isinstance(error.value.__cause__, aiohttp.ClientError)
@@ -0,0 +1,85 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from pantheon.RateLimit.Backends import SQLiteBackend
+
+from .fake import run
+
+
+def test_shared_count():
+    path = os.path.join(tempfile.mkdtemp(), "limits.db")
+    first = SQLiteBackend(path).limiter(False, (3, 100), "App", "euw1")
+    second = SQLiteBackend(path).limiter(False, (3, 100), "App", "euw1")
+
+    async def scenario():
+        await first.getToken()
+        await first.getToken()
+        await second.getToken()
+
+        #The budget is spent by the other connection
+        waiting = asyncio.ensure_future(second.getToken())
+        await asyncio.sleep(0.1)
+        done = waiting.done()
+        waiting.cancel()
+        return done
+
+    assert not run(scenario())
+    assert first._tryTake() is None
+
+
+def test_shared_limits_refresh():
+    path = os.path.join(tempfile.mkdtemp(), "limits.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    limiters = [second.limiter(False, (20, 1), "App", "euw1"), second.limiter(False, (100, 120), "App", "euw1")]
+
+    #Limits learnt by the other process from the headers
+    first.limiter(False, (20, 1), "App", "euw1").delete()
+    first.limiter(False, (300, 10), "App", "euw1", True)
+
+    refreshed = second.refresh("euw1", "App", limiters, lambda limits, name: second.limiter(False, limits, name, "euw1"))
+    assert sorted((limiter.getLimit(), limiter.getDuration()) for limiter in refreshed) == [(100, 120), (300, 10)]
+    assert limiters[1] in refreshed
+
+
+def takeAndDie(path):
+    #A worker killed with its requests in flight, never getting them back
+    limiter = SQLiteBackend(path).limiter(False, (3, 1), "App", "euw1")
+    for i in range(3):
+        limiter.tryToken()
+    os._exit(0)
+
+
+def test_shared_pending_dead_process():
+    path = os.path.join(tempfile.mkdtemp(), "limits.db")
+    limiter = SQLiteBackend(path).limiter(False, (3, 1), "App", "euw1")
+
+    worker = multiprocessing.get_context("fork").Process(target=takeAndDie, args=(path,))
+    worker.start()
+    worker.join()
+    assert limiter.tryToken() is None
+
+    #Once the window is over, the tokens of the dead worker are not pending anymore
+    time.sleep(1.1)
+    assert not limiter.tryToken() is None
+    assert (limiter.currentlyPending, limiter.previouslyPending) == (1, 0)
+
+
+def test_shared_pending_lease():
+    path = os.path.join(tempfile.mkdtemp(), "limits.db")
+    limiter = SQLiteBackend(path, requestTimeout=0.2).limiter(False, (3, 1), "App", "euw1")
+    nums = [limiter.tryToken() for i in range(3)]
+
+    #The lease is over, the requests are not counted as pending anymore
+    time.sleep(1.3)
+    num = limiter.tryToken()
+    assert not num is None
+    assert (limiter.currentlyPending, limiter.previouslyPending) == (1, 0)
+
+    #A request coming back after its lease does not uncount the others
+    run(limiter.getBack(nums[0], time.monotonic()))
+    assert (limiter.currentlyPending, limiter.previouslyPending) == (1, 0)
+    run(limiter.getBack(num, time.monotonic()))
+    assert (limiter.currentlyPending, limiter.previouslyPending) == (0, 0)
@@ -0,0 +1,74 @@
+import os
+import tempfile
+import threading
+
+import pytest
+
+from pantheon import SyncPantheon
+from pantheon.Cache import DiskCache
+from pantheon.utils import exceptions as exc
+
+from .fake import LIMITS, FakePantheon, FakeResponse
+
+
+def summoners():
+    """
+    Pantheon of its own key, answering with the summoner of the id asked
+    """
+    def respond(url, key):
+        if url.endswith("unknown"):
+            return FakeResponse(404, b"")
+        return b'{"id":"' + url.rsplit("/", 1)[1].encode() + b'"}'
+
+    return FakePantheon(api_key="RGAPI-SYNC", respond=respond, delay=0.001, headers=LIMITS)
+
+
+def test_sync_threads():
+    panth = summoners()
+    results = {}
+
+    def work(thread):
+        results[thread] = [sync.get_summoner("{}-{}".format(thread, i))["id"] for i in range(20)]
+
+    with SyncPantheon(panth) as sync:
+        threads = [threading.Thread(target=work, args=(thread,)) for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        with pytest.raises(exc.NotFound):
+            sync.get_summoner("unknown")
+        assert sync.reserve("get_summoner") == 0
+
+    assert results == {thread: ["{}-{}".format(thread, i) for i in range(20)] for thread in range(8)}
+    #All the calls ran on the loop of the instance
+    assert panth.threads == {"pantheon-loop"}
+    assert not sync._thread.is_alive()
+
+
+def test_sync_iterators():
+    with SyncPantheon(summoners()) as sync:
+        results = dict(sync.get_many("get_summoner", ["a", "b", "unknown"]))
+        assert results["a"] == {"id": "a"}
+        assert isinstance(results["unknown"], exc.NotFound)
+
+        #Stopped before the end
+        for summonerId, summoner in sync.get_many("get_summoner", [str(i) for i in range(100)], concurrency=5):
+            break
+        assert summoner == {"id": summonerId}
+
+
+def test_sync_disk_cache():
+    #The cache is created on this thread and used by the loop of the instance
+    cache = DiskCache(os.path.join(tempfile.mkdtemp(), "cache.db"))
+    panth = FakePantheon(api_key="RGAPI-SYNC", headers=LIMITS, cache=cache)
+
+    with SyncPantheon(panth) as sync:
+        for i in range(3):
+            assert sync.get_summoner("a") == {"id": "summonerId"}
+
+    assert len(panth.calls) == 1
+    assert len(cache) == 1
+    assert cache.stats() == {"hits": 2, "misses": 1}
+    cache.close()
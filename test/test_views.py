@@ -0,0 +1,134 @@
+import json
+import pickle
+
+import pytest
+
+from pantheon.Views import Match, Timeline, View, decodeTimelines, select
+
+from .fake import FakePantheon, run
+
+
+MATCH = {
+    "metadata": {"matchId": "EUW1_1", "participants": ["puuid1", "puuid2"]},
+    "info": {
+        "gameDuration": 1800,
+        "participants": [
+            {"puuid": "puuid1", "win": True, "perks": {"styles": [{"style": 8100}]}},
+            {"puuid": "puuid2", "win": False, "perks": {"styles": [{"style": 8200}]}}
+        ],
+        "teams": [{"teamId": 100}, {"teamId": 200}]
+    }
+}
+BODY = json.dumps(MATCH, indent=2).encode()
+
+
+def matches(url, key):
+    return b'{"id":"summonerId"}' if "summoners" in url else BODY
+
+
+def test_match_view():
+    match = Match(BODY)
+    #Nothing decoded until the first access
+    assert match._data is None
+
+    assert match.matchId == "EUW1_1"
+    assert match.puuids == ["puuid1", "puuid2"]
+    assert [participant.win for participant in match.participants] == [True, False]
+    assert match.participant("puuid2").perks.styles[0].style == 8200
+    assert match.participant("unknown") is None
+    assert match.info.gameDuration == 1800
+    assert match["info"]["teams"][1]["teamId"] == 200
+    assert match == MATCH
+    assert pickle.loads(pickle.dumps(match)) == MATCH
+
+
+def test_view():
+    decoded = []
+
+    def decoder(body):
+        decoded.append(body)
+        return json.loads(body)
+
+    view = View(b'{"name":"a","ranks":[{"tier":"GOLD"}],"level":0}', decoder=decoder)
+    assert not decoded
+    assert view.name == "a"
+    assert isinstance(view.ranks[0], View) and view.ranks[0].tier == "GOLD"
+    assert view.get("level") == 0 and view.get("missing", 1) == 1
+    assert "name" in view and sorted(view) == ["level", "name", "ranks"] and len(view) == 3
+    with pytest.raises(AttributeError):
+        view.missing
+    #Decoded once, the body being encoded again from the data when asked
+    assert len(decoded) == 1
+    assert json.loads(view.body) == {"name": "a", "ranks": [{"tier": "GOLD"}], "level": 0}
+
+
+def test_pantheon_views():
+    panth = FakePantheon(respond=matches, views=True)
+
+    async def scenario():
+        return await panth.get_match("EUW1_1"), await panth.get_summoner("a")
+
+    match, summoner = run(scenario())
+
+    assert isinstance(match, Match)
+    assert match.participants[0].puuid == "puuid1"
+    #The other endpoints are decoded as usual
+    assert summoner == {"id": "summonerId"}
+
+
+def test_timeline_view():
+    timeline = Timeline(json.dumps({"metadata": {"matchId": "EUW1_1"}, "info": {"frames": [
+        {"participantFrames": {"1": {"totalGold": 500}}, "events": [{"type": "ITEM_PURCHASED"}]},
+        {"participantFrames": {"1": {"totalGold": 900}}, "events": [{"type": "CHAMPION_KILL"}, {"type": "ITEM_SOLD"}]}
+    ]}}).encode())
+
+    assert [frame.totalGold for frame in timeline.participantFrames(1)] == [500, 900]
+    assert len(timeline.events()) == 3
+    assert [event.type for event in timeline.events("CHAMPION_KILL")] == ["CHAMPION_KILL"]
+
+
+def test_select():
+    matchId, puuids, wins, styles, first, missing = select(BODY, "metadata.matchId", "metadata.participants", "info.participants.*.win",
+        "info.participants.*.perks.styles.0.style", "info.participants.0.puuid", "info.unknown.path")
+
+    assert matchId == "EUW1_1"
+    assert puuids == ["puuid1", "puuid2"]
+    assert wins == [True, False]
+    assert styles == [8100, 8200]
+    assert first == "puuid1"
+    assert missing is None
+    #A path inside a value selected whole
+    assert select(BODY, "info.teams", "info.teams.1.teamId") == [MATCH["info"]["teams"], 200]
+    assert select('[1, {"a": [2, 3]}]', "1.a.1") == [3]
+
+
+def test_decode_timelines():
+    numpy = pytest.importorskip("numpy")
+    timelines = [{"metadata": {"matchId": "EUW1_" + str(match)}, "info": {"frames": [
+        {"participantFrames": {str(participantId): {"totalGold": 500 * frame + participantId, "position": {"x": match, "y": frame}} for participantId in (1, 2)},
+            "events": [{"type": "ITEM_PURCHASED", "timestamp": 60000 * frame + 1, "participantId": 2, "itemId": 1055}]}
+        for frame in range(match + 2)
+    ]}} for match in range(2)]
+    timelines[1]["info"]["frames"][2]["events"].append({"type": "CHAMPION_KILL", "timestamp": 120500, "killerId": 1, "victimId": 2, "position": {"x": 10, "y": 20}})
+
+    arrays = decodeTimelines([timelines[0], json.dumps(timelines[1]).encode()], stats=("totalGold", "position.x", "position.y", "unknown"))
+
+    assert arrays.matchIds == ["EUW1_0", "EUW1_1"]
+    assert arrays.frames.shape == (2, 3, 2, 4)
+    assert arrays.frameCounts.tolist() == [2, 3]
+    assert arrays.stat("totalGold")[1, 2].tolist() == [1001, 1002]
+    assert arrays.stat("position.x")[1, :, 0].tolist() == [1, 1, 1]
+    #Past the end of the first match and the missing stats
+    assert numpy.isnan(arrays.frames[0, 2]).all()
+    assert numpy.isnan(arrays.stat("unknown")).all()
+    #The stats of a nested object are read together, whatever their order
+    assert decodeTimelines(timelines[1], stats=("position.y", "totalGold", "position.x")).frames[0, 2, 0].tolist() == [2, 1001, 1]
+
+    assert len(arrays.events) == 6
+    assert arrays.events["match"].tolist() == [0, 0, 1, 1, 1, 1]
+    assert arrays.events["frame"].tolist() == [0, 1, 0, 1, 2, 2]
+    kill = arrays.eventsOf("CHAMPION_KILL")
+    assert kill[["participantId", "victimId", "x", "y", "timestamp"]].tolist() == [(1, 2, 10, 20, 120500)]
+    assert arrays.eventsOf("ITEM_PURCHASED")["itemId"].tolist() == [1055] * 5
+    assert arrays.eventsOf("ITEM_PURCHASED")["x"].tolist() == [-1] * 5
+    assert len(arrays.eventsOf("WARD_PLACED")) == 0